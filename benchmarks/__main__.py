@@ -0,0 +1,71 @@
+"""
+Runs the selex benchmark suite and prints the results as JSON.
+
+Usage:
+    python -m benchmarks [--target {fake,chrome}] [--latency SECONDS] [--only NAME [NAME ...]]
+                         [--output FILE] [--compare BASELINE] [--tolerance FRACTION]
+
+The hot paths are measured against the fake remote end by default, so no browser is needed. The micro-benchmarks
+(element construction, key presses, get_driver overhead) never need one; searching a large DOM by text needs Chrome.
+With --compare, the regressions against the baseline results are reported and the exit status is 1 if there are any.
+
+Example:
+    python -m benchmarks --output baseline.json     # on the main branch
+    python -m benchmarks --compare baseline.json    # on a feature branch
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+import selenium
+
+from benchmarks import bench_get_driver, bench_hot_paths, bench_keypress, bench_text_search
+from benchmarks.compare import DEFAULT_TOLERANCE, compare, load_results
+
+
+def parse_args(argv: list = None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Runs the selex benchmark suite.")
+    parser.add_argument("--target", choices=sorted(bench_hot_paths.TARGETS), default="fake",
+                        help="remote end the hot paths are measured against (default: fake)")
+    parser.add_argument("--latency", type=float, default=0,
+                        help="seconds the fake remote end delays every request by (default: 0)")
+    parser.add_argument("--only", nargs="+", metavar="NAME",
+                        help="only run these hot path benchmarks and skip the micro-benchmarks")
+    parser.add_argument("--output", metavar="FILE", help="also write the results to the file")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed relative slowdown of timings before it counts as a regression (default: {DEFAULT_TOLERANCE})")
+    return parser.parse_args(argv)
+
+
+def run(args) -> dict:
+    """Runs the benchmarks selected by the arguments and returns the report."""
+    results = {"hot_paths": bench_hot_paths.run(args.target, args.latency, args.only)}
+    if args.only is None:
+        results["keypress"] = bench_keypress.run()
+        results["get_driver_overhead"] = bench_get_driver.run()
+        if args.target == "chrome":
+            results["text_search"] = bench_text_search.run()
+    meta = {"target": args.target, "latency": args.latency, "python": platform.python_version(),
+            "selenium": selenium.__version__, "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+    return {"meta": meta, "results": results}
+
+
+def main(argv: list = None) -> int:
+    args = parse_args(argv)
+    report = run(args)
+    if args.compare is not None:
+        report["regressions"] = compare(report["results"], load_results(args.compare), args.tolerance)
+    output = json.dumps(report, indent=4)
+    print(output)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            f.write(output)
+    return 1 if len(report.get("regressions", [])) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Measures the Python-side overhead of get_driver, i.e. everything except launching the browser.
+
+The browser start itself is patched out, so the numbers show the cost selex adds on top of
+Selenium for every new session.
+
+Usage:
+    python -m benchmarks.bench_get_driver
+"""
+import json
+import time
+from unittest.mock import patch
+
+from selex import get_driver, Browser
+
+N_DRIVERS = 2000
+
+
+def startup_cost(n: int = N_DRIVERS, browser: Browser = Browser.CHROME) -> dict:
+    """Returns the time (in microseconds) needed per get_driver call and the number of distinct driver classes created."""
+    with patch(f"selenium.webdriver.{browser.value}.__init__", return_value=None):
+        t1 = time.perf_counter()
+        drivers = [get_driver(browser) for _ in range(n)]
+        time_taken = time.perf_counter() - t1
+    return {"us_per_driver": 1e6 * time_taken / n,
+            "driver_classes": len(set(type(driver) for driver in drivers))}
+
+
+def run() -> dict:
+    return {"startup": startup_cost()}
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=4))
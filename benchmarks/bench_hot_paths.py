@@ -0,0 +1,235 @@
+"""
+Measures the throughput and the number of WebDriver round trips of the selex hot paths.
+
+Runs against the in-process fake remote end (selex.testing.FakeRemote) by default, which makes the round trip counts
+exact and the timings repeatable without a browser, or against headless Chrome.
+
+Usage:
+    python -m benchmarks.bench_hot_paths [fake|chrome]
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+from selex import get_driver, wait, Browser, By, Chain
+from selex.driver import DRIVER_CLASS
+from selex.metrics import CommandMetrics
+from selex.testing import FakeRemote
+
+from benchmarks.bench_text_search import large_dom_html
+
+MIN_TIME = 0.5      # seconds each benchmark is repeated for
+MIN_REPEATS = 3
+TYPED_TEXT = "The quick brown fox jumps over"
+ANCESTRY_DEPTH = 60
+
+
+class FakeTarget:
+    """Starts drivers attached to an in-process fake remote end, which delays every request by 'latency' seconds."""
+    browser = Browser.REMOTE
+
+    def __init__(self, latency: float = 0):
+        self.remote = FakeRemote(latency=latency)
+
+    def new_driver(self):
+        return self.remote.get_driver()
+
+    def close(self):
+        self.remote.close()
+
+
+class ChromeTarget:
+    """Starts headless Chrome drivers. The latency is the real one."""
+    browser = Browser.CHROME
+
+    def __init__(self, latency: float = 0):
+        pass
+
+    def new_driver(self):
+        options = ChromeOptions()
+        options.add_argument("--headless=new")
+        return get_driver(Browser.CHROME, options=options)
+
+    def close(self):
+        pass
+
+TARGETS = {"fake": FakeTarget, "chrome": ChromeTarget}
+
+
+def paragraphs_html(n: int) -> str:
+    return "<html><body>" + "".join(f"<p>Paragraph {i}</p>" for i in range(n)) + "</body></html>"
+
+def nested_html(depth: int = ANCESTRY_DEPTH) -> str:
+    return "<html><body>" + "<div>" * depth + "<span id='leaf'>Leaf</span>" + "</div>" * depth + "</body></html>"
+
+def form_html() -> str:
+    return "<html><body><form><input id='field'><img id='logo' alt='Logo'></form></body></html>"
+
+
+# Benchmark setups receive the driver (with the page loaded) and a temporary directory, and return the measured operation.
+
+def find_paragraphs(driver, tmp_dir: str):
+    return lambda: driver.find_elements(By.TAG_NAME, "p")
+
+def find_paragraphs_lean(driver, tmp_dir: str):
+    return lambda: driver.find_elements(By.TAG_NAME, "p", lean=True)
+
+def iter_paragraphs(driver, tmp_dir: str):
+    return lambda: sum(1 for _ in driver.iter_elements(By.TAG_NAME, "p"))
+
+def find_by_text(driver, tmp_dir: str):
+    return lambda: driver.find_elements(By.TEXT, "Price")
+
+def find_value_steps(driver, tmp_dir: str):
+    return lambda: driver.find_element(By.TEXT, "Leaf").find_ancestor(2).find_element(By.CSS_SELECTOR, "span")
+
+def find_value_chain(driver, tmp_dir: str):
+    chain = Chain(By.TEXT, "Leaf").ancestor(2).find(By.CSS_SELECTOR, "span")
+    return lambda: driver.find_element(By.CHAIN, chain)
+
+def find_ancestor(level: int):
+    def setup(driver, tmp_dir: str):
+        leaf = driver.find_element(By.ID, "leaf")
+        return lambda: leaf.find_ancestor(level)
+    return setup
+
+def slow_type(driver, tmp_dir: str):
+    field = driver.find_element(By.ID, "field")
+    return lambda: field.slow_type(TYPED_TEXT, max_delay=0, min_delay=0)
+
+def type_in(driver, tmp_dir: str):
+    driver.find_element(By.ID, "field").click()
+    return lambda: driver.type_in(TYPED_TEXT)
+
+def press_enter(driver, tmp_dir: str):
+    field = driver.find_element(By.ID, "field")
+    return lambda: field.press.ENTER()
+
+def wait_decorator(driver, tmp_dir: str):
+    waited = wait(5)(lambda self: None)     # a driver method doing nothing but applying the implicit wait
+    return lambda: waited(driver)
+
+def read_texts_live(driver, tmp_dir: str):
+    return lambda: [elem.text for elem in driver.find_elements(By.TAG_NAME, "p")]
+
+def read_texts_snapshot(driver, tmp_dir: str):
+    return lambda: [elem.text for elem in driver.snapshot().find_elements(By.TAG_NAME, "p")]
+
+def read_texts_fetch(driver, tmp_dir: str):
+    return lambda: driver.fetch(driver.find_elements(By.TAG_NAME, "p"), ["text"])["text"]
+
+def save_as_png(driver, tmp_dir: str):
+    logo = driver.find_element(By.ID, "logo")
+    output_file = str(Path(tmp_dir, "logo.png"))
+    return lambda: logo.save_as_png(output_file)
+
+# name -> (page HTML factory, setup)
+BENCHMARKS = {
+    "find_elements_10": (lambda: paragraphs_html(10), find_paragraphs),
+    "find_elements_1k": (lambda: paragraphs_html(1000), find_paragraphs),
+    "find_elements_10k": (lambda: paragraphs_html(10000), find_paragraphs),
+    "find_elements_10k_lean": (lambda: paragraphs_html(10000), find_paragraphs_lean),
+    "iter_elements_10k": (lambda: paragraphs_html(10000), iter_paragraphs),
+    "find_by_text": (lambda: large_dom_html(1000), find_by_text),
+    "find_value_steps": (nested_html, find_value_steps),
+    "find_value_chain": (nested_html, find_value_chain),
+    "find_ancestor_1": (nested_html, find_ancestor(1)),
+    "find_ancestor_10": (nested_html, find_ancestor(10)),
+    "find_ancestor_50": (nested_html, find_ancestor(50)),
+    "slow_type": (form_html, slow_type),
+    "type_in": (form_html, type_in),
+    "press_enter": (form_html, press_enter),
+    "wait_decorator": (form_html, wait_decorator),
+    "save_as_png": (form_html, save_as_png),
+    "read_texts_live_100": (lambda: paragraphs_html(100), read_texts_live),
+    "read_texts_snapshot_100": (lambda: paragraphs_html(100), read_texts_snapshot),
+    "read_texts_fetch_100": (lambda: paragraphs_html(100), read_texts_fetch),
+}
+
+
+def count_round_trips(driver, op) -> int:
+    """Returns the number of WebDriver commands a single run of the operation sends."""
+    metrics = driver.enable_metrics()
+    metrics.reset()
+    try:
+        op()
+    finally:
+        driver.metrics = None
+    return sum(command["latency_seconds"]["count"] for command in metrics.snapshot()["commands"])
+
+
+def time_op(op) -> dict:
+    """Repeats the operation for at least MIN_TIME seconds and returns its throughput."""
+    repeats = 0
+    t_start = time.perf_counter()
+    while repeats < MIN_REPEATS or time.perf_counter() - t_start < MIN_TIME:
+        op()
+        repeats += 1
+    elapsed = time.perf_counter() - t_start
+    return {"ops_per_sec": repeats / elapsed, "ms_per_op": 1000 * elapsed / repeats, "repeats": repeats}
+
+
+def measure(driver, op) -> dict:
+    """Returns the throughput and the round trips of the operation, after a warm-up run."""
+    op()
+    round_trips = count_round_trips(driver, op)
+    return {**time_op(op), "round_trips_per_op": round_trips}
+
+
+def measure_startup(target) -> dict:
+    """Returns the throughput and the round trips of get_driver. Drivers are quit outside of the measured time."""
+    driver_cls = DRIVER_CLASS[target.browser]
+    driver_cls.metrics = CommandMetrics()   # the session is created before the instance exists to enable metrics on
+    try:
+        target.new_driver().quit()
+        round_trips = sum(command["latency_seconds"]["count"] for command in driver_cls.metrics.snapshot()["commands"]
+                          if command["command"] != "quit")
+    finally:
+        driver_cls.metrics = None
+    times = []
+    while len(times) < MIN_REPEATS or sum(times) < MIN_TIME:
+        t_start = time.perf_counter()
+        driver = target.new_driver()
+        times.append(time.perf_counter() - t_start)
+        driver.quit()
+    return {"ops_per_sec": len(times) / sum(times), "ms_per_op": 1000 * sum(times) / len(times), "repeats": len(times),
+            "round_trips_per_op": round_trips}
+
+
+def run(target: str = "fake", latency: float = 0, only: list = None) -> dict:
+    """
+    Runs the hot path benchmarks and returns their results by name.
+
+    Parameters:
+        target (str): 'fake' to use the fake remote end, 'chrome' to use headless Chrome.
+        latency (float): Seconds the fake remote end delays every request by.
+        only (list): Names of the benchmarks to run (keys of BENCHMARKS, or 'get_driver'). All are run if None.
+    """
+    target = TARGETS[target](latency)
+    results = {}
+    try:
+        if only is None or "get_driver" in only:
+            results["get_driver"] = measure_startup(target)
+        driver = target.new_driver()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            try:
+                for name, (page, setup) in BENCHMARKS.items():
+                    if only is not None and name not in only:
+                        continue
+                    page_file = Path(tmp_dir, f"{name}.html")
+                    page_file.write_text(page())
+                    driver.get(page_file.as_uri())
+                    results[name] = measure(driver, setup(driver, tmp_dir))
+            finally:
+                driver.quit()
+    finally:
+        target.close()
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*sys.argv[1:2]), indent=4))
@@ -0,0 +1,62 @@
+"""
+Measures the cost of constructing selex WebElements and of using their key press interface.
+
+No browser is needed: elements are constructed directly, the same way the driver does it
+when unwrapping the results of a find_elements call.
+
+Usage:
+    python -m benchmarks.bench_keypress
+"""
+import gc
+import json
+import time
+import tracemalloc
+from unittest.mock import Mock
+
+from selex.webelement import WebElement
+
+N_ELEMENTS = 5000
+
+
+def construction_cost(n: int = N_ELEMENTS) -> dict:
+    """Returns the time (in microseconds) and the memory (in bytes) needed per constructed element."""
+    gc.collect()
+    t1 = time.perf_counter()
+    elements = [WebElement(None, str(i)) for i in range(n)]
+    time_taken = time.perf_counter() - t1
+    del elements
+    
+    gc.collect()
+    tracemalloc.start()
+    elements = [WebElement(None, str(i)) for i in range(n)]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del elements
+    
+    gc.collect()
+    elements = [WebElement(None, str(i)) for i in range(n)]
+    del elements
+    cycles = gc.collect()   # number of objects which could only be freed by the cyclic garbage collector
+    
+    return {"us_per_element": 1e6 * time_taken / n,
+            "bytes_per_element": memory / n,
+            "gc_objects_per_element": cycles / n}
+
+
+def press_cost(n: int = N_ELEMENTS) -> dict:
+    """Returns the time (in microseconds) needed per key press on a fresh element, excluding the WebDriver round trip."""
+    elements = [WebElement(None, str(i)) for i in range(n)]
+    for elem in elements:
+        elem.send_keys = Mock()     # no browser attached: mock the round trip out
+    t1 = time.perf_counter()
+    for elem in elements:
+        elem.press.ENTER()
+    return {"us_per_press": 1e6 * (time.perf_counter() - t1) / n}
+
+
+def run() -> dict:
+    return {"construction": construction_cost(), "press": press_cost()}
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=4))
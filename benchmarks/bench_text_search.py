@@ -0,0 +1,64 @@
+"""
+Measures searching by text on a large DOM, document-wide and scoped to a small element.
+
+Needs a browser: runs headless Chrome.
+
+Usage:
+    python -m benchmarks.bench_text_search
+"""
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+from selex import get_driver, Browser, By
+
+N_ROWS = 20000
+REPEATS = 20
+
+
+def large_dom_html(n_rows: int = N_ROWS) -> str:
+    """Returns a page with a large table and a small container, both containing the searched for text."""
+    rows = "\n".join(f"<tr><td>Row {i}</td><td>Price</td><td>{i}.99</td></tr>" for i in range(n_rows))
+    return f"""<html><body>
+    <div id="container"><span>Price</span><span>  Total   price </span></div>
+    <table>{rows}</table>
+</body></html>"""
+
+
+def time_search(subject, by: By, value: str, repeats: int = REPEATS, **kwargs) -> dict:
+    """Returns the average time (in milliseconds) needed to find the matching elements and their number."""
+    t1 = time.perf_counter()
+    for _ in range(repeats):
+        matches = subject.find_elements(by, value, **kwargs)
+    return {"ms_per_search": 1000 * (time.perf_counter() - t1) / repeats, "matches": len(matches)}
+
+
+def run(driver=None) -> dict:
+    quit_driver = driver is None
+    if driver is None:
+        options = ChromeOptions()
+        options.add_argument("--headless=new")
+        driver = get_driver(Browser.CHROME, options=options)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        page = os.path.join(tmp_dir, "large_dom.html")
+        with open(page, "w") as f:
+            f.write(large_dom_html())
+        try:
+            driver.get(Path(page).as_uri())
+            container = driver.find_element(By.ID, "container")
+            return {"document_exact": time_search(driver, By.TEXT, "Price"),
+                    "document_partial": time_search(driver, By.PARTIAL_TEXT, "rice"),
+                    "scoped_exact": time_search(container, By.TEXT, "Price"),
+                    "scoped_partial": time_search(container, By.PARTIAL_TEXT, "rice"),
+                    "scoped_normalized": time_search(container, By.TEXT, "Total price", normalize_space=True)}
+        finally:
+            if quit_driver:
+                driver.quit()
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=4))
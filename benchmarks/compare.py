@@ -0,0 +1,62 @@
+"""
+Compares benchmark results against a baseline and reports the regressions.
+
+Timings are noisy, so they only count as regressions when worse by more than the tolerance.
+Round trip counts and other deterministic metrics regress on any increase.
+
+Usage:
+    python -m benchmarks.compare results.json baseline.json [tolerance]
+"""
+import json
+import sys
+
+# metric name -> 1 if higher is better, -1 if lower is better
+DIRECTIONS = {"ops_per_sec": 1, "us_per_element": -1, "bytes_per_element": -1, "us_per_press": -1, "us_per_driver": -1,
+              "ms_per_search": -1, "round_trips_per_op": -1, "gc_objects_per_element": -1, "driver_classes": -1}
+EXACT = frozenset(("round_trips_per_op", "gc_objects_per_element", "driver_classes"))   # deterministic metrics
+DEFAULT_TOLERANCE = 0.2
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    """Flattens nested results into a dict keyed by dotted paths, e.g. 'hot_paths.find_by_text.ops_per_sec'."""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Returns the regressions of the results compared to the baseline, as a list of dicts holding the 'metric' path,
+    the 'baseline' and 'current' values and the relative 'change' (None if the baseline is 0).
+    Metrics missing from either side are skipped.
+    """
+    regressions = []
+    flat_baseline = flatten(baseline)
+    for path, current in flatten(results).items():
+        direction = DIRECTIONS.get(path.rpartition(".")[2])
+        previous = flat_baseline.get(path)
+        if direction is None or not isinstance(previous, (int, float)) or not isinstance(current, (int, float)):
+            continue
+        worse = direction * (current - previous) < 0
+        change = (current - previous) / abs(previous) if previous != 0 else None   # None: the baseline was 0
+        exact = path.rpartition(".")[2] in EXACT
+        if worse and (exact or change is None or abs(change) > tolerance):
+            regressions.append({"metric": path, "baseline": previous, "current": current, "change": change})
+    return regressions
+
+
+def load_results(path: str) -> dict:
+    """Loads the results from a JSON file written by the benchmark runner."""
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+if __name__ == "__main__":
+    tolerance = float(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_TOLERANCE
+    regressions = compare(load_results(sys.argv[1]), load_results(sys.argv[2]), tolerance)
+    print(json.dumps(regressions, indent=4))
+    sys.exit(1 if len(regressions) > 0 else 0)
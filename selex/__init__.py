@@ -1,7 +1,10 @@
 # import exceptions not used in this package, but very commonly used in projects containing this package
 from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, WebDriverException
 
-from .driver import get_driver
+from .driver import get_driver, ChromeDriver, FirefoxDriver, IeDriver, EdgeDriver, RemoteDriver
 from .utils import chrome_options
 from .wait import wait, wait_factory
-from .enums import Browser, By
\ No newline at end of file
+from .enums import Browser, By, Condition
+from .locator import Chain
+from .pool import DriverPool
+from .tabs import TabPool
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""
+Asyncio facade over the selex Driver and WebElement.
+
+WebDriver commands are blocking HTTP requests, so they are run on a bounded thread pool.
+A single event loop can drive many browsers this way, occupying a thread only while a command is in flight.
+slow_type sends the whole text in a single request, with the delays between key presses paused for by the browser,
+so the request occupies a thread for as long as the typing lasts.
+
+Example:
+    driver = await aio.get_driver(Browser.CHROME)
+    await driver.get("https://github.com/")
+    elem = await driver.find_element(By.TEXT, "Sign in")
+    await elem.press.ENTER()
+"""
+import asyncio
+import random
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import List
+
+from selex import driver as _driver
+from selex.enums import Browser, By
+from selex.keypress import KEYS
+
+DEFAULT_MAX_WORKERS = 32    # maximum number of WebDriver commands in flight at once, shared by all async drivers
+
+_default_executor = None
+
+
+def default_executor() -> Executor:
+    """Returns the thread pool shared by all async drivers which were not given their own executor."""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="selex")
+    return _default_executor
+
+
+async def random_wait(max_wait: float, min_wait: float = 0):
+    """Waits for a random time between min_wait and max_wait without blocking the event loop."""
+    await asyncio.sleep(random.uniform(min_wait, max_wait))
+
+
+async def get_driver(browser: Browser, executor: Executor = None, **kwargs) -> "AsyncDriver":
+    """Starts a selex driver for the browser without blocking the event loop and returns its async facade."""
+    executor = executor or default_executor()
+    driver = await asyncio.get_running_loop().run_in_executor(executor, partial(_driver.get_driver, browser, **kwargs))
+    return AsyncDriver(driver, executor)
+
+
+class _AsyncWrapper:
+    """Base class for the async facades. Runs the blocking calls on the executor."""
+    __slots__ = ("_executor",)
+
+    def _run(self, func, *args, **kwargs):
+        """Runs the blocking callable on the executor and returns an awaitable of its result."""
+        return asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+
+class AsyncKeyPress(_AsyncWrapper):
+    """
+    Awaitable key presses, e.g. await driver.press.ENTER().
+    Wraps a DriverKeyPress or an ElemKeyPress.
+    """
+    __slots__ = ("_press",)
+
+    def __init__(self, press, executor: Executor):
+        self._press = press
+        self._executor = executor
+
+
+def _make_async_key_method(key_name: str):
+    """Creates an awaitable method pressing the provided key e.g. await press.ENTER()."""
+    async def press_key(self):
+        await self._run(getattr(self._press, key_name))
+    press_key.__name__ = press_key.__qualname__ = key_name
+    press_key.__doc__ = f"Presses the {key_name} key."
+    return press_key
+
+for _key_name in KEYS:
+    setattr(AsyncKeyPress, _key_name, _make_async_key_method(_key_name))
+del _key_name
+
+
+class AsyncWebElement(_AsyncWrapper):
+    """
+    Awaitable facade over the selex WebElement. The wrapped element is available as the 'element' attribute.
+    """
+    __slots__ = ("element",)
+
+    def __init__(self, element, executor: Executor):
+        self.element = element
+        self._executor = executor
+
+    def __eq__(self, other):
+        return isinstance(other, AsyncWebElement) and self.element == other.element
+
+    def __hash__(self):
+        return hash(self.element)
+
+    @property
+    def press(self) -> AsyncKeyPress:
+        """Awaitable key presses sent into this element, e.g. await element.press.ENTER()."""
+        return AsyncKeyPress(self.element.press, self._executor)
+
+    async def run(self, func, *args, **kwargs):
+        """Runs any blocking callable on the executor, e.g. await elem.run(lambda: elem.element.text)."""
+        return await self._run(func, *args, **kwargs)
+
+    async def find_element(self, by: By = By.ID, value: str = None) -> "AsyncWebElement":
+        """Awaitable WebElement.find_element."""
+        return AsyncWebElement(await self._run(self.element.find_element, by, value), self._executor)
+
+    async def find_elements(self, by: By = By.ID, value: str = None) -> List["AsyncWebElement"]:
+        """Awaitable WebElement.find_elements."""
+        return [AsyncWebElement(elem, self._executor) for elem in await self._run(self.element.find_elements, by, value)]
+
+    async def find_ancestor(self, level: int = 1, recursive: bool = True) -> "AsyncWebElement":
+        """Awaitable WebElement.find_ancestor."""
+        return AsyncWebElement(await self._run(self.element.find_ancestor, level, recursive), self._executor)
+
+    async def save_as_png(self, output_file: str):
+        """Awaitable WebElement.save_as_png."""
+        await self._run(self.element.save_as_png, output_file)
+
+    async def send_keys(self, *value):
+        """Awaitable WebElement.send_keys."""
+        await self._run(self.element.send_keys, *value)
+
+    async def click(self):
+        """Awaitable WebElement.click."""
+        await self._run(self.element.click)
+
+    async def clear(self):
+        """Awaitable WebElement.clear."""
+        await self._run(self.element.clear)
+
+    async def slow_type(self, text: str, max_delay: float = 0.5, auto_clear: bool = True, min_delay: float = 0.1):
+        """Awaitable WebElement.slow_type, which sends the text with the delays in a single request after the first character."""
+        await self._run(self.element.slow_type, text, max_delay, auto_clear, min_delay)
+
+
+class AsyncDriver(_AsyncWrapper):
+    """
+    Awaitable facade over the selex Driver. The wrapped driver is available as the 'driver' attribute.
+
+    Parameters:
+        driver (Driver): A selex driver returned by selex.get_driver.
+        executor (Executor): Executor running the blocking WebDriver commands. Uses the shared default thread pool if None.
+    """
+    __slots__ = ("driver",)
+
+    def __init__(self, driver, executor: Executor = None):
+        self.driver = driver
+        self._executor = executor or default_executor()
+
+    @property
+    def press(self) -> AsyncKeyPress:
+        """Awaitable key presses sent into the browser, e.g. await driver.press.ENTER()."""
+        return AsyncKeyPress(self.driver.press, self._executor)
+
+    async def run(self, func, *args, **kwargs):
+        """Runs any blocking callable on the executor, e.g. await driver.run(driver.driver.refresh)."""
+        return await self._run(func, *args, **kwargs)
+
+    async def get(self, url: str):
+        """Awaitable Driver.get."""
+        await self._run(self.driver.get, url)
+
+    async def execute_script(self, script: str, *args):
+        """Awaitable Driver.execute_script."""
+        return await self._run(self.driver.execute_script, script, *args)
+
+    async def quit(self):
+        """Awaitable Driver.quit."""
+        await self._run(self.driver.quit)
+
+    async def find_element(self, by: By = By.ID, value: str = None) -> AsyncWebElement:
+        """Awaitable Driver.find_element."""
+        return AsyncWebElement(await self._run(self.driver.find_element, by, value), self._executor)
+
+    async def find_elements(self, by: By = By.ID, value: str = None) -> List[AsyncWebElement]:
+        """Awaitable Driver.find_elements."""
+        return [AsyncWebElement(elem, self._executor) for elem in await self._run(self.driver.find_elements, by, value)]
+
+    async def type_in(self, string: str):
+        """Awaitable Driver.type_in."""
+        await self._run(self.driver.type_in, string)
+
+    async def slow_type(self, text: str, max_delay: float = 0.5, min_delay: float = 0.1):
+        """Awaitable Driver.slow_type, which sends the text with the delays in a single request."""
+        await self._run(self.driver.slow_type, text, max_delay, min_delay)
@@ -0,0 +1,143 @@
+"""
+An opt-in cache of found elements for the selex Driver, keyed by the locator and the element searched within.
+
+Page objects often look up the same elements repeatedly on the same page, each lookup costing a round trip plus any
+implicit wait. With the cache enabled, repeated lookups return the elements found the first time:
+    cache = driver.enable_element_cache()
+    driver.find_element(By.TEXT, "Submit").click()
+    driver.find_element(By.TEXT, "Submit")     # from the cache
+    print(cache.stats)     # {'hits': 1, 'misses': 1, 'invalidations': 0}
+
+The cache is cleared by commands which load another document or change the context elements are found in (get, back,
+forward, refresh, switching windows and frames). DOM changes are detected lazily: the DOM generation of the page,
+counted in the browser by a MutationObserver, is read by a small script at most once per check interval, and the cache
+is cleared if it has changed. Lookups within the interval cost no round trips when they hit, so a change made by the
+page in the meantime goes unnoticed until the next check. Set the interval to 0 to check before every lookup, or turn
+the checks off for pages known not to change.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.webdriver.remote.command import Command
+
+from selex.scripts import DOM_GENERATION
+
+# WebDriver commands after which cached elements may belong to another document or be out of the search context
+INVALIDATING_COMMANDS = frozenset((Command.GET, Command.GO_BACK, Command.GO_FORWARD, Command.REFRESH,
+                                   Command.SWITCH_TO_WINDOW, Command.SWITCH_TO_FRAME, Command.SWITCH_TO_PARENT_FRAME,
+                                   Command.NEW_WINDOW, Command.CLOSE, Command.QUIT))
+
+
+class ElementCache:
+    """
+    Elements found by a driver, keyed by the locator and the scope element (None for the whole page).
+
+    Parameters:
+        check_mutations (bool): If True, the DOM generation of the page is checked (a single small script) and
+                                the cache is cleared if the DOM has changed since the elements were found.
+                                If False, the cache is only cleared by navigation, switching windows and frames,
+                                or calling clear().
+        check_interval (float): Seconds during which the DOM generation is trusted after being checked. Hits within
+                                the interval cost no round trips, but miss changes made by the page in the meantime.
+                                With 0, every lookup checks the generation, so a hit costs one cheap round trip.
+
+    Attributes:
+        stats (dict): Numbers of "hits", "misses" and "invalidations" (times the cache was cleared while not empty).
+    """
+    def __init__(self, check_mutations: bool = True, check_interval: float = 1):
+        self.check_mutations = check_mutations
+        self.check_interval = check_interval
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        self._entries = {}          # (method, by, value, normalize_space, lean, scope id) -> found element(s)
+        self._generation = None     # DOM generation the entries were found in
+        self._checked_at = None     # time.monotonic() when the generation was last checked, None if it is unknown
+        self._epoch = 0             # number of times the cache was cleared, to detect clearing during a lookup
+        self._lock = threading.Lock()
+        self._local = threading.local()     # local.bypass is True while the thread's lookups go past the cache
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Discards all cached elements."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        """Discards all cached elements, with the lock held."""
+        if len(self._entries) > 0:
+            self._entries.clear()
+            self.stats["invalidations"] += 1
+        self._generation = None
+        self._checked_at = None
+        self._epoch += 1
+
+    def reset_stats(self):
+        """Sets the hit, miss and invalidation counts to zero."""
+        with self._lock:
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    def notify(self, driver_command: str):
+        """Clears the cache if the WebDriver command invalidates the cached elements. Called for every command sent."""
+        if driver_command in INVALIDATING_COMMANDS:
+            self.clear()
+
+    @contextmanager
+    def bypass(self):
+        """Context manager in which the lookups of the current thread find the elements without using the cache."""
+        previous = getattr(self._local, "bypass", False)
+        self._local.bypass = True
+        try:
+            yield
+        finally:
+            self._local.bypass = previous
+
+    def lookup(self, driver, key: tuple, find):
+        """
+        Returns the cached result for the key if it is still valid, otherwise calls find() and caches its result.
+        Exceptions raised by find() (e.g. NoSuchElementException) are not cached. Lookups made by find() itself
+        (e.g. the XPath search a text search is made with) bypass the cache.
+        """
+        if getattr(self._local, "bypass", False) == True:
+            return find()
+        if self.check_mutations == True:
+            with self._lock:
+                checked_at, epoch = self._checked_at, self._epoch
+            if checked_at is None or time.monotonic() - checked_at >= self.check_interval:
+                generation = driver.execute_script(DOM_GENERATION)
+                with self._lock:
+                    if self._epoch == epoch:    # not cleared (e.g. by navigation) since the generation was read
+                        if generation != self._generation:
+                            self._clear()
+                        self._generation = generation
+                        self._checked_at = time.monotonic()
+        with self._lock:
+            found = self._entries.get(key)
+            if found is not None:
+                self.stats["hits"] += 1
+                return list(found) if isinstance(found, list) else found    # callers may modify the list
+            self.stats["misses"] += 1
+            epoch = self._epoch
+        with self.bypass():
+            found = find()
+        with self._lock:
+            if epoch == self._epoch:    # not cleared by find() or another thread in the meantime
+                self._entries[key] = found
+        return list(found) if isinstance(found, list) else found
+
+    def snapshot(self) -> dict:
+        """Returns the statistics and the number of cached entries as a JSON serializable dict."""
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries)}
+
+
+@contextmanager
+def bypass_cache(driver):
+    """Context manager in which the lookups of the current thread bypass the driver's element cache, if it has one."""
+    cache = getattr(driver, "element_cache", None)
+    if cache is None:
+        yield
+        return
+    with cache.bypass():
+        yield
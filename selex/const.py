@@ -3,4 +3,7 @@ FIREFOX = "Firefox"
 IE = "Ie"
 EDGE = "Edge"
 
-CMD_OUT_DECODING = "utf-8"
\ No newline at end of file
+CMD_OUT_DECODING = "utf-8"
+
+DEFAULT_SCRIPT_TIMEOUT = 30000    # ms, the W3C default asynchronous script timeout of a new session
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"     # identifies web element references in the W3C protocol
@@ -0,0 +1,731 @@
+"""
+A DOM model of a web page built with BeautifulSoup, for working on a copy of the page outside the browser.
+
+Elements are located using CSS selectors (evaluated by soupsieve) or XPath. XPath is evaluated by an XPath 1.0
+evaluator supporting:
+    paths: /, //, ., .., (expr)[predicate], unions (|)
+    axes: child, descendant, descendant-or-self, parent, ancestor, ancestor-or-self, following, following-sibling,
+          preceding, preceding-sibling, self, attribute (@)
+    node tests: names, *, text(), node(), comment()
+    operators: or, and, =, !=, <, <=, >, >=, +, -, *, div, mod, unary -
+    functions: last, position, count, string, concat, contains, starts-with, substring, substring-before,
+               substring-after, normalize-space, string-length, translate, not, true, false, boolean, number,
+               sum, floor, ceiling, round, name, local-name
+Names are matched case-insensitively, as browsers do for HTML documents. The rest of XPath 1.0 (variables,
+the namespace axis, processing-instruction(), id() and lang()) raises XPathError.
+"""
+import math
+import re
+from functools import lru_cache
+from itertools import chain
+
+from bs4 import BeautifulSoup, Tag
+from bs4.element import Comment, Declaration, Doctype, NavigableString, PreformattedString
+
+from selex.exceptions import XPathError
+
+HIDDEN_TAGS = frozenset(("head", "script", "style", "title", "meta", "link", "template", "noscript"))
+BLOCK_TAGS = frozenset(("address", "article", "aside", "blockquote", "dd", "details", "div", "dl", "dt", "fieldset",
+                        "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr",
+                        "li", "main", "nav", "ol", "p", "pre", "section", "summary", "table", "tr", "ul"))
+
+
+def parse_html(html: str) -> BeautifulSoup:
+    """Parses the HTML into a document, using the parser bundled with Python."""
+    return BeautifulSoup(html, features="html.parser")
+
+
+def is_element(node) -> bool:
+    """Returns True if the node is an element (not text, a comment or the document itself)."""
+    return isinstance(node, Tag) and not isinstance(node, BeautifulSoup)
+
+
+def is_text(node) -> bool:
+    """Returns True if the node is a text node (not a comment, doctype etc.)."""
+    return isinstance(node, NavigableString) and not isinstance(node, PreformattedString)
+
+
+class Attribute:
+    """An attribute node, as selected by the XPath attribute axis."""
+    __slots__ = ("owner", "name", "value")
+
+    def __init__(self, owner: Tag, name: str, value: str):
+        self.owner = owner
+        self.name = name
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, Attribute) and self.owner is other.owner and self.name == other.name
+
+    def __hash__(self):
+        return hash((id(self.owner), self.name))
+
+    def __repr__(self):
+        return f"Attribute({self.name}={self.value!r})"
+
+
+def attribute_string(value) -> str:
+    """Returns the attribute value as a string. BeautifulSoup splits multi-valued attributes (e.g. class) into lists."""
+    return " ".join(value) if isinstance(value, list) else value
+
+
+def string_value(node) -> str:
+    """Returns the XPath string-value of the node: all the text it contains."""
+    if isinstance(node, Attribute):
+        return node.value
+    if isinstance(node, Tag):
+        return "".join(text for text in node.descendants if is_text(text))
+    return str(node)
+
+
+def root_of(node):
+    """Returns the document (or the detached subtree's root) which the node belongs to."""
+    if isinstance(node, Attribute):
+        node = node.owner
+    while node.parent is not None:
+        node = node.parent
+    return node
+
+
+def element_path(elem: Tag) -> list:
+    """Returns the indices of the element and its ancestors among their parents' child elements, outermost first."""
+    path = []
+    while elem.parent is not None:
+        path.append(sum(1 for _ in elem.find_previous_siblings(True)))
+        elem = elem.parent
+    path.reverse()
+    return path
+
+
+def _hidden_by_itself(elem: Tag) -> bool:
+    """Returns True if the element is hidden by its own tag name or attributes, regardless of its ancestors."""
+    if elem.name in HIDDEN_TAGS or elem.has_attr("hidden"):
+        return True
+    if elem.name == "input" and elem.get("type", "").lower() == "hidden":
+        return True
+    style = attribute_string(elem.get("style", "")).lower()
+    return re.search(r"display\s*:\s*none|visibility\s*:\s*hidden", style) is not None
+
+
+def is_displayed(elem: Tag) -> bool:
+    """Approximates whether the element is displayed, based on tag names, the hidden attribute and inline styles."""
+    return not any(_hidden_by_itself(node) for node in chain((elem,), elem.parents) if is_element(node))
+
+
+def rendered_text(elem: Tag) -> str:
+    """Approximates the text of the element as rendered: whitespace collapsed, hidden text left out and blocks on separate lines."""
+    if not is_displayed(elem):
+        return ""
+    parts = []
+    def collect(node):
+        for child in node.children:
+            if is_element(child):
+                if _hidden_by_itself(child):
+                    continue
+                if child.name == "br":
+                    parts.append("\n")
+                    continue
+                block = child.name in BLOCK_TAGS
+                if block:
+                    parts.append("\n")
+                collect(child)
+                if block:
+                    parts.append("\n")
+            elif is_text(child):
+                parts.append(str(child))
+    collect(elem)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line != "")
+
+
+def select_css(node: Tag, selector: str) -> list:
+    """Returns the descendants of the node matching the CSS selector, in document order."""
+    return node.select(selector)
+
+
+def select_xpath(node, expression: str) -> list:
+    """
+    Returns the elements matching the XPath expression, evaluated with the node as the context node, in document order.
+    Raises XPathError if the expression is invalid or does not select elements.
+    """
+    result = evaluate_xpath(node, expression)
+    if not isinstance(result, list) or not all(is_element(item) for item in result):
+        raise XPathError(expression, "the result is not a set of elements")
+    return result
+
+
+def evaluate_xpath(node, expression: str):
+    """
+    Evaluates the XPath expression with the node as the context node.
+    Returns a list of nodes (in document order), a string, a float or a bool.
+    """
+    try:
+        return compile_xpath(expression)(_Context(node, 1, 1, _Env(node)))
+    except _TypeMismatch as caught_exc:
+        raise XPathError(expression, str(caught_exc)) from None
+
+
+@lru_cache(maxsize=256)
+def compile_xpath(expression: str):
+    """Compiles the XPath expression into a function of the evaluation context. Compiled expressions are cached."""
+    return _Parser(expression).parse()
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# XPath evaluator internals
+
+class _TypeMismatch(Exception):
+    """Raised when an XPath value has the wrong type, e.g. a path step is applied to a string."""
+
+
+class _Env:
+    """State shared by one evaluation: the document root and the document order of its nodes (built on demand)."""
+    __slots__ = ("_node", "_root", "_order")
+
+    def __init__(self, node):
+        self._node = node
+        self._root = None
+        self._order = None
+
+    @property
+    def root(self):
+        if self._root is None:
+            self._root = root_of(self._node)
+        return self._root
+
+    def sort(self, nodes: list) -> list:
+        """Sorts the nodes into document order."""
+        if self._order is None:
+            self._order = {id(node): index for index, node in enumerate(chain((self.root,), self.root.descendants))}
+        def key(node):
+            if isinstance(node, Attribute):
+                return self._order[id(node.owner)], 1 + list(node.owner.attrs).index(node.name)
+            return self._order[id(node)], 0
+        return sorted(nodes, key=key)
+
+
+class _Context:
+    __slots__ = ("node", "position", "size", "env")
+
+    def __init__(self, node, position: int, size: int, env: _Env):
+        self.node = node
+        self.position = position
+        self.size = size
+        self.env = env
+
+
+def _key(node):
+    """Identity of a node for removing duplicates from node-sets. Attribute nodes are created on every access."""
+    return (id(node.owner), node.name) if isinstance(node, Attribute) else id(node)
+
+
+def _node_set(value) -> list:
+    if not isinstance(value, list):
+        raise _TypeMismatch("expected a node-set")
+    return value
+
+
+def _number_string(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+def _to_string(value) -> str:
+    if isinstance(value, list):
+        return string_value(value[0]) if len(value) > 0 else ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return _number_string(value)
+    return value
+
+
+def _to_number(value) -> float:
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, float):
+        return value
+    try:
+        return float(_to_string(value).strip(" \t\r\n"))
+    except ValueError:
+        return math.nan
+
+
+def _to_bool(value) -> bool:
+    if isinstance(value, float):
+        return value != 0 and not math.isnan(value)
+    if isinstance(value, (list, str)):
+        return len(value) > 0
+    return value
+
+
+def _integral(function, value: float) -> float:
+    return value if math.isnan(value) or math.isinf(value) else float(function(value))
+
+
+def _round(value: float) -> float:
+    return value if math.isnan(value) or math.isinf(value) else float(math.floor(value + 0.5))
+
+
+def _compare_atoms(op, relational: bool, left, right) -> bool:
+    if relational:
+        return op(_to_number(left), _to_number(right))
+    if isinstance(left, bool) or isinstance(right, bool):
+        return op(_to_bool(left), _to_bool(right))
+    if isinstance(left, float) or isinstance(right, float):
+        return op(_to_number(left), _to_number(right))
+    return op(_to_string(left), _to_string(right))
+
+
+def _compare(op, relational: bool, left, right) -> bool:
+    """Compares two values, where node-sets compare true if any of their nodes does (XPath 1.0 section 3.4)."""
+    if not isinstance(left, list) and not isinstance(right, list):
+        return _compare_atoms(op, relational, left, right)
+    if isinstance(left, bool) or isinstance(right, bool):
+        return _compare_atoms(op, relational, _to_bool(left), _to_bool(right))
+    lefts = [string_value(node) for node in left] if isinstance(left, list) else [left]
+    rights = [string_value(node) for node in right] if isinstance(right, list) else [right]
+    return any(_compare_atoms(op, relational, l, r) for l in lefts for r in rights)
+
+
+def _normalize_space(text: str) -> str:
+    return " ".join(part for part in re.split(r"[ \t\r\n]+", text) if part != "")
+
+
+def _translate(text: str, source: str, target: str) -> str:
+    table = {}
+    for index, char in enumerate(source):
+        table.setdefault(ord(char), target[index] if index < len(target) else None)
+    return text.translate(table)
+
+
+def _divide(left: float, right: float) -> float:
+    if right == 0:
+        if left == 0 or math.isnan(left):
+            return math.nan
+        return math.copysign(math.inf, left) * math.copysign(1, right)
+    return left / right
+
+
+def _modulo(left: float, right: float) -> float:
+    """The remainder of the truncating division, with the sign of the dividend, as JavaScript's %."""
+    if right == 0 or math.isnan(right) or math.isnan(left) or math.isinf(left):
+        return math.nan
+    return math.fmod(left, right)
+
+
+def _substring(text: str, start: float, length: float = math.inf) -> str:
+    start = _round(start)
+    end = start + _round(length)
+    return "".join(char for position, char in enumerate(text, 1) if start <= position < end)
+
+
+def _node_name(ctx, args) -> str:
+    nodes = _node_set(args[0]) if len(args) > 0 else [ctx.node]
+    if len(nodes) == 0:
+        return ""
+    node = nodes[0]
+    return node.name if isinstance(node, Attribute) or is_element(node) else ""
+
+
+def _context_string(ctx, args) -> str:
+    return _to_string(args[0]) if len(args) > 0 else string_value(ctx.node)
+
+
+# name -> (minimum arguments, maximum arguments or None if unlimited, function of the context and the argument values)
+_FUNCTIONS = {
+    "last": (0, 0, lambda ctx, args: float(ctx.size)),
+    "position": (0, 0, lambda ctx, args: float(ctx.position)),
+    "count": (1, 1, lambda ctx, args: float(len(_node_set(args[0])))),
+    "string": (0, 1, _context_string),
+    "concat": (2, None, lambda ctx, args: "".join(_to_string(arg) for arg in args)),
+    "contains": (2, 2, lambda ctx, args: _to_string(args[1]) in _to_string(args[0])),
+    "starts-with": (2, 2, lambda ctx, args: _to_string(args[0]).startswith(_to_string(args[1]))),
+    "substring": (2, 3, lambda ctx, args: _substring(_to_string(args[0]), *(_to_number(arg) for arg in args[1:]))),
+    "substring-before": (2, 2, lambda ctx, args: _to_string(args[0]).partition(_to_string(args[1]))[0]
+                         if _to_string(args[1]) in _to_string(args[0]) else ""),
+    "substring-after": (2, 2, lambda ctx, args: _to_string(args[0]).partition(_to_string(args[1]))[2]),
+    "normalize-space": (0, 1, lambda ctx, args: _normalize_space(_context_string(ctx, args))),
+    "string-length": (0, 1, lambda ctx, args: float(len(_context_string(ctx, args)))),
+    "translate": (3, 3, lambda ctx, args: _translate(*(_to_string(arg) for arg in args))),
+    "not": (1, 1, lambda ctx, args: not _to_bool(args[0])),
+    "true": (0, 0, lambda ctx, args: True),
+    "false": (0, 0, lambda ctx, args: False),
+    "boolean": (1, 1, lambda ctx, args: _to_bool(args[0])),
+    "number": (0, 1, lambda ctx, args: _to_number(args[0] if len(args) > 0 else [ctx.node])),
+    "sum": (1, 1, lambda ctx, args: float(sum(_to_number(string_value(node)) for node in _node_set(args[0])))),
+    "floor": (1, 1, lambda ctx, args: _integral(math.floor, _to_number(args[0]))),
+    "ceiling": (1, 1, lambda ctx, args: _integral(math.ceil, _to_number(args[0]))),
+    "round": (1, 1, lambda ctx, args: _round(_to_number(args[0]))),
+    "name": (0, 1, _node_name),
+    "local-name": (0, 1, lambda ctx, args: _node_name(ctx, args).rpartition(":")[2]),
+}
+
+_NUMBER_FUNCTIONS = frozenset(("last", "position", "count", "string-length", "number", "sum", "floor", "ceiling", "round"))
+
+
+def _ancestors(node):
+    if isinstance(node, Attribute):
+        node = node.owner
+        yield node
+    yield from node.parents
+
+def _children(node):
+    return node.children if isinstance(node, Tag) else ()
+
+def _descendants(node):
+    return node.descendants if isinstance(node, Tag) else ()
+
+def _siblings(attribute: str):
+    return lambda node: () if isinstance(node, Attribute) else getattr(node, attribute)
+
+def _following(node):
+    """Nodes after the node in document order, other than its descendants."""
+    if isinstance(node, Attribute):     # the attribute's element comes before it, the element's children after it
+        yield from _descendants(node.owner)
+        node = node.owner
+    while node is not None and node.next_sibling is None:
+        node = node.parent
+    if node is not None:
+        yield node.next_sibling
+        yield from node.next_sibling.next_elements
+
+def _preceding(node):
+    """Nodes before the node in document order, other than its ancestors, nearest first."""
+    if isinstance(node, Attribute):
+        node = node.owner
+    ancestors = {id(parent) for parent in node.parents}
+    return (previous for previous in node.previous_elements if id(previous) not in ancestors)
+
+def _attributes(node):
+    if not is_element(node):
+        return ()
+    return [Attribute(node, name, attribute_string(value)) for name, value in node.attrs.items()]
+
+def _parent(node):
+    parent = node.owner if isinstance(node, Attribute) else node.parent
+    return () if parent is None else (parent,)
+
+_AXES = {
+    "child": _children,
+    "descendant": _descendants,
+    "descendant-or-self": lambda node: chain((node,), _descendants(node)),
+    "parent": _parent,
+    "ancestor": _ancestors,
+    "ancestor-or-self": lambda node: chain((node,), _ancestors(node)),
+    "following": _following,
+    "following-sibling": _siblings("next_siblings"),
+    "preceding": _preceding,
+    "preceding-sibling": _siblings("previous_siblings"),
+    "self": lambda node: (node,),
+    "attribute": _attributes,
+}
+_REVERSE_AXES = frozenset(("parent", "ancestor", "ancestor-or-self", "preceding", "preceding-sibling"))
+
+
+def _any_node(node) -> bool:
+    return not isinstance(node, (Doctype, Declaration))
+
+def _make_node_test(axis: str, name: str):
+    """Returns a predicate testing nodes on the axis against a name test (a name or *)."""
+    if axis == "attribute":
+        return (lambda node: True) if name == "*" else (lambda node: node.name == name)
+    if name == "*":
+        return is_element
+    return lambda node: is_element(node) and node.name == name
+
+_NODE_TYPE_TESTS = {"text": is_text, "node": _any_node, "comment": lambda node: isinstance(node, Comment)}
+
+
+def _apply_predicates(nodes: list, predicates: list, env: _Env) -> list:
+    """Filters the nodes (in axis order) by each predicate in turn. Numeric predicates select by position."""
+    for predicate in predicates:
+        size = len(nodes)
+        kept = []
+        for position, node in enumerate(nodes, 1):
+            value = predicate(_Context(node, position, size, env))
+            if value == position if isinstance(value, float) else _to_bool(value):
+                kept.append(node)
+        nodes = kept
+    return nodes
+
+
+def _make_step(axis: str, test, predicates: list):
+    """Returns a function applying the location step to a node-set in document order."""
+    axis_nodes = _AXES[axis]
+    reverse = axis in _REVERSE_AXES
+    def step(nodes: list, env: _Env) -> list:
+        if len(nodes) == 1:
+            result = _apply_predicates([node for node in axis_nodes(nodes[0]) if test(node)], predicates, env)
+            if reverse:
+                result.reverse()
+            return result
+        result, seen = [], set()
+        for context_node in nodes:
+            for node in _apply_predicates([node for node in axis_nodes(context_node) if test(node)], predicates, env):
+                key = _key(node)
+                if key not in seen:
+                    seen.add(key)
+                    result.append(node)
+        return env.sort(result) if len(result) > 1 else result
+    return step
+
+
+def _make_path(start, steps: list):
+    """Returns a function evaluating the location path: start (a function returning the initial node-set) and steps."""
+    def path(ctx):
+        nodes = _node_set(start(ctx))
+        for step in steps:
+            nodes = step(nodes, ctx.env)
+        return nodes
+    return path
+
+
+class _Parser:
+    """Recursive descent parser compiling an XPath expression into nested functions of the evaluation context."""
+    TOKENS = re.compile(r"""\s*(?:
+        (?P<literal>"[^"]*"|'[^']*')|
+        (?P<number>\d+(?:\.\d*)?|\.\d+)|
+        (?P<op>//|::|\.\.|!=|<=|>=|[/()\[\]@,|=<>*.+-])|
+        (?P<name>[A-Za-z_][\w.\-]*(?::[A-Za-z_][\w.\-]*)?)
+        )""", re.VERBOSE)
+    DESCENDANT_OR_SELF = ("descendant-or-self", _any_node, [], False)   # the step abbreviated by //
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = self.tokenize(expression)
+        self.index = 0
+        self.positional = False     # set when a predicate may depend on the position of the context node
+
+    def tokenize(self, expression: str) -> list:
+        tokens, position = [], 0
+        while position < len(expression):
+            match = self.TOKENS.match(expression, position)
+            if match is None or match.lastgroup is None:
+                if expression[position:].strip() == "":
+                    break
+                raise self.error(f"unexpected character at position {position}")
+            tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            position = match.end()
+        return tokens
+
+    def error(self, reason: str) -> XPathError:
+        return XPathError(self.expression, reason)
+
+    def peek(self, offset: int = 0) -> tuple:
+        index = self.index + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def accept(self, kind: str, value: str = None) -> bool:
+        token_kind, token_value = self.peek()
+        if token_kind == kind and (value is None or token_value == value):
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, kind: str, value: str = None):
+        if not self.accept(kind, value):
+            found = self.peek()[1]
+            raise self.error(f"expected '{value or kind}' but found {'the end' if found is None else repr(found)}")
+
+    def parse(self):
+        expr = self.parse_or()
+        if self.peek()[0] is not None:
+            raise self.error(f"unexpected '{self.peek()[1]}'")
+        return expr
+
+    def parse_or(self):
+        left = self.parse_and()
+        while self.accept("name", "or"):
+            left = (lambda l, r: lambda ctx: _to_bool(l(ctx)) or _to_bool(r(ctx)))(left, self.parse_and())
+        return left
+
+    def parse_and(self):
+        left = self.parse_equality()
+        while self.accept("name", "and"):
+            left = (lambda l, r: lambda ctx: _to_bool(l(ctx)) and _to_bool(r(ctx)))(left, self.parse_equality())
+        return left
+
+    def parse_comparison(self, operand, operators: dict, relational: bool):
+        left = operand()
+        while self.peek()[0] == "op" and self.peek()[1] in operators:
+            op = operators[self.tokens[self.index][1]]
+            self.index += 1
+            left = (lambda l, r, op: lambda ctx: _compare(op, relational, l(ctx), r(ctx)))(left, operand(), op)
+        return left
+
+    def parse_equality(self):
+        return self.parse_comparison(self.parse_relational, {"=": lambda l, r: l == r, "!=": lambda l, r: l != r}, False)
+
+    def parse_relational(self):
+        operators = {"<": lambda l, r: l < r, "<=": lambda l, r: l <= r, ">": lambda l, r: l > r, ">=": lambda l, r: l >= r}
+        return self.parse_comparison(self.parse_additive, operators, True)
+
+    def parse_additive(self):
+        left = self.parse_multiplicative()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            op = self.tokens[self.index][1]
+            self.index += 1
+            left = self.arithmetic(op, left, self.parse_multiplicative())
+        return left
+
+    def parse_multiplicative(self):
+        left = self.parse_unary()
+        # after an operand, * and the names div and mod can only be operators
+        while self.peek() in (("op", "*"), ("name", "div"), ("name", "mod")):
+            op = self.tokens[self.index][1]
+            self.index += 1
+            left = self.arithmetic(op, left, self.parse_unary())
+        return left
+
+    def parse_unary(self):
+        if self.accept("op", "-"):
+            operand = self.parse_unary()
+            self.positional = True
+            return lambda ctx: -_to_number(operand(ctx))
+        return self.parse_union()
+
+    def arithmetic(self, op: str, left, right):
+        function = {"+": lambda l, r: l + r, "-": lambda l, r: l - r, "*": lambda l, r: l * r,
+                    "div": _divide, "mod": _modulo}[op]
+        self.positional = True
+        return lambda ctx: function(_to_number(left(ctx)), _to_number(right(ctx)))
+
+    def parse_union(self):
+        left = self.parse_path()
+        while self.accept("op", "|"):
+            left = (lambda l, r: lambda ctx: self.union(ctx, l(ctx), r(ctx)))(left, self.parse_path())
+        return left
+
+    @staticmethod
+    def union(ctx, left, right) -> list:
+        seen = {_key(node) for node in _node_set(left)}
+        return ctx.env.sort(left + [node for node in _node_set(right) if _key(node) not in seen])
+
+    def starts_step(self) -> bool:
+        kind, value = self.peek()
+        return kind == "name" or (kind == "op" and value in (".", "..", "@", "*"))
+
+    def starts_filter(self) -> bool:
+        kind, value = self.peek()
+        if kind in ("literal", "number") or (kind == "op" and value == "("):
+            return True
+        return kind == "name" and self.peek(1) == ("op", "(") and value not in _NODE_TYPE_TESTS
+
+    def parse_path(self):
+        if self.accept("op", "/"):
+            steps = self.parse_relative_path([]) if self.starts_step() else []
+            return _make_path(lambda ctx: [ctx.env.root], self.make_steps(steps))
+        if self.accept("op", "//"):
+            steps = self.parse_relative_path([self.DESCENDANT_OR_SELF])
+            return _make_path(lambda ctx: [ctx.env.root], self.make_steps(steps))
+        if self.starts_filter():
+            expr = self.parse_primary()
+            predicates = self.parse_predicates()
+            if len(predicates) > 0:
+                expr = (lambda primary: lambda ctx: _apply_predicates(_node_set(primary(ctx)), predicates, ctx.env))(expr)
+            if self.peek() in (("op", "/"), ("op", "//")):
+                steps = self.parse_relative_path([self.DESCENDANT_OR_SELF] if self.accept("op", "//") else [], separated=True)
+                return _make_path(expr, self.make_steps(steps))
+            return expr
+        return _make_path(lambda ctx: [ctx.node], self.make_steps(self.parse_relative_path([])))
+
+    def parse_relative_path(self, steps: list, separated: bool = False) -> list:
+        if separated:
+            self.accept("op", "/")
+        steps.append(self.parse_step())
+        while True:
+            if self.accept("op", "/"):
+                steps.append(self.parse_step())
+            elif self.accept("op", "//"):
+                steps.extend((self.DESCENDANT_OR_SELF, self.parse_step()))
+            else:
+                return steps
+
+    def parse_step(self) -> tuple:
+        """Returns the step as an (axis, node test, predicates, positional) tuple."""
+        if self.accept("op", "."):
+            return ("self", _any_node, [], False)
+        if self.accept("op", ".."):
+            return ("parent", _any_node, [], False)
+        if self.accept("op", "@"):
+            axis = "attribute"
+        elif self.peek()[0] == "name" and self.peek(1) == ("op", "::"):
+            axis = self.peek()[1]
+            if axis not in _AXES:
+                raise self.error(f"unsupported axis '{axis}'")
+            self.index += 2
+        else:
+            axis = "child"
+        kind, value = self.peek()
+        if kind == "op" and value == "*":
+            self.index += 1
+            test = _make_node_test(axis, "*")
+        elif kind == "name" and value in _NODE_TYPE_TESTS and self.peek(1) == ("op", "("):
+            self.index += 2
+            self.expect("op", ")")
+            test = _NODE_TYPE_TESTS[value]
+        elif kind == "name":
+            self.index += 1
+            test = _make_node_test(axis, value.lower())
+        else:
+            raise self.error(f"expected a node test but found {'the end' if value is None else repr(value)}")
+        positional = self.positional
+        self.positional = False
+        predicates = self.parse_predicates()
+        positional, self.positional = self.positional, positional or self.positional
+        return (axis, test, predicates, positional)
+
+    def parse_predicates(self) -> list:
+        predicates = []
+        while self.accept("op", "["):
+            predicates.append(self.parse_or())
+            self.expect("op", "]")
+        return predicates
+
+    def make_steps(self, steps: list) -> list:
+        """
+        Builds the step functions. '//' followed by a child step without positional predicates is evaluated as a single
+        descendant step, which returns the nodes in document order without merging and sorting per context node.
+        """
+        merged = []
+        for axis, test, predicates, positional in steps:
+            if axis == "child" and not positional and len(merged) > 0 and merged[-1] is self.DESCENDANT_OR_SELF:
+                merged[-1] = ("descendant", test, predicates, positional)
+            else:
+                merged.append((axis, test, predicates, positional))
+        return [_make_step(axis, test, predicates) for axis, test, predicates, _ in merged]
+
+    def parse_primary(self):
+        kind, value = self.peek()
+        self.index += 1
+        if kind == "literal":
+            text = value[1:-1]
+            return lambda ctx: text
+        if kind == "number":
+            self.positional = True
+            number = float(value)
+            return lambda ctx: number
+        if kind == "op" and value == "(":
+            expr = self.parse_or()
+            self.expect("op", ")")
+            return expr
+        # function call, as ensured by starts_filter
+        if value not in _FUNCTIONS:
+            raise self.error(f"unsupported function '{value}'")
+        if value in _NUMBER_FUNCTIONS:     # a number as a predicate selects by position
+            self.positional = True
+        minimum, maximum, function = _FUNCTIONS[value]
+        self.expect("op", "(")
+        args = []
+        if not self.accept("op", ")"):
+            args.append(self.parse_or())
+            while self.accept("op", ","):
+                args.append(self.parse_or())
+            self.expect("op", ")")
+        if len(args) < minimum or (maximum is not None and len(args) > maximum):
+            raise self.error(f"wrong number of arguments for {value}()")
+        return lambda ctx: function(ctx, [arg(ctx) for arg in args])
@@ -1,45 +1,76 @@
-from typing import List
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
 
 from selenium import webdriver
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import SessionNotCreatedException
+from selenium.webdriver.remote.command import Command
 
-from selex.enums import Browser, By
+from selex.cache import ElementCache
+from selex.const import DEFAULT_SCRIPT_TIMEOUT, ELEMENT_KEY
+from selex.enums import Browser, By, Condition
 from selex.keypress import DriverKeyPress
+from selex.locator import find_element_by_chain, find_elements_by_chain
+from selex.metrics import CommandMetrics, operation
+from selex.scripts import SNAPSHOT
+from selex.snapshot import Snapshot
 from selex.updater import update_chromedriver
 from selex.updater.firefox import update_geckodriver
-from selex.utils import find_element_by_text, find_elements_by_text, random_wait
-from selex.webelement import WebElement
+from selex.utils import FETCH_CHUNK_SIZE, ITER_PAGE_SIZE, fetch, find_ancestors, find_element_by_text, find_elements_by_text, iter_elements, random_delays, slow_type_actions, wait_for
+from selex.webelement import ElementRef, WebElement
 
 BASE_CLASS = {Browser.CHROME: webdriver.Chrome,
               Browser.FIREFOX: webdriver.Firefox,
               Browser.IE: webdriver.Ie,
-              Browser.EDGE: webdriver.Edge}
+              Browser.EDGE: webdriver.Edge,
+              Browser.REMOTE: webdriver.Remote}
+# commands which change or report the current window, frame or window handles, tracked by the driver to skip redundant window switches
+WINDOW_COMMANDS = frozenset((Command.SWITCH_TO_WINDOW, Command.CLOSE, Command.SWITCH_TO_FRAME, Command.SWITCH_TO_PARENT_FRAME,
+                             Command.W3C_GET_CURRENT_WINDOW_HANDLE, Command.W3C_GET_WINDOW_HANDLES, Command.NEW_WINDOW,
+                             Command.QUIT))
 
-def get_driver(browser: Browser, **kwargs):
+def make_driver_class(browser: Browser):
     """
-    Selex driver factory. The base class is allocated dynamically.
+    Creates the selex Driver class for the browser. The base class is allocated dynamically.
+    Used to build the module-level DRIVER_CLASS mapping, use that mapping instead of calling this directly.
     """
     class Driver(BASE_CLASS[browser]):
         """
         A custom Selenium webdriver with extended functionality.
         
         Parameters:
-            browser (str): Name of the browser to start the webdriver for. Must be one of: ['Chrome', 'Firefox', 'Ie', 'Edge']
+            browser (str): Name of the browser to start the webdriver for. Must be one of: ['Chrome', 'Firefox', 'Ie', 'Edge', 'Remote']
+                           Defaults to the browser the class was created for.
             
         Attributes:
             press (KeyPress): Simulates key pressess by calling the appropriately named method e.g. press.ENTER().
             implicit_wait (property): Getting the property returns the current implicit wait time of the webdriver.
                                     Setting the property automatically calls the driver.implicitly_wait() method with the new value.
+            timeout_stats (dict): Number of timeout commands "sent" to the webdriver and "avoided" because the timeout was already set.
+            switch_stats (dict): Number of window switches "sent" to the webdriver and "avoided" because the window was already current.
+            metrics (CommandMetrics): Latency and payload size of WebDriver commands, if enabled using enable_metrics().
+            element_cache (ElementCache): Cache of found elements, if enabled using enable_element_cache().
                                     
         Methods:
             find_element_by_text: Returns the first element with the fully or partially matching textual value. 
             find_elements_by_text: Returns a list of elements with the fully or partially matching textual values.
+            iter_elements: Lazily yields the matching elements, fetched in pages.
+            find_ancestors: Returns the n-th ancestors of a list of elements in a single call.
+            fetch: Reads properties of a list of elements in a single call, returned by column.
+            implicit_wait_scope: Context manager setting the implicit wait for the duration of the block.
+            wait_for: Waits until a condition holds for the element(s) matching a locator.
+            snapshot: Returns a local copy of the page which is searched and read without round trips.
             type_in: Blindly types in the text into the browser (no particular element selected).
             slow_type: Blindly types the text into the browser with a variable time delay between characters.
         """
         
-        def __init__(self, browser: Browser, **kwargs):
+        metrics = None  # CommandMetrics recording every WebDriver command if enabled; a class attribute as commands are sent during __init__
+        element_cache = None    # ElementCache of found elements if enabled, see enable_element_cache
+        _window_handle = None   # handle of the current window if known, see _track_window
+        _in_top_frame = True    # False once a frame may have been switched to; a new session starts in the top frame
+        
+        def __init__(self, browser: Browser = browser, **kwargs):
             try:
                 getattr(webdriver, browser.value).__init__(self, **kwargs)
             except SessionNotCreatedException as caught_exc:
@@ -53,7 +84,109 @@ def get_driver(browser: Browser, **kwargs):
         
             self._web_element_cls = WebElement      # return custom WebElement class using this webdriver
             self.press = DriverKeyPress(self)       # create interface for simulating key presses
-            self._implicit_wait = 0                 # sets the default implicit_wait value
+            # timeouts (in ms) known to be set on the remote end, seeded from the ones reported on session creation
+            self._timeouts = {"implicit": 0, **(getattr(self, "caps", None) or {}).get("timeouts", {})}
+            self._implicit_wait = self._timeouts["implicit"] / 1000     # sets the default implicit_wait value
+            self.timeout_stats = {"sent": 0, "avoided": 0}   # counts of timeout commands sent and skipped as redundant
+            self._lean = threading.local()      # lean.active is True while the thread finds elements as ElementRefs
+            self.switch_stats = {"sent": 0, "avoided": 0}    # counts of window switches sent and skipped as redundant
+            self._known_handles = set()     # window handles reported by the webdriver, as switch_to.window also accepts names
+        
+        def execute(self, driver_command: str, params: dict = None):
+            """
+            Sends a command to the webdriver, recording its latency and payload size if metrics are enabled.
+            Clears the element cache, if enabled, before commands which invalidate the cached elements.
+            Switching to the current window is skipped if no frame has been switched to since, as it would not change anything.
+            """
+            if self.element_cache is not None:
+                self.element_cache.notify(driver_command)
+            if driver_command in WINDOW_COMMANDS:
+                if (driver_command == Command.SWITCH_TO_WINDOW and self._in_top_frame == True
+                        and params["handle"] == self._window_handle):
+                    self.switch_stats["avoided"] += 1
+                    return {"value": None}
+                response = self._send(driver_command, params)
+                self._track_window(driver_command, params, response)
+                return response
+            return self._send(driver_command, params)
+        
+        def _send(self, driver_command: str, params: dict = None):
+            """Sends the command to the webdriver, through the metrics if enabled."""
+            if self.metrics is None:
+                return super().execute(driver_command, params)
+            return self.metrics.execute(super().execute, driver_command, params)
+        
+        def _track_window(self, driver_command: str, params: dict, response: dict):
+            """Updates the known window handle and frame state after a successful window or frame command."""
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                # a window name is accepted as well, the handle it stands for is then unknown until asked for
+                self._window_handle = params["handle"] if params["handle"] in self._known_handles else None
+                self._in_top_frame = True
+                self.switch_stats["sent"] += 1
+            elif driver_command == Command.W3C_GET_CURRENT_WINDOW_HANDLE:
+                self._window_handle = response["value"]
+                self._known_handles.add(response["value"])
+            elif driver_command == Command.W3C_GET_WINDOW_HANDLES:
+                self._known_handles = set(response["value"])
+            elif driver_command == Command.NEW_WINDOW:
+                self._known_handles.add(response["value"]["handle"])
+            elif driver_command == Command.SWITCH_TO_FRAME:
+                self._in_top_frame = params.get("id") is None
+            elif driver_command == Command.SWITCH_TO_PARENT_FRAME:
+                pass    # stays in the top frame if already there, the depth is not tracked otherwise
+            else:   # the current window is closed, or the session ended
+                self._known_handles.discard(self._window_handle)
+                self._window_handle = None
+                self._in_top_frame = False
+        
+        @property
+        def current_window_handle(self) -> str:
+            """
+            Returns the handle of the current window, sent for only if not known from previous window commands.
+            A window closed by a script of the page is not noticed, see selex.pool.driver_is_healthy for a check
+            which always reaches the browser.
+            """
+            if self._window_handle is None:
+                return super().current_window_handle
+            return self._window_handle
+        
+        def enable_element_cache(self, check_mutations: bool = True, check_interval: float = 1) -> ElementCache:
+            """
+            Starts caching the elements found by find_element(s) of the driver and its web elements, keyed by the locator
+            and the element searched within, and returns the cache. See ElementCache for the parameters.
+            The cache is disabled by setting driver.element_cache to None.
+            """
+            if self.element_cache is None:
+                self.element_cache = ElementCache(check_mutations, check_interval)
+            return self.element_cache
+        
+        def create_web_element(self, element_id: str):
+            """Creates a web element from its id, or a lightweight ElementRef while finding elements in lean mode."""
+            if getattr(self._lean, "active", False) == True:
+                return ElementRef(self, element_id)
+            return super().create_web_element(element_id)
+        
+        def _wrap_value(self, value):
+            """Converts command parameters into JSON serializable data, with elements and element refs as references."""
+            if isinstance(value, ElementRef):
+                return {ELEMENT_KEY: value.id}
+            return super()._wrap_value(value)
+        
+        @contextmanager
+        def _lean_scope(self):
+            """Context manager in which the elements found by the current thread are created as ElementRefs."""
+            previous = getattr(self._lean, "active", False)
+            self._lean.active = True
+            try:
+                yield
+            finally:
+                self._lean.active = previous
+        
+        def enable_metrics(self) -> CommandMetrics:
+            """Starts recording the latency and payload size of every WebDriver command and returns the recorded metrics."""
+            if self.metrics is None:
+                self.metrics = CommandMetrics()
+            return self.metrics
         
         @property
         def implicit_wait(self):
@@ -65,36 +198,213 @@ def get_driver(browser: Browser, **kwargs):
             """Automatically changes the implicit wait time of the webdriver whenever a new value is assigned."""
             value = 0 if value < 0 else value
             self.implicitly_wait(value)
-            self._implicit_wait = value
+        
+        @contextmanager
+        def implicit_wait_scope(self, time: float):
+            """
+            Context manager which sets the implicit wait for the duration of the block and restores the previous value afterwards.
+            Example:
+                with driver.implicit_wait_scope(5):
+                    driver.find_element(By.ID, "slow")
+            """
+            old_wait = self.implicit_wait
+            self.implicit_wait = time
+            try:
+                yield self
+            finally:
+                self.implicit_wait = old_wait
+        
+        def _set_timeout(self, name: str, time_to_wait: float, base_setter):
+            """Sets the remote timeout using base_setter, unless it is already known to have that value."""
+            if self._timeouts.get(name) == int(float(time_to_wait) * 1000):
+                self.timeout_stats["avoided"] += 1
+                return
+            base_setter(time_to_wait)
+            self._timeouts[name] = int(float(time_to_wait) * 1000)
+            self.timeout_stats["sent"] += 1
+        
+        def implicitly_wait(self, time_to_wait: float):
+            """Sets the implicit wait of the webdriver. The command is not sent if the value does not change."""
+            self._set_timeout("implicit", time_to_wait, super().implicitly_wait)
+            self._implicit_wait = time_to_wait
+        
+        def set_script_timeout(self, time_to_wait: float):
+            """Sets the asynchronous script timeout of the webdriver. The command is not sent if the value does not change."""
+            self._set_timeout("script", time_to_wait, super().set_script_timeout)
+        
+        def set_page_load_timeout(self, time_to_wait: float):
+            """Sets the page load timeout of the webdriver. The command is not sent if the value does not change."""
+            self._set_timeout("pageLoad", time_to_wait, super().set_page_load_timeout)
+        
+        @contextmanager
+        def _script_timeout_scope(self, time_to_wait: float):
+            """
+            Context manager which raises the asynchronous script timeout to at least time_to_wait seconds for the duration
+            of the block and restores the previous value afterwards. Nothing is sent if the timeout is already high enough.
+            """
+            current = self._timeouts.get("script", DEFAULT_SCRIPT_TIMEOUT)  # None means scripts never time out
+            if current is None or current >= time_to_wait * 1000:
+                yield self
+                return
+            self.set_script_timeout(time_to_wait)
+            try:
+                yield self
+            finally:
+                self.set_script_timeout(current / 1000)
+        
+        @property
+        def timeouts(self):
+            """Gets all the timeouts set on the remote end, refreshing the locally known values."""
+            timeouts = super().timeouts
+            self._timeouts.update(implicit=int(timeouts.implicit_wait * 1000), pageLoad=int(timeouts.page_load * 1000),
+                                  script=int(timeouts.script * 1000))
+            self._implicit_wait = timeouts.implicit_wait
+            return timeouts
+        
+        @timeouts.setter
+        def timeouts(self, timeouts):
+            """Sets all the provided timeouts on the remote end, updating the locally known values."""
+            webdriver.Remote.timeouts.fset(self, timeouts)
+            self._timeouts.update(timeouts._to_json())
+            self._implicit_wait = self._timeouts["implicit"] / 1000
+            self.timeout_stats["sent"] += 1
 
-        def find_element(self, by: By.ID, value: str = None) -> WebElement:
-            """Finds and returns an element by its text value."""
+        def find_element(self, by: By.ID, value: str = None, normalize_space: bool = False) -> WebElement:
+            """
+            Finds and returns an element, also by its text value or a chain of locators (By.CHAIN, see selex.locator).
+            Whitespace in text is normalized for text searches if normalize_space is True.
+            """
+            if self.element_cache is not None:
+                return self.element_cache.lookup(self, ("element", by, value, normalize_space, False, None),
+                                                 lambda: self._find_element(by, value, normalize_space))
+            return self._find_element(by, value, normalize_space)
+        
+        def _find_element(self, by: By, value: str, normalize_space: bool) -> WebElement:
             if by is By.TEXT:
-                return find_element_by_text(self, value, True)
+                return find_element_by_text(self, value, True, normalize_space)
             elif by is By.PARTIAL_TEXT:
-                return find_element_by_text(self, value, False)
+                return find_element_by_text(self, value, False, normalize_space)
+            elif by is By.CHAIN:
+                return find_element_by_chain(self, None, value)
             else:
                 return super().find_element(by, value)
         
-        def find_elements(self, by: By.ID, value: str = None) -> List[WebElement]:
-            """Finds and returns elements by their text value."""
+        def find_elements(self, by: By.ID, value: str = None, normalize_space: bool = False, lean: bool = False) -> List[WebElement]:
+            """
+            Finds and returns elements, also by their text value or a chain of locators (By.CHAIN, see selex.locator).
+            Whitespace in text is normalized for text searches if normalize_space is True.
+            If lean is True, lightweight ElementRefs are returned, which upgrade to full web elements when their
+            attributes or methods are used.
+            """
+            if self.element_cache is not None:
+                return self.element_cache.lookup(self, ("elements", by, value, normalize_space, lean, None),
+                                                 lambda: self._find_elements(by, value, normalize_space, lean))
+            return self._find_elements(by, value, normalize_space, lean)
+        
+        def _find_elements(self, by: By, value: str, normalize_space: bool, lean: bool) -> List[WebElement]:
+            if lean == True:
+                with self._lean_scope():
+                    return self._find_elements(by, value, normalize_space, False)
             if by is By.TEXT:
-                return find_elements_by_text(self, value, True)
+                return find_elements_by_text(self, value, True, normalize_space)
             elif by is By.PARTIAL_TEXT:
-                return find_elements_by_text(self, value, False)
+                return find_elements_by_text(self, value, False, normalize_space)
+            elif by is By.CHAIN:
+                return find_elements_by_chain(self, None, value)
             else:
                 return super().find_elements(by, value)
         
+        def iter_elements(self, by: By = By.ID, value: str = None, page_size: int = ITER_PAGE_SIZE,
+                          normalize_space: bool = False) -> Iterator[WebElement]:
+            """
+            Lazily yields the matching elements, fetching them in pages of page_size elements per WebDriver call, so that
+            memory stays bounded and processing can start before a huge result set is read. Supports the same locators
+            as find_elements; those which cannot be evaluated in the browser (e.g. By.LINK_TEXT) are found in one call.
+            Elements added to or removed from the page during the iteration may be skipped or yielded twice.
+            """
+            return iter_elements(self, None, by, value, page_size, normalize_space)
+        
+        @operation("find_ancestors")
+        def find_ancestors(self, elements: List[WebElement], level: int = 1, recursive: bool = True) -> List[WebElement]:
+            """
+            Returns the n-th ancestor of every element in the list, using a single WebDriver call.
+            Parameters are the same as for WebElement.find_ancestor. If not recursive, a NoSuchElement exception
+            is raised if any of the ancestors does not exist.
+            """
+            return find_ancestors(self, elements, level, recursive)
+        
+        @operation("fetch")
+        def fetch(self, elements: List[WebElement], properties: List[str], chunk_size: int = FETCH_CHUNK_SIZE,
+                  numpy: bool = False) -> dict:
+            """
+            Reads the properties of all the elements in a single WebDriver call (per chunk of elements) and returns
+            a dict of columns, i.e. a list of values for each property, in the order of the elements.
+            
+            Parameters:
+                elements (list): Web elements to read.
+                properties (list): Names of the properties to read: "text" (visible text), "tag_name", "displayed",
+                                   "rect" (dict with x, y, width and height) or the name of any element property
+                                   or attribute (e.g. "href", "value", "class").
+                chunk_size (int): Maximum number of elements read per WebDriver call.
+                numpy (bool): If True, the rects are returned as a NumPy array of shape (n, 4). Requires NumPy.
+            """
+            return fetch(self, elements, properties, chunk_size, numpy)
+        
+        @operation("wait_for")
+        def wait_for(self, locator: tuple, condition: Condition = Condition.PRESENT, timeout: float = 10, poll: bool = False):
+            """
+            Waits until the condition holds for the element(s) matching the locator and returns the first matching element
+            (PRESENT, VISIBLE) or True (ABSENT, INVISIBLE). Raises TimeoutException if the condition is not met in time.
+            
+            Parameters:
+                locator (tuple): A (by, value) pair, e.g. (By.TEXT, "Done"). All By strategies are supported.
+                condition (Condition): Condition to wait for.
+                timeout (float): Maximum time to wait for (in seconds).
+                poll (bool): If False, the wait is resolved in the browser by a MutationObserver as soon as the condition holds,
+                             taking a single request. If True, or if the locator cannot be evaluated in the browser,
+                             the elements are searched for repeatedly instead.
+            """
+            return wait_for(self, locator, condition, timeout, poll)
+        
+        @operation("snapshot")
+        def snapshot(self, root: WebElement = None) -> Snapshot:
+            """
+            Returns a local copy of the page, or of the root element's subtree, fetched in a single WebDriver call.
+            The copy is searched and read in-process, and its elements can be mapped back to live elements.
+            """
+            root_element, html = self.execute_script(SNAPSHOT, root)
+            return Snapshot(self, root_element, html)
+        
+        @operation("type_in")
         def type_in(self, string):
             """Types in the provided string into the browser window (to no particular element)."""
             action = ActionChains(self)
             action.send_keys(string)
             action.perform()
             
+        @operation("slow_type")
         def slow_type(self, text: str, max_delay: float = 0.5, min_delay: float = 0.1):
-            """Types the text into the browser with a variable delay between characters."""
-            for char in text:
-                self.type_in(char)
-                random_wait(max_delay, min_delay)
+            """
+            Types the text into the browser with a variable delay between characters.
+            The delays are paused for by the browser, so the whole text is sent in a single request.
+            """
+            for action in slow_type_actions(self, text, random_delays(len(text), max_delay, min_delay)):
+                action.perform()
     
-    return Driver(browser, **kwargs)
+    Driver.__name__ = Driver.__qualname__ = f"{browser.value}Driver"
+    return Driver
+
+
+DRIVER_CLASS = {browser: make_driver_class(browser) for browser in Browser}   # built once, shared by all sessions
+ChromeDriver = DRIVER_CLASS[Browser.CHROME]
+FirefoxDriver = DRIVER_CLASS[Browser.FIREFOX]
+IeDriver = DRIVER_CLASS[Browser.IE]
+EdgeDriver = DRIVER_CLASS[Browser.EDGE]
+RemoteDriver = DRIVER_CLASS[Browser.REMOTE]
+
+
+def get_driver(browser: Browser, **kwargs):
+    """
+    Selex driver factory. Returns an instance of the selex Driver class for the browser.
+    """
+    return DRIVER_CLASS[browser](browser, **kwargs)
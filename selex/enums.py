@@ -7,8 +7,17 @@ class Browser(Enum):
     FIREFOX = "Firefox"
     IE = "Ie"
     EDGE = "Edge"
+    REMOTE = "Remote"   # a remote end started separately, e.g. Selenium Grid or selex.testing.FakeRemote
+
+class Condition(Enum):
+    """Conditions which can be waited for using Driver.wait_for."""
+    PRESENT = "present"     # a matching element exists
+    VISIBLE = "visible"     # the first matching element exists and is displayed
+    ABSENT = "absent"       # no matching element exists
+    INVISIBLE = "invisible" # the first matching element does not exist or is not displayed
 
 # Technically not an Enum, but is used like one
 class By(_BaseBy):
     TEXT = "text"
-    PARTIAL_TEXT = "partial text"
\ No newline at end of file
+    PARTIAL_TEXT = "partial text"
+    CHAIN = "chain"     # the value is a selex.locator.Chain
\ No newline at end of file
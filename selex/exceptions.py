@@ -14,4 +14,35 @@ class WebdriverNotFoundError(SelexException):
 class NoSuchChromeDriverError(SelexException):
     """Raised when ChromeDriver with the specified major version number cannot be found."""
     def __init__(self, major_version: int):
-        super().__init__(f"ChromeDriver {major_version} cannot be found on the downloads website.")
\ No newline at end of file
+        super().__init__(f"ChromeDriver {major_version} cannot be found on the downloads website.")
+
+class DriverPoolTimeoutError(SelexException):
+    """Raised when no driver becomes available in the driver pool within the timeout."""
+    def __init__(self, timeout: float):
+        super().__init__(f"No driver became available in the pool within {timeout} seconds.")
+
+class XPathError(SelexException):
+    """Raised when an XPath expression is invalid or uses features not supported by the selex XPath evaluator."""
+    def __init__(self, expression: str, reason: str):
+        super().__init__(f"Cannot evaluate XPath '{expression}': {reason}")
+
+class WorkerRestartLimitError(SelexException):
+    """Raised when the worker processes of selex.parallel.map_urls have been restarted more times than allowed."""
+    def __init__(self, max_restarts: int, reason: str):
+        super().__init__(f"Worker processes were restarted more than {max_restarts} times. Last reason: {reason}")
+
+class ChecksumMismatchError(SelexException):
+    """Raised when a downloaded file does not have the expected checksum."""
+    def __init__(self, url: str, expected: str, actual: str):
+        super().__init__(f"The file downloaded from '{url}' has the checksum {actual}, expected {expected}.")
+
+class UpdateLockTimeoutError(SelexException):
+    """Raised when the lock file coordinating webdriver updates between processes is not acquired within the timeout."""
+    def __init__(self, lock_path: str, timeout: float):
+        super().__init__(f"The lock '{lock_path}' was not acquired within {timeout} seconds.")
+
+class ArtifactNotMirroredError(SelexException):
+    """Raised in offline mode when a webdriver archive is not in the artifact mirror."""
+    def __init__(self, name: str, version: str, platform: str):
+        super().__init__(f"{name} {version or '(any version)'} for {platform or 'any platform'} is not in the artifact mirror, "
+                         f"and downloads are disabled in offline mode.")
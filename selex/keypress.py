@@ -1,14 +1,42 @@
+from abc import ABC, abstractmethod
+
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 
+from selex.metrics import operation
+
+
+KEYS = {x: getattr(Keys, x) for x in dir(Keys) if not x.startswith('__')}   # key name -> key code e.g. 'ENTER' -> '\ue007'
+
+
+def _make_key_method(key_name: str, key):
+    """Creates a convenience method pressing the provided key e.g. press.ENTER()."""
+    @operation(f"press.{key_name}")
+    def press_key(self):
+        self._press_key(key)
+    press_key.__name__ = press_key.__qualname__ = key_name
+    press_key.__doc__ = f"Presses the {key_name} key."
+    return press_key
 
-class KeyPress:
+
+class KeyPress(ABC):
     """
-    Base KeyPress class. 
+    Base KeyPress class.
     Allows creation of two separate KeyPress classes, one for the driver and the other one for web elements.
+
+    Key press methods (e.g. press.ENTER()) are created only once, on the class itself,
+    so creating a KeyPress instance is as cheap as creating any other small object.
     """
-    def __init__(self):
-        self.keys = tuple(x for x in dir(Keys) if not x.startswith('__'))
+    __slots__ = ()
+    keys = tuple(KEYS)
+
+    @abstractmethod
+    def _press_key(self, key):
+        """Base method for pressing keys. Used to derive convenience methods rather than be used directly."""
+
+for _key_name, _key in KEYS.items():
+    setattr(KeyPress, _key_name, _make_key_method(_key_name, _key))
+del _key_name, _key
 
 
 class DriverKeyPress(KeyPress):
@@ -16,15 +44,11 @@ class DriverKeyPress(KeyPress):
     Simulates key presses in a simple and convenient way, e.g. driver.press.ENTER().
     Keys are sent into the browser without focus on any particuar element.
     """
+    __slots__ = ("_driver",)
+
     def __init__(self, driver):
-        super().__init__()
         self._driver = driver
-        for key_name in self.keys:
-            # have key press available as attribute (property) e.g. press.ENTER
-            #setattr(self.__class__, key_name, property(fget=lambda self, x=getattr(Keys, key_name): self._press_key(x)))
-            # have key press available as function e.g. press.ENTER() 
-            setattr(self, key_name, lambda x=getattr(Keys, key_name): self._press_key(x))
-            
+
     def _press_key(self, key):
         """Base method for pressing keys. Used to derive convenience methods rather than be used directly."""
         ActionChains(self._driver).send_keys(key).perform()
@@ -35,8 +59,11 @@ class ElemKeyPress(KeyPress):
     Simulates key presses in a simple and convenient way, e.g. element.press.ENTER().
     Keys are sent into a particuar web element.
     """
+    __slots__ = ("_element",)
+
     def __init__(self, element):
-        super().__init__()
         self._element = element
-        for key_name in self.keys:
-            setattr(self, key_name, lambda x=getattr(Keys, key_name): self._element.send_keys(x))
\ No newline at end of file
+
+    def _press_key(self, key):
+        """Base method for pressing keys. Used to derive convenience methods rather than be used directly."""
+        self._element.send_keys(key)
@@ -0,0 +1,184 @@
+"""
+Chained locators, which find elements through a sequence of steps in a single WebDriver call.
+
+A chain mixes text, CSS, XPath and ancestor steps. Each step searches within (or, for ancestor steps, goes up from)
+the elements matched by the previous one:
+    price = driver.find_element(By.CHAIN, Chain(By.TEXT, "Price").ancestor(2).find(By.CSS_SELECTOR, ".value"))
+
+Chains are compiled into a list of XPath and CSS queries, which a script evaluates in the browser. Consecutive steps
+which can be expressed in XPath are fused into a single XPath query, so a chain without CSS steps is found by a single
+native XPath search. Compiled chains are cached, so a chain is compiled once however often it is used.
+"""
+import itertools
+import re
+from functools import lru_cache
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.support.wait import WebDriverWait
+
+from selex.dom import evaluate_xpath, is_element, root_of, select_css
+from selex.enums import By
+from selex.exceptions import XPathError
+from selex.scripts import FIND_CHAIN
+from selex.utils import make_text_search_query, validate_ancestor_level, xpath_literal
+
+ANCESTOR = "ancestor"   # chain step going up to the n-th ancestor, which is not a By strategy
+CHAIN_POLL_FREQUENCY = 0.25     # seconds between searches for a chain evaluated by a script, while the implicit wait lasts
+_TAG_NAME = re.compile(r"^[A-Za-z][A-Za-z0-9_-]*$")
+
+
+class Chain:
+    """
+    An immutable chain of locator steps, used as the value of By.CHAIN. Hashable, so that its compiled form is cached.
+
+    Parameters:
+        by (By): Locator strategy of the first step. If None, the chain starts empty.
+        value (str): Value of the first step.
+        normalize_space (bool): If True, whitespace is normalized in a text search (By.TEXT, By.PARTIAL_TEXT) step.
+    """
+    __slots__ = ("steps",)
+
+    def __init__(self, by: By = None, value: str = None, normalize_space: bool = False, steps: tuple = ()):
+        if by is not None:
+            steps = steps + ((by, value, normalize_space),)
+        self.steps = steps
+
+    def find(self, by: By, value: str, normalize_space: bool = False) -> "Chain":
+        """Returns the chain extended by a search within the elements matched so far. Supports all By strategies
+        except By.LINK_TEXT, By.PARTIAL_LINK_TEXT and By.CHAIN."""
+        return Chain(by, value, normalize_space, steps=self.steps)
+
+    def ancestor(self, level: int = 1) -> "Chain":
+        """Returns the chain extended by going up to the n-th ancestor (1: parent, 2: grandparent etc.) of the elements
+        matched so far. Elements without that many ancestors are dropped."""
+        validate_ancestor_level(level)
+        return Chain(ANCESTOR, level, steps=self.steps)
+
+    def __eq__(self, other):
+        return isinstance(other, Chain) and self.steps == other.steps
+
+    def __hash__(self):
+        return hash(self.steps)
+
+    def __repr__(self):
+        return "Chain(" + " > ".join(f"{by}={value!r}" for by, value, _ in self.steps) + ")"
+
+
+def step_query(by: By, value, normalize_space: bool) -> tuple:
+    """
+    Translates a chain step into a (kind, query) pair, where kind is 'css' or 'xpath'. XPath queries are relative
+    to the elements matched by the previous step. Raises ValueError if the step cannot be translated.
+    """
+    if by == ANCESTOR:     # element ancestors only, so that going above <html> does not match the document node
+        return "xpath", f"./ancestor::*[{value}]"
+    elif by == By.TEXT or by == By.PARTIAL_TEXT:
+        return "xpath", make_text_search_query(value, by == By.TEXT, True, normalize_space)
+    elif by == By.XPATH:
+        return "xpath", value
+    elif by == By.CSS_SELECTOR:
+        return "css", value
+    elif by == By.ID:
+        return "xpath", f".//*[@id={xpath_literal(value)}]"
+    elif by == By.NAME:
+        return "xpath", f".//*[@name={xpath_literal(value)}]"
+    elif by == By.CLASS_NAME:
+        return "xpath", f".//*[contains(concat(' ', normalize-space(@class), ' '), {xpath_literal(' ' + value + ' ')})]"
+    elif by == By.TAG_NAME:
+        return ("xpath", f".//{value}") if _TAG_NAME.match(value) else ("css", value)
+    raise ValueError(f"Locator strategy '{by}' cannot be used in a chain.")
+
+
+def has_top_level_union(query: str) -> bool:
+    """Returns True if the XPath query is a union ('|') of expressions, outside of any brackets and string literals."""
+    depth, quote = 0, None
+    for char in query:
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+    return False
+
+
+@lru_cache(maxsize=256)
+def compile_chain(chain: Chain) -> tuple:
+    """
+    Compiles the chain into a tuple of (kind, query) pairs, evaluated one after another. Consecutive XPath steps
+    relative to the previous elements (i.e. starting with '.') are fused into a single query, unless the step is
+    a union, whose other branches would not be relative to the previous elements. Compiled chains are cached.
+    """
+    if len(chain.steps) == 0:
+        raise ValueError("The chain has no steps.")
+    queries = []
+    for by, value, normalize_space in chain.steps:
+        if by == ANCESTOR and value == 0:
+            continue
+        kind, query = step_query(by, value, normalize_space)
+        if (kind == "xpath" and query.startswith(".") and not has_top_level_union(query)
+                and len(queries) > 0 and queries[-1][0] == "xpath"):
+            queries[-1] = ("xpath", f"({queries[-1][1]})/{query}")
+        else:
+            queries.append((kind, query))
+    return tuple(queries)
+
+
+def find_elements_by_chain(driver, scope, chain: Chain) -> list:
+    """
+    Finds the elements matched by the chain within the scope (an element, or None for the whole page).
+    A chain compiled into a single XPath query is found natively, otherwise the chain is evaluated by a script,
+    searched for repeatedly while the implicit wait lasts.
+    A base function for Driver and Element class methods, not to be invoked directly.
+    """
+    queries = compile_chain(chain)
+    if len(queries) == 1 and queries[0][0] == "xpath":
+        return (scope or driver).find_elements(By.XPATH, queries[0][1])
+    def find(driver):
+        return driver.execute_script(FIND_CHAIN, scope, [list(query) for query in queries])
+    found = find(driver)
+    if len(found) == 0 and driver.implicit_wait > 0:
+        try:
+            found = WebDriverWait(driver, driver.implicit_wait, CHAIN_POLL_FREQUENCY).until(find)
+        except TimeoutException:
+            pass
+    return found
+
+
+def find_element_by_chain(driver, scope, chain: Chain):
+    """
+    Finds the first element matched by the chain. Raises NoSuchElementException if there is none.
+    A base function for Driver and Element class methods, not to be invoked directly.
+    """
+    queries = compile_chain(chain)
+    if len(queries) == 1 and queries[0][0] == "xpath":
+        return (scope or driver).find_element(By.XPATH, queries[0][1])
+    found = find_elements_by_chain(driver, scope, chain)
+    if len(found) == 0:
+        raise NoSuchElementException(f"Unable to locate element: {chain!r}")
+    return found[0]
+
+
+def select_chain(scope, queries: tuple) -> list:
+    """
+    Evaluates compiled chain queries within a parsed document or element (see selex.dom), as FIND_CHAIN does
+    in the browser. Returns the matched elements in document order.
+    """
+    root = root_of(scope)
+    nodes = [scope]
+    for kind, query in queries:
+        found = {}
+        for node in nodes:
+            matches = select_css(node, query) if kind == "css" else evaluate_xpath(node, query)
+            if not isinstance(matches, list):
+                raise XPathError(query, "the result is not a set of nodes")
+            found.update((id(match), match) for match in matches if is_element(match) or match is root)
+        nodes = list(found.values())
+        if len(nodes) > 1:
+            order = {id(node): index for index, node in enumerate(itertools.chain((root,), root.descendants))}
+            nodes.sort(key=lambda node: order[id(node)])
+    return [node for node in nodes if is_element(node)]
@@ -0,0 +1,197 @@
+"""
+Per-command latency and payload size metrics for the selex Driver.
+
+Metrics are disabled by default and cost a single attribute check per WebDriver command.
+Enable them with driver.enable_metrics(), which returns the CommandMetrics collecting them:
+    metrics = driver.enable_metrics()
+    driver.find_element(By.CSS_SELECTOR, "label").find_ancestor(2)
+    print(metrics.to_json())
+
+Commands issued by selex operations (find_ancestor, slow_type, press.ENTER etc.) are grouped under the operation,
+showing how many round trips each operation costs.
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)     # seconds
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)    # bytes
+
+
+def _json_size(value) -> int:
+    """Returns the approximate size of the value encoded as JSON. Web elements are counted as their ids."""
+    return len(json.dumps(value, default=lambda obj: getattr(obj, "id", None)))
+
+
+class Histogram:
+    """A histogram with fixed bucket upper bounds, so that its memory use does not grow with the number of observations."""
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # the last bucket holds the values above the last bound
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        """Returns the histogram as a dict with non-cumulative bucket counts keyed by their upper bound."""
+        buckets = {str(bound): count for bound, count in zip(self.bounds, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+    def cumulative(self):
+        """Yields (upper bound, cumulative count) pairs, as used by the Prometheus format."""
+        total = 0
+        for bound, count in zip(self.bounds + ("+Inf",), self.counts):
+            total += count
+            yield bound, total
+
+
+class CommandStats:
+    """Latency, request size and response size histograms of a single WebDriver command."""
+    __slots__ = ("latency", "request_bytes", "response_bytes")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.request_bytes = Histogram(SIZE_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+
+
+class CommandMetrics:
+    """
+    Records the latency and payload sizes of WebDriver commands, grouped by the selex operation which issued them.
+    Commands which were not issued by a selex operation are recorded with an empty group.
+    """
+    def __init__(self):
+        self._commands = {}     # (group, command name) -> CommandStats
+        self._operations = {}   # operation name -> number of calls
+        self._lock = threading.Lock()
+        self._local = threading.local()     # holds the name of the outermost operation in progress
+
+    @property
+    def current_group(self) -> str:
+        """Name of the outermost selex operation in progress in this thread, or an empty string."""
+        return getattr(self._local, "group", "")
+
+    @contextmanager
+    def group(self, name: str):
+        """Groups the commands issued within the block under the operation name. Nested groups are merged into the outermost one."""
+        if self.current_group != "":
+            yield
+            return
+        with self._lock:
+            self._operations[name] = self._operations.get(name, 0) + 1
+        self._local.group = name
+        try:
+            yield
+        finally:
+            self._local.group = ""
+
+    def execute(self, execute, driver_command: str, params: dict = None):
+        """Runs the driver's execute method and records the command's latency and payload sizes."""
+        request_size = _json_size(params) if params else 0
+        t_start = time.perf_counter()
+        response = execute(driver_command, params)
+        latency = time.perf_counter() - t_start
+        self.record(driver_command, latency, request_size, _json_size(response.get("value")))
+        return response
+
+    def record(self, command: str, latency: float, request_size: int = 0, response_size: int = 0):
+        """Records a single command, under the current group."""
+        key = (self.current_group, command)
+        with self._lock:
+            stats = self._commands.get(key)
+            if stats is None:
+                stats = self._commands[key] = CommandStats()
+            stats.latency.observe(latency)
+            stats.request_bytes.observe(request_size)
+            stats.response_bytes.observe(response_size)
+
+    def reset(self):
+        """Discards all recorded metrics."""
+        with self._lock:
+            self._commands.clear()
+            self._operations.clear()
+
+    def snapshot(self) -> dict:
+        """Returns the recorded metrics as a JSON serializable dict."""
+        with self._lock:
+            commands = [{"group": group,
+                         "command": command,
+                         "latency_seconds": stats.latency.snapshot(),
+                         "request_bytes": stats.request_bytes.snapshot(),
+                         "response_bytes": stats.response_bytes.snapshot()}
+                        for (group, command), stats in self._commands.items()]
+            operations = {}
+            for name, calls in self._operations.items():
+                round_trips = sum(stats.latency.count for (group, _), stats in self._commands.items() if group == name)
+                operations[name] = {"calls": calls, "round_trips": round_trips, "round_trips_per_call": round_trips / calls}
+        return {"commands": commands, "operations": operations}
+
+    def to_json(self, **kwargs) -> str:
+        """Returns the recorded metrics as a JSON string. Keyword arguments are passed to json.dumps."""
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "selex") -> str:
+        """Returns the recorded metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            items = sorted(self._commands.items())
+            histograms = [("command_duration_seconds", "WebDriver command latency.", "latency"),
+                          ("command_request_bytes", "WebDriver command request payload size.", "request_bytes"),
+                          ("command_response_bytes", "WebDriver command response payload size.", "response_bytes")]
+            for name, description, attr in histograms:
+                lines.append(f"# HELP {prefix}_{name} {description}")
+                lines.append(f"# TYPE {prefix}_{name} histogram")
+                for (group, command), stats in items:
+                    histogram = getattr(stats, attr)
+                    labels = f'command="{command}",group="{group}"'
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{prefix}_{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f"{prefix}_{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{prefix}_{name}_count{{{labels}}} {histogram.count}")
+            lines.append(f"# HELP {prefix}_operations_total Calls of selex operations.")
+            lines.append(f"# TYPE {prefix}_operations_total counter")
+            for name, calls in sorted(self._operations.items()):
+                lines.append(f'{prefix}_operations_total{{operation="{name}"}} {calls}')
+        return "\n".join(lines) + "\n"
+
+
+def find_metrics(obj):
+    """
+    Returns the CommandMetrics of the driver which the object (a driver, a web element or a key press interface) belongs to.
+    Returns None if metrics are not enabled.
+    """
+    for _ in range(4):  # key press -> element -> driver
+        metrics = getattr(obj, "metrics", None)
+        if isinstance(metrics, CommandMetrics):
+            return metrics
+        obj = getattr(obj, "_parent", None) or getattr(obj, "_element", None) or getattr(obj, "_driver", None)
+        if obj is None:
+            return None
+    return None
+
+
+def operation(name: str):
+    """
+    Decorator grouping the WebDriver commands issued by a driver or web element method under the operation name.
+    Does nothing besides looking up the metrics if they are not enabled.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = find_metrics(self)
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            with metrics.group(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
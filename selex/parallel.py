@@ -0,0 +1,285 @@
+"""
+Runs a task over many URLs in parallel, in worker processes which each own a long-lived selex driver.
+
+Example:
+    def title(driver, url):
+        return driver.title
+
+    results = map_urls(title, urls, Browser.CHROME, workers=8)
+    for result in results:     # streamed as they complete
+        print(result.url, result.value if result.error is None else result.error)
+    print(results.report())    # throughput of every worker
+
+Every worker is handed one URL at a time and URLs are taken from the iterable only when a worker is free and the
+results are consumed, so memory stays bounded however many URLs there are and however slowly the results are used.
+A worker whose process dies, or whose browser stops responding, is restarted with a new driver, and the URL it was
+working on is retried.
+"""
+import multiprocessing
+import time
+from collections import deque, namedtuple
+from multiprocessing.connection import wait as wait_for_ready
+
+from selex.driver import get_driver
+from selex.enums import Browser
+from selex.exceptions import WorkerRestartLimitError
+from selex.pool import driver_is_healthy
+
+UrlResult = namedtuple("UrlResult", ["index", "url", "value", "error", "worker", "seconds"])
+UrlResult.__doc__ = """
+Result of a task run on a URL.
+
+Attributes:
+    index (int): Position of the URL in the input.
+    url (str): The URL.
+    value: Value returned by the task, None if it failed.
+    error (str): Description of the exception raised by the task ("TypeName: message"), None if it succeeded.
+    worker (int): Number of the worker which ran the task, from 0 to workers - 1.
+    seconds (float): Time the task took, including loading the URL.
+"""
+
+WORKER_SHUTDOWN_TIMEOUT = 10    # seconds a worker is given to quit its driver before it is terminated
+
+
+def _describe(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:   # the browser is most likely dead already, which also raises connection errors of urllib3
+        pass
+
+
+def _worker_main(conn, task, browser: Browser, navigate: bool, driver_kwargs: dict):
+    """
+    Entry point of a worker process. Starts a driver and runs the task on every (index, url) job received,
+    sending back ("done", (index, value, error, seconds, exiting)) messages, until None is received.
+    Exits after sending ("failed", error) if the driver cannot be started, and after a job which left the browser
+    unresponsive, so that the worker is restarted. The "done" message of that job has exiting set to True.
+    """
+    try:
+        driver = get_driver(browser, **driver_kwargs)
+    except Exception as caught_exc:
+        conn.send(("failed", _describe(caught_exc)))
+        return
+    try:
+        while True:
+            job = conn.recv()
+            if job is None:
+                return
+            index, url = job
+            t_start = time.perf_counter()
+            value, error = None, None
+            try:
+                if navigate == True:
+                    driver.get(url)
+                value = task(driver, url)
+            except Exception as caught_exc:
+                error = _describe(caught_exc)
+            seconds = time.perf_counter() - t_start
+            exiting = error is not None and not driver_is_healthy(driver)
+            try:
+                conn.send(("done", (index, value, error, seconds, exiting)))
+            except Exception as caught_exc:     # the value cannot be pickled
+                conn.send(("done", (index, None, _describe(caught_exc), seconds, exiting)))
+            if exiting == True:
+                return
+    except (EOFError, KeyboardInterrupt):
+        return  # the parent has gone away
+    finally:
+        _quit(driver)
+
+
+class _Worker:
+    """The parent's handle of a worker process and the job it is working on."""
+    def __init__(self, number: int):
+        self.number = number
+        self.process = None
+        self.conn = None
+        self.job = None     # (index, url, attempts) sent to the worker and not yet done
+        self.exiting = False    # True once the worker is known to be exiting, so that it is not sent jobs
+
+    def start(self, context, args: tuple):
+        self.exiting = False
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, *args), daemon=True,
+                                       name=f"selex-worker-{self.number}")
+        self.process.start()
+        child_conn.close()
+
+    def stop(self):
+        """Asks the worker to quit its driver and exit, terminating it if it does not in time."""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass    # the worker has exited already
+        self.process.join(WORKER_SHUTDOWN_TIMEOUT)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+class ParallelMap:
+    """
+    Iterable of the results of a task run over URLs by worker processes, returned by map_urls.
+    The workers are started when the iteration begins and stopped when it ends (or the iterator is closed).
+
+    Attributes:
+        stats (dict): Numbers of "completed" tasks, of those which ended with an "error", of "retries"
+                      of URLs whose worker crashed and of worker "restarts".
+        worker_stats (list): For every worker, numbers of "tasks", "errors" and "restarts",
+                             and the "busy_seconds" it spent running tasks.
+    """
+    def __init__(self, task, urls, browser: Browser, workers: int, navigate: bool, retries: int,
+                 max_restarts: int, start_method: str, driver_kwargs: dict):
+        if type(workers) != int or workers < 1:
+            raise ValueError("Parameter 'workers' must be a positive integer.")
+        self.task = task
+        self.urls = urls
+        self.browser = browser
+        self.workers = workers
+        self.navigate = navigate
+        self.retries = retries
+        self.max_restarts = max_restarts
+        self._context = multiprocessing.get_context(start_method)
+        self._driver_kwargs = driver_kwargs
+        self._t_start = None
+        self._t_end = None
+        self.stats = {"completed": 0, "errors": 0, "retries": 0, "restarts": 0}
+        self.worker_stats = [{"tasks": 0, "errors": 0, "restarts": 0, "busy_seconds": 0.0} for _ in range(workers)]
+
+    def __iter__(self):
+        return self._run()
+
+    def _start(self, worker: _Worker):
+        worker.start(self._context, (self.task, self.browser, self.navigate, self._driver_kwargs))
+
+    def _restart(self, worker: _Worker, reason: str):
+        """Replaces the worker process, which has exited, raising WorkerRestartLimitError if restarted too often."""
+        worker.conn.close()
+        worker.process.join()
+        self.stats["restarts"] += 1
+        self.worker_stats[worker.number]["restarts"] += 1
+        if self.stats["restarts"] > self.max_restarts:
+            raise WorkerRestartLimitError(self.max_restarts, reason)
+        self._start(worker)
+
+    def _done(self, worker: _Worker, message: tuple) -> UrlResult:
+        index, value, error, seconds, exiting = message
+        url = worker.job[1]
+        worker.job = None
+        worker.exiting = worker.exiting or exiting
+        stats = self.worker_stats[worker.number]
+        stats["tasks"] += 1
+        stats["busy_seconds"] += seconds
+        self.stats["completed"] += 1
+        if error is not None:
+            stats["errors"] += 1
+            self.stats["errors"] += 1
+        return UrlResult(index, url, value, error, worker.number, seconds)
+
+    def _run(self):
+        jobs = ((index, url, 0) for index, url in enumerate(self.urls))
+        retried = deque()   # jobs of crashed workers (or taken while only exiting workers were free), run before new ones
+        workers = [_Worker(number) for number in range(self.workers)]
+        self._t_start, self._t_end = time.monotonic(), None
+        try:
+            for worker in workers:
+                self._start(worker)
+            exhausted = False
+            while True:
+                for worker in workers:
+                    if worker.job is None and worker.exiting == False and (len(retried) > 0 or not exhausted):
+                        job = retried.popleft() if len(retried) > 0 else next(jobs, None)
+                        if job is None:
+                            exhausted = True
+                            continue
+                        try:
+                            worker.conn.send(job[:2])
+                            worker.job = job
+                        except OSError:     # the worker has exited, the URL was not tried
+                            retried.appendleft(job)
+                            worker.exiting = True
+                if all(worker.job is None for worker in workers):
+                    if len(retried) == 0 and not exhausted:     # only exiting workers are free, look for more URLs
+                        job = next(jobs, None)
+                        if job is None:
+                            exhausted = True
+                        else:
+                            retried.append(job)
+                    if len(retried) == 0 and exhausted == True:
+                        return
+                ready = wait_for_ready([worker.conn for worker in workers] + [worker.process.sentinel for worker in workers])
+                for worker in workers:
+                    reason = None
+                    try:
+                        while worker.conn.poll():
+                            kind, message = worker.conn.recv()
+                            if kind == "done":
+                                yield self._done(worker, message)
+                            else:   # "failed" to start the driver, the worker is exiting
+                                reason = message
+                    except (EOFError, OSError):
+                        pass    # the worker has exited, see below
+                    if worker.process.sentinel in ready or not worker.process.is_alive():
+                        if worker.job is not None:
+                            index, url, attempts = worker.job
+                            if reason is not None:  # the driver did not start, the URL was not tried
+                                retried.appendleft(worker.job)
+                                worker.job = None
+                            elif attempts < self.retries:
+                                self.stats["retries"] += 1
+                                retried.append((index, url, attempts + 1))
+                                worker.job = None
+                            else:
+                                error = f"WorkerCrashed: the worker process exited with code {worker.process.exitcode}"
+                                yield self._done(worker, (index, None, error, 0.0, True))
+                        elif reason is None and worker.exiting == True:
+                            reason = "the browser stopped responding"
+                        self._restart(worker, reason or f"the worker process exited with code {worker.process.exitcode}")
+        finally:
+            self._t_end = time.monotonic()
+            for worker in workers:
+                if worker.process is not None:
+                    worker.stop()
+
+    def report(self) -> list:
+        """
+        Returns the throughput of every worker: its stats plus "tasks_per_second" (over the time of the whole run)
+        and "utilization" (the share of that time it spent running tasks).
+        """
+        if self._t_start is None:
+            elapsed = 0
+        else:
+            elapsed = (self._t_end or time.monotonic()) - self._t_start
+        return [{"worker": number, **stats,
+                 "tasks_per_second": stats["tasks"] / elapsed if elapsed > 0 else 0.0,
+                 "utilization": stats["busy_seconds"] / elapsed if elapsed > 0 else 0.0}
+                for number, stats in enumerate(self.worker_stats)]
+
+
+def map_urls(task, urls, browser: Browser = Browser.CHROME, workers: int = None, navigate: bool = True,
+             retries: int = 1, max_restarts: int = None, start_method: str = None, **driver_kwargs) -> ParallelMap:
+    """
+    Runs task(driver, url) for every URL in worker processes, which each own a long-lived selex driver, and returns
+    an iterable of UrlResults, yielded as the tasks complete (not in the order of the URLs).
+
+    Parameters:
+        task (callable): Function of the driver and the URL, returning a picklable value. Must be picklable itself
+                         (e.g. a module-level function) if the start method is not 'fork'.
+        urls (iterable): URLs to run the task on. Consumed lazily.
+        browser (Browser): Browser to start the drivers for.
+        workers (int): Number of worker processes. Defaults to the number of CPUs.
+        navigate (bool): If True, the worker loads the URL before running the task.
+        retries (int): Number of times the URL of a worker which crashed is retried on a new worker.
+        max_restarts (int): Number of worker restarts after which WorkerRestartLimitError is raised, e.g. because
+                            the driver cannot be started. Defaults to 3 restarts per worker.
+        start_method (str): multiprocessing start method ('fork', 'spawn' or 'forkserver'). Defaults to the platform's.
+        **driver_kwargs: Passed to get_driver in every worker.
+    """
+    workers = multiprocessing.cpu_count() if workers is None else workers
+    max_restarts = 3 * workers if max_restarts is None else max_restarts
+    return ParallelMap(task, urls, browser, workers, navigate, retries, max_restarts, start_method, driver_kwargs)
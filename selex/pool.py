@@ -0,0 +1,212 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+from selex.driver import get_driver
+from selex.enums import Browser
+from selex.exceptions import DriverPoolTimeoutError
+
+BLANK_PAGE = "about:blank"
+CLEAR_STORAGE_SCRIPT = "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+
+
+def reset_driver(driver):
+    """
+    Cheaply resets the browser session so that it can be reused by another job:
+    closes all but the first window, clears cookies and web storage and navigates to a blank page.
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    try:    # Chromium based browsers can clear cookies for all domains in one go
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    except (AttributeError, AssertionError, WebDriverException):    # AssertionError: the connection lacks CDP commands
+        driver.delete_all_cookies()     # only clears the cookies visible to the current page
+    driver.execute_script(CLEAR_STORAGE_SCRIPT)     # storage must be cleared before leaving the page's origin
+    driver.implicit_wait = 0
+    driver.get(BLANK_PAGE)
+
+
+def driver_is_healthy(driver) -> bool:
+    """Returns True if the browser session still responds to commands."""
+    try:
+        driver.execute(Command.W3C_GET_CURRENT_WINDOW_HANDLE)    # sent even if the driver knows the current window
+        return True
+    except Exception:   # a dead browser also raises connection errors of urllib3, not only WebDriverException
+        return False
+
+
+class DriverPool:
+    """
+    Keeps a number of warm selex drivers and hands them out to jobs,
+    saving the cost of starting a new browser for every job.
+
+    Parameters:
+        browser (Browser): Browser to start the drivers for.
+        size (int): Maximum number of drivers kept by the pool.
+        max_uses (int): Number of leases after which a driver is quit and replaced. Never replaced if None.
+        prestart (bool): If True, all drivers are started when the pool is created. Otherwise they are started on demand.
+        health_check (bool): If True, drivers are checked for responsiveness before being leased and replaced if dead.
+        **driver_kwargs: Passed to get_driver when starting a new driver.
+
+    Example:
+        with DriverPool(Browser.CHROME, size=4) as pool:
+            with pool.lease() as driver:
+                driver.get("https://github.com/")
+    """
+    def __init__(self, browser: Browser, size: int = 1, max_uses: int = None, prestart: bool = True,
+                 health_check: bool = True, **driver_kwargs):
+        if type(size) != int or size < 1:
+            raise ValueError("Parameter 'size' must be a positive integer.")
+        self.browser = browser
+        self.size = size
+        self.max_uses = max_uses
+        self.health_check = health_check
+        self._driver_kwargs = driver_kwargs
+        self._idle = deque()        # warm drivers ready to be leased
+        self._uses = {}             # driver -> number of times it has been leased
+        self._started = 0           # number of drivers alive or being started, never exceeds size
+        self._closed = False
+        self._condition = threading.Condition()
+        self.stats = {"leases": 0, "started": 0, "recycled": 0, "unhealthy": 0}
+        if prestart == True:
+            self.warm()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        """Returns the number of drivers owned by the pool (both idle and leased)."""
+        return self._started
+
+    def _start_driver(self):
+        """Starts a new driver. The caller must have already reserved a slot for it."""
+        try:
+            driver = get_driver(self.browser, **self._driver_kwargs)
+        except BaseException:
+            with self._condition:
+                self._started -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._uses[driver] = 0
+            self.stats["started"] += 1
+        return driver
+
+    def _discard(self, driver):
+        """Quits the driver and frees its slot in the pool, if it is one of the pool's drivers."""
+        with self._condition:
+            if self._uses.pop(driver, None) is not None:
+                self._started -= 1
+                self._condition.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass    # the browser is most likely dead already
+
+    def warm(self):
+        """Starts new drivers until the pool is full."""
+        while True:
+            with self._condition:
+                if self._closed or self._started >= self.size:
+                    return
+                self._started += 1
+            driver = self._start_driver()
+            with self._condition:
+                self._idle.append(driver)
+                self._condition.notify()
+
+    def acquire(self, timeout: float = None):
+        """
+        Takes a driver out of the pool. Starts a new driver if none are idle and the pool is not full yet.
+        Waits for a driver to be released otherwise, raising DriverPoolTimeoutError after 'timeout' seconds.
+        Every acquired driver must be returned using release(); prefer using lease() which does that automatically.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Cannot acquire a driver from a closed pool.")
+                    if len(self._idle) > 0:
+                        driver = self._idle.popleft()
+                        break
+                    if self._started < self.size:
+                        self._started += 1
+                        driver = None
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise DriverPoolTimeoutError(timeout)
+                    self._condition.wait(remaining)
+            if driver is None:
+                driver = self._start_driver()
+            elif self.health_check == True and not driver_is_healthy(driver):
+                with self._condition:
+                    self.stats["unhealthy"] += 1
+                self._discard(driver)
+                continue
+            with self._condition:
+                self._uses[driver] += 1
+                self.stats["leases"] += 1
+            return driver
+
+    def release(self, driver, discard: bool = False):
+        """
+        Returns the driver into the pool after resetting its session.
+        The driver is quit instead if 'discard' is True, the reset fails or it has reached 'max_uses'.
+        """
+        with self._condition:
+            uses = self._uses.get(driver)   # None for a driver which is not the pool's
+        if discard == False and not self._closed and uses is not None and (self.max_uses is None or uses < self.max_uses):
+            try:
+                reset_driver(driver)
+            except Exception:   # the browser may be dead, raising connection errors
+                discard = True
+        else:
+            discard = True
+        if discard == True or self._closed:
+            with self._condition:
+                self.stats["recycled"] += 1
+            self._discard(driver)
+        else:
+            with self._condition:
+                self._idle.append(driver)
+                self._condition.notify()
+
+    @contextmanager
+    def lease(self, timeout: float = None):
+        """
+        Context manager which acquires a driver and releases it back into the pool on exit.
+        A driver whose job raised a WebDriverException is not trusted and gets replaced.
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except WebDriverException:
+            self.release(driver, discard=True)
+            raise
+        except BaseException:
+            self.release(driver)
+            raise
+        else:
+            self.release(driver)
+
+    def close(self):
+        """Quits all idle drivers. Leased drivers are quit when they are released."""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for driver in idle:
+            self._discard(driver)
@@ -0,0 +1,215 @@
+"""
+JavaScript snippets executed in the browser by selex, so that work which would otherwise
+take many WebDriver round trips is done in a single execute_script call.
+"""
+
+# arguments: elements (list), level (int), clamp (bool)
+# Returns the level-th ancestor of each element. If an element has fewer ancestors, returns its
+# outermost ancestor when clamping, otherwise null.
+FIND_ANCESTORS = """
+var level = arguments[1], clamp = arguments[2];
+return arguments[0].map(function (elem) {
+    for (var i = 0; i < level; i++) {
+        if (elem.parentElement === null) {
+            return clamp ? elem : null;
+        }
+        elem = elem.parentElement;
+    }
+    return elem;
+});
+"""
+
+# Returns true if the element is displayed: connected, not hidden by styles and taking up space.
+_VISIBLE = """
+function visible(elem) {
+    if (elem === null || !elem.isConnected) {
+        return false;
+    }
+    var style = window.getComputedStyle(elem);
+    if (style.display === "none" || style.visibility === "hidden") {
+        return false;
+    }
+    var rect = elem.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+"""
+
+# async, arguments: kind ("css" or "xpath"), query (str), condition (str), timeout (ms), recheck interval (ms)
+# Resolves as soon as the condition holds: with the first matching element for "present" and "visible",
+# with true for "absent" and "invisible". Resolves with null on timeout.
+# The condition is rechecked on every DOM mutation, and periodically to catch changes which do not mutate
+# the DOM (e.g. visibility changes caused by stylesheets), all without leaving the browser.
+WAIT_FOR = """
+var kind = arguments[0], query = arguments[1], condition = arguments[2], timeout = arguments[3], recheck = arguments[4];
+var done = arguments[arguments.length - 1];
+var finished = false, observer = null, timer = null, interval = null;
+function find() {
+    if (kind === "css") {
+        return document.querySelector(query);
+    }
+    return document.evaluate(query, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+""" + _VISIBLE + """function check() {
+    var elem = find();
+    switch (condition) {
+        case "present": return elem !== null ? {value: elem} : null;
+        case "visible": return visible(elem) ? {value: elem} : null;
+        case "absent": return elem === null ? {value: true} : null;
+        case "invisible": return !visible(elem) ? {value: true} : null;
+    }
+    throw new Error("Unknown condition: " + condition);
+}
+function finish(value) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer !== null) { observer.disconnect(); }
+    clearTimeout(timer);
+    clearInterval(interval);
+    done(value);
+}
+function update() {
+    var result = check();
+    if (result !== null) {
+        finish(result.value);
+    }
+}
+update();
+if (!finished) {
+    observer = new MutationObserver(update);
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    interval = setInterval(update, recheck);
+    timer = setTimeout(function () { finish(null); }, timeout);
+}
+"""
+
+# arguments: root element (or null for the whole document)
+# Returns the root element and its serialized HTML, from which a local snapshot of the subtree is built.
+SNAPSHOT = """
+var root = arguments[0] || document.documentElement;
+return [root, root.outerHTML];
+"""
+
+# arguments: root element, paths (list of lists of child element indices), tag names (list)
+# Returns the element at each path below the root, or null if it does not exist or its tag name differs,
+# i.e. the page has changed since the paths were recorded.
+RESOLVE_PATHS = """
+var root = arguments[0], names = arguments[2];
+return arguments[1].map(function (path, i) {
+    var elem = root;
+    for (var j = 0; j < path.length && elem; j++) {
+        elem = elem.children[path[j]];
+    }
+    return elem && elem.tagName.toLowerCase() === names[i] ? elem : null;
+});
+"""
+
+# arguments: elements (list), property names (list)
+# Returns a column of values for each property name, with a value for each element:
+# "text" is the visible text (empty if the element is not displayed), "tag_name" the lowercase tag name,
+# "rect" [x, y, width, height] relative to the document, "displayed" whether the element is displayed.
+# Other names return the element property if it is a primitive value (e.g. "href", "value", "checked"),
+# otherwise the attribute.
+FETCH = """
+var elems = arguments[0];
+""" + _VISIBLE + """function read(elem, name) {
+    switch (name) {
+        case "text": return visible(elem) ? elem.innerText.replace(/^[ \\t\\n\\r]+|[ \\t\\n\\r]+$/g, "") : "";
+        case "tag_name": return elem.tagName.toLowerCase();
+        case "displayed": return visible(elem);
+        case "rect":
+            var rect = elem.getBoundingClientRect();
+            return [rect.left + window.scrollX, rect.top + window.scrollY, rect.width, rect.height];
+    }
+    var value = elem[name];
+    if (value === undefined || value === null || typeof value === "object" || typeof value === "function") {
+        return elem.getAttribute(name);
+    }
+    return value;
+}
+return arguments[1].map(function (name) {
+    return elems.map(function (elem) { return read(elem, name); });
+});
+"""
+
+# arguments: scope element (or null for the document), kind ("css" or "xpath"), query (str), start (int), count (int)
+# Returns the page of matches with indices start to start + count - 1 in document order, and the total number of matches.
+# XPath matches which are not elements are left out of the page. The query is evaluated on every call, so that pages of
+# a large result set are fetched without keeping it in the browser.
+FIND_PAGE = """
+var scope = arguments[0] || document, kind = arguments[1], query = arguments[2], start = arguments[3], count = arguments[4];
+var page = [], total, item;
+if (kind === "css") {
+    var matches = scope.querySelectorAll(query);
+    total = matches.length;
+    for (var i = start; i < start + count && i < total; i++) {
+        page.push(matches[i]);
+    }
+} else {
+    var result = document.evaluate(query, scope, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    total = result.snapshotLength;
+    for (var j = start; j < start + count && j < total; j++) {
+        item = result.snapshotItem(j);
+        if (item.nodeType === Node.ELEMENT_NODE) {
+            page.push(item);
+        }
+    }
+}
+return [page, total];
+"""
+
+# no arguments
+# Returns the DOM generation of the current document: a random token identifying the document, followed by the number
+# of DOM mutations observed since the first call, which installs the MutationObserver counting them.
+DOM_GENERATION = """
+var state = window.__selexGeneration;
+if (state === undefined) {
+    state = window.__selexGeneration = {token: Math.random().toString(36).slice(2), count: 0};
+    new MutationObserver(function () { state.count++; }).observe(document,
+        {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return state.token + ":" + state.count;
+"""
+
+# arguments: scope element (or null for the document), queries (list of [kind ("css" or "xpath"), query] pairs)
+# Evaluates the queries one after another, each with the nodes matched by the previous one as the context nodes,
+# and returns the elements matched by the last one, without duplicates and in document order.
+FIND_CHAIN = """
+var nodes = [arguments[0] || document];
+arguments[1].forEach(function (step) {
+    var found = [];
+    nodes.forEach(function (node) {
+        if (step[0] === "css") {
+            found.push.apply(found, node.querySelectorAll(step[1]));
+        } else {
+            var result = document.evaluate(step[1], node, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < result.snapshotLength; i++) {
+                found.push(result.snapshotItem(i));
+            }
+        }
+    });
+    nodes = Array.from(new Set(found));
+    if (nodes.length > 1) {
+        nodes.sort(function (a, b) {
+            return a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING ? -1 : 1;
+        });
+    }
+});
+return nodes.filter(function (node) { return node.nodeType === Node.ELEMENT_NODE; });
+"""
+
+# arguments: URL
+# Starts loading the URL in the current window without waiting for it, marking the document being left so that
+# PAGE_READY can tell it from the new one.
+NAVIGATE = """
+window.__selexNavigating = true;
+var url = arguments[0];
+setTimeout(function () { window.location.href = url; }, 0);
+"""
+
+# no arguments
+# Returns true once the document started by NAVIGATE has replaced the previous one and has loaded.
+PAGE_READY = """
+return window.__selexNavigating !== true && document.readyState === "complete";
+"""
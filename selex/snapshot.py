@@ -0,0 +1,138 @@
+"""
+Local snapshots of a page, fetched in a single WebDriver call and queried without further round trips.
+
+Reading the text and attributes of many elements costs a round trip per element and value. A snapshot serializes the
+page (or the subtree of an element) once, and the copy is then searched and read in-process. Elements of the copy
+can be mapped back to live web elements when an interaction is needed.
+
+Example:
+    snapshot = driver.snapshot()
+    rows = snapshot.find_elements(By.CSS_SELECTOR, "table tr")
+    prices = [row.find_element(By.XPATH, "./td[3]").text for row in rows]    # no round trips
+    rows[0].live().click()
+"""
+from typing import List
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+from selex.dom import attribute_string, element_path, is_element, parse_html, rendered_text, select_css, select_xpath
+from selex.enums import By
+from selex.locator import compile_chain, select_chain
+from selex.scripts import RESOLVE_PATHS
+from selex.utils import js_locator, make_text_search_query
+
+
+def locate(scope, by: By, value: str, normalize_space: bool = False, relative: bool = False) -> list:
+    """
+    Returns the DOM elements within the scope (a document or an element) matching the locator.
+    Supports every strategy of js_locator, By.LINK_TEXT, By.PARTIAL_LINK_TEXT and By.CHAIN, with whitespace normalized
+    for text searches if normalize_space is True. Link texts are matched against the rendered text of the links,
+    as the browser does.
+    """
+    if by == By.LINK_TEXT:
+        return [link for link in select_css(scope, "a") if rendered_text(link).strip() == value]
+    if by == By.PARTIAL_LINK_TEXT:
+        return [link for link in select_css(scope, "a") if value in rendered_text(link)]
+    if by == By.TEXT or by == By.PARTIAL_TEXT:
+        return select_xpath(scope, make_text_search_query(value, by == By.TEXT, relative, normalize_space))
+    if by == By.CHAIN:
+        return select_chain(scope, compile_chain(value))
+    kind, query = js_locator(by, value)
+    if kind == "css":
+        return select_css(scope, query)
+    return select_xpath(scope, query)
+
+
+class SnapshotElement:
+    """
+    An element of a snapshot. Reads the values as they were when the snapshot was taken: attributes rather than
+    live properties, so e.g. text typed into an input field is not included.
+    """
+    __slots__ = ("snapshot", "tag")
+
+    def __init__(self, snapshot: "Snapshot", tag):
+        self.snapshot = snapshot
+        self.tag = tag
+
+    def __eq__(self, other):
+        return isinstance(other, SnapshotElement) and self.tag is other.tag
+
+    def __hash__(self):
+        return id(self.tag)
+
+    def __repr__(self):
+        return f"<SnapshotElement {self.tag.name} at {element_path(self.tag)}>"
+
+    @property
+    def tag_name(self) -> str:
+        return self.tag.name
+
+    @property
+    def text(self) -> str:
+        """The text of the element as it would be rendered, approximated from the tags and inline styles."""
+        return rendered_text(self.tag)
+
+    def get_attribute(self, name: str) -> str:
+        """Returns the value of the attribute, or None if the element does not have it."""
+        value = self.tag.get(name)
+        return None if value is None else attribute_string(value)
+
+    def find_element(self, by: By = By.ID, value: str = None, normalize_space: bool = False) -> "SnapshotElement":
+        """Finds a sub-element in the snapshot. Raises NoSuchElementException if there is none."""
+        return self.snapshot._first(locate(self.tag, by, value, normalize_space, relative=True), by, value)
+
+    def find_elements(self, by: By = By.ID, value: str = None, normalize_space: bool = False) -> List["SnapshotElement"]:
+        """Finds sub-elements in the snapshot."""
+        return self.snapshot._wrap(locate(self.tag, by, value, normalize_space, relative=True))
+
+    def live(self):
+        """Returns the live web element this element was copied from, using a single WebDriver call."""
+        return self.snapshot.live([self])[0]
+
+
+class Snapshot:
+    """
+    A local copy of the page, or of an element's subtree, returned by Driver.snapshot.
+    Searching it supports all the locator strategies of Driver.find_elements, including By.TEXT and By.PARTIAL_TEXT.
+    XPath expressions are evaluated by the selex XPath evaluator (see selex.dom for the parts of XPath 1.0 it lacks).
+
+    Attributes:
+        document (BeautifulSoup): The parsed copy.
+        root (SnapshotElement): Element the snapshot was taken of (the <html> element for the whole page).
+    """
+    def __init__(self, driver, root_element, html: str):
+        self._driver = driver
+        self._root_element = root_element   # the live root element, which paths of the snapshot's elements start at
+        self.document = parse_html(html)
+        self.root = SnapshotElement(self, next(node for node in self.document.children if is_element(node)))
+
+    def _wrap(self, tags: list) -> List[SnapshotElement]:
+        return [SnapshotElement(self, tag) for tag in tags]
+
+    def _first(self, tags: list, by: By, value: str) -> SnapshotElement:
+        if len(tags) == 0:
+            raise NoSuchElementException(f"Unable to locate element in the snapshot: {by}={value}")
+        return SnapshotElement(self, tags[0])
+
+    def find_element(self, by: By = By.ID, value: str = None, normalize_space: bool = False) -> SnapshotElement:
+        """Finds an element in the snapshot. Raises NoSuchElementException if there is none."""
+        return self._first(locate(self.document, by, value, normalize_space), by, value)
+
+    def find_elements(self, by: By = By.ID, value: str = None, normalize_space: bool = False) -> List[SnapshotElement]:
+        """Finds elements in the snapshot."""
+        return self._wrap(locate(self.document, by, value, normalize_space))
+
+    def live(self, elements: List[SnapshotElement]) -> list:
+        """
+        Returns the live web elements the snapshot elements were copied from, using a single WebDriver call.
+        The elements are found by their position below the snapshot's root. Raises StaleElementReferenceException
+        if the page has changed so that an element is no longer there.
+        """
+        if len(elements) == 0:
+            return []
+        paths = [element_path(elem.tag)[1:] for elem in elements]   # the first index is the root's, among the top-level nodes
+        names = [elem.tag.name for elem in elements]
+        live_elements = self._driver.execute_script(RESOLVE_PATHS, self._root_element, paths, names)
+        if None in live_elements:
+            raise StaleElementReferenceException("The page has changed since the snapshot was taken.")
+        return live_elements
@@ -0,0 +1,133 @@
+"""
+Runs a task over many URLs in the tabs of a single browser session, so that pages load in some tabs while the task
+runs in another, without the memory cost of a browser per concurrent task.
+
+Example:
+    def title(driver, url):
+        return driver.title
+
+    with TabPool(driver, tabs=4) as pool:
+        for result in pool.map_urls(title, urls):    # streamed as they complete
+            print(result.url, result.value if result.error is None else result.error)
+
+Navigations are started by a script which returns at once, and the tabs still loading are polled in turn, so the task
+runs on whichever page is ready first. The driver keeps track of the current window and frame, so switching to the tab
+which is already current costs no round trip (see driver.switch_stats).
+Tabs share cookies and storage, so use worker processes (see selex.parallel) where tasks must be isolated.
+With the default page load strategy, chromedriver waits for a pending navigation before running a command in its tab;
+start the driver with page_load_strategy set to 'none' for the loads to fully overlap with the tasks.
+"""
+import time
+
+from selex.parallel import UrlResult
+from selex.scripts import NAVIGATE, PAGE_READY
+
+
+class _Tab:
+    """A tab of the pool and the URL loading or loaded in it."""
+    def __init__(self, number: int, handle: str):
+        self.number = number
+        self.handle = handle
+        self.job = None         # (index, url) loading or loaded in the tab
+        self.t_start = None     # time.perf_counter() when the navigation to the URL started
+
+
+class TabPool:
+    """
+    A pool of tabs within the session of a selex driver, scheduling tasks across them.
+    The current window is the first tab, the others are opened when the pool is created and closed by close().
+
+    Parameters:
+        driver (Driver): The selex driver whose session the tabs are opened in.
+        tabs (int): Number of tabs, including the current window.
+        load_timeout (float): Seconds after which a URL which has not loaded yields a TimeoutException error result.
+        poll_interval (float): Seconds slept when none of the loading tabs is ready.
+
+    Attributes:
+        stats (dict): Numbers of "completed" tasks, of those which ended with an "error", of URLs which did not
+                      load in time ("timeouts") and of "polls" of loading tabs which were not ready.
+    """
+    def __init__(self, driver, tabs: int = 4, load_timeout: float = 30, poll_interval: float = 0.05):
+        if type(tabs) != int or tabs < 1:
+            raise ValueError("Parameter 'tabs' must be a positive integer.")
+        self.driver = driver
+        self.load_timeout = load_timeout
+        self.poll_interval = poll_interval
+        self.stats = {"completed": 0, "errors": 0, "timeouts": 0, "polls": 0}
+        self._origin = driver.current_window_handle
+        self.tabs = [_Tab(0, self._origin)]
+        for number in range(1, tabs):
+            driver.switch_to.new_window("tab")
+            self.tabs.append(_Tab(number, driver.current_window_handle))
+        driver.switch_to.window(self._origin)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.tabs)
+
+    def _switch(self, tab: _Tab):
+        self.driver.switch_to.window(tab.handle)    # skipped by the driver if the tab is current already
+
+    def _navigate(self, tab: _Tab, jobs):
+        """Starts loading the next URL in the tab, without waiting for it. Leaves the tab idle if there are none."""
+        tab.job = next(jobs, None)
+        if tab.job is not None:
+            self._switch(tab)
+            tab.t_start = time.perf_counter()
+            self.driver.execute_script(NAVIGATE, tab.job[1])
+
+    def _result(self, tab: _Tab, value, error: str) -> UrlResult:
+        index, url = tab.job
+        self.stats["completed"] += 1
+        if error is not None:
+            self.stats["errors"] += 1
+        return UrlResult(index, url, value, error, tab.number, time.perf_counter() - tab.t_start)
+
+    def map_urls(self, task, urls):
+        """
+        Runs task(driver, url) for every URL once it has loaded in one of the tabs, and yields UrlResults (see
+        selex.parallel) as the tasks complete, with the number of the tab as the worker. The task runs with the tab
+        as the current window. As soon as a task completes, the next URL starts loading in its tab.
+        URLs are taken from the iterable only when a tab is free.
+        """
+        jobs = iter(enumerate(urls))
+        for tab in self.tabs:
+            self._navigate(tab, jobs)
+        while True:
+            loading = [tab for tab in self.tabs if tab.job is not None]
+            if len(loading) == 0:
+                return
+            ready = False
+            for tab in loading:
+                self._switch(tab)
+                if self.driver.execute_script(PAGE_READY) == True:
+                    ready = True
+                    value, error = None, None
+                    try:
+                        value = task(self.driver, tab.job[1])
+                    except Exception as caught_exc:
+                        error = f"{type(caught_exc).__name__}: {caught_exc}"
+                    result = self._result(tab, value, error)
+                elif time.perf_counter() - tab.t_start > self.load_timeout:
+                    self.stats["timeouts"] += 1
+                    result = self._result(tab, None, f"TimeoutException: the page did not load in {self.load_timeout} seconds")
+                else:
+                    self.stats["polls"] += 1
+                    continue
+                self._navigate(tab, jobs)   # the next page loads while the result is used
+                yield result
+            if ready == False:
+                time.sleep(self.poll_interval)
+
+    def close(self):
+        """Closes the tabs opened by the pool and switches back to the window which was current when it was created."""
+        for tab in self.tabs[1:]:
+            self._switch(tab)
+            self.driver.close()
+        self.tabs = self.tabs[:1]
+        self.driver.switch_to.window(self._origin)
@@ -0,0 +1,823 @@
+"""
+An in-process fake WebDriver remote end, for measuring selex round trips and throughput without a browser.
+
+FakeRemote serves the W3C WebDriver endpoints used by selex over HTTP on localhost, so the selex Driver talks to it
+exactly as it would to chromedriver. Pages are DOM models (see selex.dom) loaded from HTML. JavaScript is not run:
+the scripts sent by selex are emulated in Python instead (see register_script). Every request is counted per command
+and can be delayed by an artificial latency, so that round trips and throughput can be measured deterministically.
+
+Example:
+    with FakeRemote("<form><input name='q'><button>Search</button></form>", latency=0.002) as remote:
+        driver = remote.get_driver()
+        driver.find_element(By.NAME, "q").slow_type("selex")
+        driver.find_element(By.TEXT, "Search").click()
+        print(remote.stats)     # Counter({'findElement': 2, 'clearElement': 1, 'sendKeysToElement': 1, 'actions': 1, ...})
+        driver.quit()
+"""
+import base64
+import json
+import re
+import struct
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import zip_longest
+from pathlib import Path
+from urllib.parse import unquote_to_bytes
+from urllib.request import url2pathname
+
+from selenium.webdriver.common.options import ArgOptions
+from selenium.webdriver.remote.command import Command
+from soupsieve import SelectorSyntaxError
+
+from selex.const import ELEMENT_KEY
+from selex.dom import (attribute_string, evaluate_xpath, is_displayed, is_element, parse_html, rendered_text, root_of,
+                       select_css, select_xpath, string_value)
+from selex.driver import get_driver
+from selex.enums import Browser
+from selex.exceptions import XPathError
+from selex.locator import select_chain
+from selex.pool import CLEAR_STORAGE_SCRIPT
+from selex.scripts import (DOM_GENERATION, FETCH, FIND_ANCESTORS, FIND_CHAIN, FIND_PAGE, NAVIGATE, PAGE_READY, RESOLVE_PATHS,
+                           SNAPSHOT, WAIT_FOR)
+
+START_URL = "about:blank"
+DEFAULT_TIMEOUTS = {"implicit": 0, "pageLoad": 300000, "script": 30000}     # ms, as reported by chromedriver
+POLL_INTERVAL = 0.05    # seconds between rechecks while an implicit wait or an emulated asynchronous script waits
+BOOLEAN_ATTRIBUTES = frozenset(("autofocus", "checked", "disabled", "hidden", "multiple", "readonly", "required", "selected"))
+FORM_FIELDS = frozenset(("input", "textarea", "select"))
+
+SCRIPTS = {}            # script -> handler, see register_script
+SCRIPT_PREFIXES = []    # (prefix, handler) pairs for scripts which embed code loaded at run time
+
+
+def register_script(script: str, handler, prefix: bool = False):
+    """
+    Registers the emulation of a script executed in the browser, so that FakeRemote can answer execute_script calls.
+
+    Parameters:
+        script (str): The script, exactly as sent by the client.
+        handler (callable): handler(session, args) receives the FakeSession and the script arguments, with web element
+                            references resolved to DOM elements, and returns the script result (DOM elements allowed).
+        prefix (bool): If True, the handler is used for every script starting with 'script'.
+    """
+    if prefix == True:
+        SCRIPT_PREFIXES.append((script, handler))
+    else:
+        SCRIPTS[script] = handler
+
+
+def _png(width: int, height: int) -> bytes:
+    """Returns a blank PNG image of the given size."""
+    def chunk(kind: bytes, data: bytes):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    rows = b"".join(b"\x00" + b"\xff\xff\xff" * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+SCREENSHOT = base64.b64encode(_png(1, 1)).decode("ascii")
+
+
+class RemoteError(Exception):
+    """A W3C WebDriver error returned to the client, which Selenium raises as the matching exception."""
+    STATUS = {"invalid argument": 400, "invalid selector": 400, "invalid session id": 404, "no such element": 404,
+              "no such frame": 404, "no such window": 404, "stale element reference": 404, "unknown command": 404}
+
+    def __init__(self, error: str, message: str):
+        super().__init__(message)
+        self.error = error
+        self.status = self.STATUS.get(error, 500)
+
+    def to_json(self) -> dict:
+        return {"value": {"error": self.error, "message": str(self), "stacktrace": ""}}
+
+
+def _type_into(value: str, keys: str) -> str:
+    """Returns the value of a text field after typing in the keys. Backspace is applied, other special keys are ignored."""
+    for key in keys:
+        if key == "\ue003":     # BACKSPACE
+            value = value[:-1]
+        elif not "\ue000" <= key <= "\uf8ff":   # special keys are in the Unicode private use area
+            value += key
+    return value
+
+
+def _rect(elem) -> dict:
+    """Returns the rect of the element. Layout is not modelled: displayed elements take up a fixed size at the origin."""
+    shown = is_displayed(elem)
+    return {"x": 0, "y": 0, "width": 100 if shown else 0, "height": 20 if shown else 0}
+
+def _parent_element(elem):
+    """Returns the parent element, or None for the root element, like Node.parentElement."""
+    return elem.parent if is_element(elem.parent) else None
+
+
+class FakeWindow:
+    """A browser window (or tab), with its own page and navigation history."""
+    def __init__(self, handle: str):
+        self.handle = handle
+        self.name = ""      # window.name, by which chromedriver also switches to the window
+        self.history = []   # (url, html) pairs
+        self.position = -1  # index of the current page in history
+        self.url = START_URL
+        self.document = parse_html("")
+        self.document_token = ""    # identifies the document in its DOM generation, as the page's MutationObserver would
+        self.mutations = 0          # number of changes made to the document by FakeRemote.mutate
+
+    def show(self, url: str, html: str):
+        """Loads a new document from the HTML."""
+        self.url = url
+        self.document = parse_html(html)
+        self.document_token = uuid.uuid4().hex
+        self.mutations = 0
+
+    def navigate(self, url: str, html: str):
+        """Loads the page and adds it to the history, discarding any pages which could have been gone forward to."""
+        del self.history[self.position + 1:]
+        self.history.append((url, html))
+        self.position += 1
+        self.show(url, html)
+
+    def go(self, offset: int):
+        """Goes back (-1) or forward (1) in history, if possible. Reloads the current page for offset 0."""
+        if 0 <= self.position + offset < len(self.history):
+            self.position += offset
+            self.show(*self.history[self.position])
+
+
+class FakeSession:
+    """
+    A WebDriver session of the fake remote end. Implements the W3C WebDriver commands as methods taking the request body
+    and the URL parameters, returning the response value.
+    """
+    def __init__(self, remote: "FakeRemote", session_id: str):
+        self.remote = remote
+        self.id = session_id
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        self.windows = {}           # handle -> FakeWindow
+        self.window = self._open_window()
+        self.window.navigate(START_URL, remote.html)
+        self.elements = {}          # element id -> element
+        self.element_ids = {}       # id(element) -> element id
+        self.stale_ids = set()      # ids of the elements of documents which are no longer shown
+        self.values = {}            # element id -> current value of a form field, if it was typed into
+        self.active = None          # the element which has the focus
+        self.pointer_target = None  # the element the pointer was last moved to by actions
+        self.cookies = {}           # name -> cookie
+
+    @property
+    def document(self):
+        """The document shown in the current window."""
+        if self.window is None:
+            raise RemoteError("no such window", "The current window has been closed.")
+        return self.window.document
+
+    def _open_window(self) -> FakeWindow:
+        window = FakeWindow(uuid.uuid4().hex.upper())
+        self.windows[window.handle] = window
+        return window
+
+    # elements and values
+    def element_id(self, elem) -> str:
+        """Returns the id of the element, registering it on first use."""
+        elem_id = self.element_ids.get(id(elem))
+        if elem_id is None:
+            elem_id = str(uuid.uuid4())
+            self.elements[elem_id] = elem
+            self.element_ids[id(elem)] = elem_id
+        return elem_id
+
+    def element(self, elem_id: str):
+        """Returns the element with the id. Raises a stale element reference error if it is no longer in the document."""
+        elem = self.elements.get(elem_id)
+        if elem is None and elem_id in self.stale_ids:
+            raise RemoteError("stale element reference", "The element's document is no longer shown.")
+        elif elem is None:
+            raise RemoteError("no such element", f"No element with id '{elem_id}' is known.")
+        if root_of(elem) is not self.document:
+            raise RemoteError("stale element reference", "The element is not attached to the page document.")
+        return elem
+
+    def _forget_elements(self):
+        """Drops the references to elements of documents which are no longer shown in any window."""
+        documents = {id(window.document) for window in self.windows.values()}
+        stale = [elem_id for elem_id, elem in self.elements.items() if id(root_of(elem)) not in documents]
+        for elem_id in stale:
+            self.element_ids.pop(id(self.elements.pop(elem_id)), None)
+            self.values.pop(elem_id, None)
+            self.stale_ids.add(elem_id)
+
+    def value_of(self, elem) -> str:
+        """Returns the current value of the form field, which changes when it is typed into."""
+        elem_id = self.element_id(elem)
+        if elem_id in self.values:
+            return self.values[elem_id]
+        if elem.name == "textarea":
+            return string_value(elem)
+        return attribute_string(elem.get("value", ""))
+
+    def property_of(self, elem, name: str):
+        """Returns the value of the element property, or of the attribute for properties which are not modelled."""
+        if name == "value":
+            return self.value_of(elem)
+        elif name in BOOLEAN_ATTRIBUTES:
+            return elem.has_attr(name)
+        elif name == "tagName":
+            return elem.name.upper()
+        elif name == "className":
+            return attribute_string(elem.get("class", ""))
+        elif name == "textContent":
+            return string_value(elem)
+        elif name == "innerText":
+            return rendered_text(elem)
+        value = elem.get(name)
+        return None if value is None else attribute_string(value)
+
+    def type_keys(self, elem, keys: str):
+        """Types the keys into the element, if it is a form field."""
+        if elem is not None and elem.name in FORM_FIELDS:
+            self.values[self.element_id(elem)] = _type_into(self.value_of(elem), keys)
+
+    def serialize(self, value):
+        """Converts a result into JSON serializable data, with elements as web element references."""
+        if is_element(value):
+            return {ELEMENT_KEY: self.element_id(value)}
+        if isinstance(value, (list, tuple)):
+            return [self.serialize(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.serialize(item) for key, item in value.items()}
+        if isinstance(value, str):
+            return str(value)   # NavigableString
+        return value
+
+    def deserialize(self, value):
+        """Converts request data into Python values, resolving web element references into elements."""
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return self.element(value[ELEMENT_KEY])
+            return {key: self.deserialize(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.deserialize(item) for item in value]
+        return value
+
+    def locate(self, scope, using: str, value: str) -> list:
+        """Returns the elements within the scope (the document or an element) matching the locator."""
+        try:
+            if using == "css selector":
+                return select_css(scope, value)
+            elif using == "xpath":
+                return select_xpath(scope, value)
+        except (SelectorSyntaxError, XPathError) as caught_exc:
+            raise RemoteError("invalid selector", str(caught_exc))
+        if using == "tag name":
+            return scope.find_all(value.lower())
+        elif using == "link text":
+            return [link for link in scope.find_all("a") if rendered_text(link) == value]
+        elif using == "partial link text":
+            return [link for link in scope.find_all("a") if value in rendered_text(link)]
+        raise RemoteError("invalid argument", f"Unknown locator strategy '{using}'.")
+
+    def _find(self, scope, body: dict) -> list:
+        """Finds the elements, waiting for up to the implicit wait for at least one to appear."""
+        scope = self.document if scope is None else self.element(scope)
+        return self.remote.poll(lambda: self.locate(scope, body["using"], body["value"]), self.timeouts["implicit"] / 1000)
+
+    # session and timeouts
+    def quit(self, body: dict):
+        self.remote.sessions.pop(self.id, None)
+
+    def get_timeouts(self, body: dict):
+        return dict(self.timeouts)
+
+    def set_timeouts(self, body: dict):
+        self.timeouts.update((name, value) for name, value in body.items() if name in DEFAULT_TIMEOUTS)
+
+    # navigation
+    def get(self, body: dict):
+        self.document   # raises if the window is closed
+        self.window.navigate(body["url"], self.remote.page_html(body["url"]))
+        self._forget_elements()
+
+    def get_current_url(self, body: dict):
+        self.document
+        return self.window.url
+
+    def get_title(self, body: dict):
+        title = self.document.title
+        return "" if title is None else " ".join(string_value(title).split())
+
+    def get_page_source(self, body: dict):
+        return str(self.document)
+
+    def go_back(self, body: dict):
+        self.document
+        self.window.go(-1)
+        self._forget_elements()
+
+    def go_forward(self, body: dict):
+        self.document
+        self.window.go(1)
+        self._forget_elements()
+
+    def refresh(self, body: dict):
+        self.document
+        self.window.go(0)
+        self._forget_elements()
+
+    # windows and frames
+    def get_window_handle(self, body: dict):
+        self.document
+        return self.window.handle
+
+    def get_window_handles(self, body: dict):
+        return list(self.windows)
+
+    def switch_to_window(self, body: dict):
+        named = [window for window in self.windows.values() if window.name != "" and window.name == body.get("handle")]
+        if body.get("handle") not in self.windows and len(named) == 0:
+            raise RemoteError("no such window", f"No window with handle '{body.get('handle')}'.")
+        self.window = self.windows.get(body["handle"]) or named[0]
+
+    def new_window(self, body: dict):
+        window = self._open_window()
+        window.navigate(START_URL, "")
+        return {"handle": window.handle, "type": body.get("type") or "tab"}
+
+    def close_window(self, body: dict):
+        self.document
+        del self.windows[self.window.handle]
+        self.window = None
+        self._forget_elements()
+        return list(self.windows)
+
+    def switch_to_frame(self, body: dict):
+        if body.get("id") is not None:
+            raise RemoteError("no such frame", "Frames are not supported by the fake remote end.")
+
+    def switch_to_parent_frame(self, body: dict):
+        pass
+
+    # elements
+    def find_element(self, body: dict, elem_id: str = None):
+        found = self._find(elem_id, body)
+        if len(found) == 0:
+            raise RemoteError("no such element", f"Unable to locate element: {body['using']}={body['value']}")
+        return self.serialize(found[0])
+
+    def find_elements(self, body: dict, elem_id: str = None):
+        return self.serialize(self._find(elem_id, body))
+
+    def get_active_element(self, body: dict):
+        active = self.active if self.active is not None and root_of(self.active) is self.document else self.document.body
+        if active is None:
+            raise RemoteError("no such element", "No element has the focus.")
+        return self.serialize(active)
+
+    def click_element(self, body: dict, elem_id: str):
+        self.active = self.element(elem_id)
+
+    def clear_element(self, body: dict, elem_id: str):
+        elem = self.element(elem_id)
+        if elem.name in FORM_FIELDS:
+            self.values[elem_id] = ""
+
+    def send_keys_to_element(self, body: dict, elem_id: str):
+        self.active = self.element(elem_id)
+        self.type_keys(self.active, body.get("text", ""))
+
+    def get_element_text(self, body: dict, elem_id: str):
+        return rendered_text(self.element(elem_id))
+
+    def get_element_tag_name(self, body: dict, elem_id: str):
+        return self.element(elem_id).name
+
+    def is_element_selected(self, body: dict, elem_id: str):
+        elem = self.element(elem_id)
+        return elem.has_attr("checked") or elem.has_attr("selected")
+
+    def is_element_enabled(self, body: dict, elem_id: str):
+        return not self.element(elem_id).has_attr("disabled")
+
+    def get_element_rect(self, body: dict, elem_id: str):
+        return _rect(self.element(elem_id))
+
+    def get_element_attribute(self, body: dict, elem_id: str, name: str):
+        value = self.element(elem_id).get(name)
+        return None if value is None else attribute_string(value)
+
+    def get_element_property(self, body: dict, elem_id: str, name: str):
+        return self.property_of(self.element(elem_id), name)
+
+    def take_screenshot(self, body: dict):
+        self.document
+        return SCREENSHOT
+
+    def take_element_screenshot(self, body: dict, elem_id: str):
+        self.element(elem_id)
+        return SCREENSHOT
+
+    # scripts and actions
+    def execute_script(self, body: dict):
+        script = body.get("script", "")
+        handler = SCRIPTS.get(script)
+        if handler is None:
+            handler = next((handler for prefix, handler in SCRIPT_PREFIXES if script.startswith(prefix)), None)
+        if handler is None:
+            raise RemoteError("javascript error", f"The script is not emulated by the fake remote end: {script[:80]!r}")
+        return self.serialize(handler(self, self.deserialize(body.get("args", []))))
+
+    def perform_actions(self, body: dict):
+        """Performs the actions tick by tick: all the input sources perform their n-th action in the n-th tick."""
+        sources = body.get("actions", [])
+        for tick in zip_longest(*(source.get("actions", []) for source in sources)):
+            pause = 0
+            for source, action in zip(sources, tick):
+                if action is None:
+                    continue
+                pause = max(pause, action.get("duration") or 0)
+                if source["type"] == "key" and action["type"] == "keyDown":
+                    self.type_keys(self.active, action["value"])
+                elif source["type"] == "pointer" and action["type"] == "pointerMove" and isinstance(action.get("origin"), dict):
+                    self.pointer_target = self.deserialize(action["origin"])
+                elif source["type"] == "pointer" and action["type"] == "pointerDown":
+                    self.active = self.pointer_target or self.active
+            self.remote.pause_time += pause / 1000
+            if self.remote.honor_pauses == True and pause > 0:
+                self.remote.poll(lambda: False, pause / 1000)
+
+    def release_actions(self, body: dict):
+        pass
+
+    # cookies
+    def get_cookies(self, body: dict):
+        return list(self.cookies.values())
+
+    def add_cookie(self, body: dict):
+        cookie = body.get("cookie", {})
+        self.cookies[cookie.get("name")] = cookie
+
+    def delete_cookies(self, body: dict):
+        self.cookies.clear()
+
+    def delete_cookie(self, body: dict, name: str):
+        self.cookies.pop(name, None)
+
+
+# (command, HTTP method, path, FakeSession method name); the command names are the ones Selenium uses
+_ROUTES = [
+    (Command.QUIT, "DELETE", "", "quit"),
+    (Command.GET_TIMEOUTS, "GET", "/timeouts", "get_timeouts"),
+    (Command.SET_TIMEOUTS, "POST", "/timeouts", "set_timeouts"),
+    (Command.GET, "POST", "/url", "get"),
+    (Command.GET_CURRENT_URL, "GET", "/url", "get_current_url"),
+    (Command.GET_TITLE, "GET", "/title", "get_title"),
+    (Command.GET_PAGE_SOURCE, "GET", "/source", "get_page_source"),
+    (Command.GO_BACK, "POST", "/back", "go_back"),
+    (Command.GO_FORWARD, "POST", "/forward", "go_forward"),
+    (Command.REFRESH, "POST", "/refresh", "refresh"),
+    (Command.W3C_GET_CURRENT_WINDOW_HANDLE, "GET", "/window", "get_window_handle"),
+    (Command.W3C_GET_WINDOW_HANDLES, "GET", "/window/handles", "get_window_handles"),
+    (Command.SWITCH_TO_WINDOW, "POST", "/window", "switch_to_window"),
+    (Command.NEW_WINDOW, "POST", "/window/new", "new_window"),
+    (Command.CLOSE, "DELETE", "/window", "close_window"),
+    (Command.SWITCH_TO_FRAME, "POST", "/frame", "switch_to_frame"),
+    (Command.SWITCH_TO_PARENT_FRAME, "POST", "/frame/parent", "switch_to_parent_frame"),
+    (Command.FIND_ELEMENT, "POST", "/element", "find_element"),
+    (Command.FIND_ELEMENTS, "POST", "/elements", "find_elements"),
+    (Command.W3C_GET_ACTIVE_ELEMENT, "GET", "/element/active", "get_active_element"),
+    (Command.FIND_CHILD_ELEMENT, "POST", "/element/{elem_id}/element", "find_element"),
+    (Command.FIND_CHILD_ELEMENTS, "POST", "/element/{elem_id}/elements", "find_elements"),
+    (Command.CLICK_ELEMENT, "POST", "/element/{elem_id}/click", "click_element"),
+    (Command.CLEAR_ELEMENT, "POST", "/element/{elem_id}/clear", "clear_element"),
+    (Command.SEND_KEYS_TO_ELEMENT, "POST", "/element/{elem_id}/value", "send_keys_to_element"),
+    (Command.GET_ELEMENT_TEXT, "GET", "/element/{elem_id}/text", "get_element_text"),
+    (Command.GET_ELEMENT_TAG_NAME, "GET", "/element/{elem_id}/name", "get_element_tag_name"),
+    (Command.IS_ELEMENT_SELECTED, "GET", "/element/{elem_id}/selected", "is_element_selected"),
+    (Command.IS_ELEMENT_ENABLED, "GET", "/element/{elem_id}/enabled", "is_element_enabled"),
+    (Command.GET_ELEMENT_RECT, "GET", "/element/{elem_id}/rect", "get_element_rect"),
+    (Command.GET_ELEMENT_ATTRIBUTE, "GET", "/element/{elem_id}/attribute/{name}", "get_element_attribute"),
+    (Command.GET_ELEMENT_PROPERTY, "GET", "/element/{elem_id}/property/{name}", "get_element_property"),
+    (Command.ELEMENT_SCREENSHOT, "GET", "/element/{elem_id}/screenshot", "take_element_screenshot"),
+    (Command.SCREENSHOT, "GET", "/screenshot", "take_screenshot"),
+    (Command.W3C_EXECUTE_SCRIPT, "POST", "/execute/sync", "execute_script"),
+    (Command.W3C_EXECUTE_SCRIPT_ASYNC, "POST", "/execute/async", "execute_script"),
+    (Command.W3C_ACTIONS, "POST", "/actions", "perform_actions"),
+    (Command.W3C_CLEAR_ACTIONS, "DELETE", "/actions", "release_actions"),
+    (Command.GET_ALL_COOKIES, "GET", "/cookie", "get_cookies"),
+    (Command.ADD_COOKIE, "POST", "/cookie", "add_cookie"),
+    (Command.DELETE_ALL_COOKIES, "DELETE", "/cookie", "delete_cookies"),
+    (Command.DELETE_COOKIE, "DELETE", "/cookie/{name}", "delete_cookie"),
+]
+_ROUTES = [(command, method, re.compile("^/session/(?P<session_id>[^/]+)" + re.sub(r"{(\w+)}", r"(?P<\1>[^/]+)", path) + "$"), name)
+           for command, method, path, name in _ROUTES]
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keeps the connection alive between commands, as browser drivers do
+    disable_nagle_algorithm = True  # headers and body are written separately, which would otherwise delay every response
+
+    def do_GET(self):
+        self.respond(*self.server.remote.dispatch("GET", self.path, self.read_body()))
+
+    def do_POST(self):
+        self.respond(*self.server.remote.dispatch("POST", self.path, self.read_body()))
+
+    def do_DELETE(self):
+        self.respond(*self.server.remote.dispatch("DELETE", self.path, self.read_body()))
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length == 0:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+
+    def respond(self, status: int, payload: dict):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass    # every command would be logged to stderr
+
+
+class FakeRemote:
+    """
+    A fake WebDriver remote end serving DOM models of HTML pages, started on a free port of localhost.
+
+    Parameters:
+        html (str): HTML of the page every new session starts on (at about:blank).
+        pages (dict): HTML of the pages which can be navigated to, by URL. Also loads file: and data: URLs.
+        latency (float): Seconds every request is delayed by, to simulate the network and the browser.
+        honor_pauses (bool): If True, pauses in actions (e.g. between slowly typed characters) are waited for.
+                             Otherwise they are only added up in the 'pause_time' attribute.
+
+    Attributes:
+        url (str): URL of the remote end, to be used as the command_executor of a remote driver.
+        stats (Counter): Number of requests received per command, using the Selenium command names.
+        sessions (dict): The open sessions (FakeSession) by session id.
+        pause_time (float): Total seconds of pauses requested by actions.
+    """
+    def __init__(self, html: str = "", pages: dict = None, latency: float = 0, honor_pauses: bool = False):
+        self.html = html
+        self.pages = dict(pages or {})
+        self.latency = latency
+        self.honor_pauses = honor_pauses
+        self.stats = Counter()
+        self.sessions = {}
+        self.pause_time = 0
+        self.lock = threading.RLock()   # held while a command is handled, as the DOM models are not thread safe
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.remote = self
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(POLL_INTERVAL,), name="selex-fake-remote",
+                                        daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_driver(self, **kwargs):
+        """Starts a selex driver attached to this remote end. Keyword arguments are passed to get_driver."""
+        kwargs.setdefault("options", ArgOptions())
+        return get_driver(Browser.REMOTE, command_executor=self.url, **kwargs)
+
+    def close(self):
+        """Stops the server. Drivers attached to it can no longer be used."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_stats(self):
+        """Resets the request counts."""
+        with self.lock:
+            self.stats.clear()
+            self.pause_time = 0
+
+    def load(self, html: str):
+        """Shows the HTML in the current window of every session and makes it the start page of new sessions."""
+        with self.lock:
+            self.html = html
+            for session in self.sessions.values():
+                if session.window is not None:
+                    session.window.navigate(START_URL, html)
+                    session._forget_elements()
+
+    def mutate(self, change):
+        """
+        Changes the document shown in the current window of every session by calling change(document), like a script
+        of the page would, and counts a DOM mutation. Elements removed from the document become stale.
+        """
+        with self.lock:
+            for session in self.sessions.values():
+                if session.window is not None:
+                    change(session.window.document)
+                    session.window.mutations += 1
+
+    def page_html(self, url: str) -> str:
+        """Returns the HTML of the page at the URL."""
+        if url in self.pages:
+            return self.pages[url]
+        elif url == START_URL:
+            return ""
+        elif url.startswith("data:"):
+            header, _, data = url[5:].partition(",")
+            data = base64.b64decode(unquote_to_bytes(data)) if header.endswith(";base64") else unquote_to_bytes(data)
+            return data.decode("utf-8", errors="replace")
+        elif url.startswith("file:"):
+            try:
+                return Path(url2pathname(url[5:].split("?")[0].split("#")[0])).read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                raise RemoteError("unknown error", f"net::ERR_FILE_NOT_FOUND: {url}")
+        raise RemoteError("unknown error", f"net::ERR_NAME_NOT_RESOLVED: the fake remote end has no page at {url}")
+
+    def poll(self, check, timeout: float):
+        """
+        Calls check() until it returns a truthy value or the timeout (in seconds) expires, and returns its last result.
+        Other commands are handled while waiting in between the checks.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            result = check()
+            remaining = deadline - time.monotonic()
+            if result or remaining <= 0:
+                return result
+            self.lock.release()
+            try:
+                time.sleep(min(POLL_INTERVAL, remaining))
+            finally:
+                self.lock.acquire()
+
+    def new_session(self, body: dict) -> dict:
+        session = FakeSession(self, uuid.uuid4().hex)
+        self.sessions[session.id] = session
+        capabilities = {"browserName": "selex-fake", "browserVersion": "1.0", "platformName": "any",
+                        "acceptInsecureCerts": False, "pageLoadStrategy": "normal", "timeouts": dict(session.timeouts)}
+        return {"sessionId": session.id, "capabilities": capabilities}
+
+    def dispatch(self, method: str, path: str, body: dict) -> tuple:
+        """Handles a request and returns the HTTP status and the JSON payload of the response."""
+        path = path.split("?")[0].rstrip("/")
+        if method == "POST" and path == "/session":
+            command, name, params = Command.NEW_SESSION, None, {}
+        else:
+            for command, route_method, pattern, name in _ROUTES:
+                match = pattern.match(path) if route_method == method else None
+                if match is not None:
+                    params = match.groupdict()
+                    break
+            else:
+                return 404, RemoteError("unknown command", f"Unknown command: {method} {path}").to_json()
+        with self.lock:
+            self.stats[command] += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+        try:
+            if body is None:
+                raise RemoteError("invalid argument", "The request body is not valid JSON.")
+            with self.lock:
+                if name is None:
+                    return 200, {"value": self.new_session(body)}
+                session = self.sessions.get(params.pop("session_id"))
+                if session is None:
+                    raise RemoteError("invalid session id", "The session does not exist or has been quit.")
+                return 200, {"value": getattr(session, name)(body, **params)}
+        except RemoteError as caught_exc:
+            return caught_exc.status, caught_exc.to_json()
+        except Exception as caught_exc:     # a bug in an emulation, reported to the client rather than dropping the connection
+            return 500, RemoteError("unknown error", repr(caught_exc)).to_json()
+
+
+# Emulations of the scripts executed by selex and Selenium
+
+def _find_ancestors(session: FakeSession, args: list):
+    elements, level, clamp = args
+    ancestors = []
+    for elem in elements:
+        for _ in range(level):
+            parent = _parent_element(elem)
+            if parent is None:
+                elem = elem if clamp else None
+                break
+            elem = parent
+        ancestors.append(elem)
+    return ancestors
+
+def _wait_for(session: FakeSession, args: list):
+    kind, query, condition, timeout, _ = args
+    using = "css selector" if kind == "css" else "xpath"
+    def check():
+        found = session.locate(session.document, using, query)
+        elem = found[0] if len(found) > 0 else None
+        if condition == "present":
+            met, value = elem is not None, elem
+        elif condition == "visible":
+            met, value = elem is not None and is_displayed(elem), elem
+        elif condition == "absent":
+            met, value = elem is None, True
+        else:   # invisible
+            met, value = elem is None or not is_displayed(elem), True
+        return (value,) if met else None
+    result = session.remote.poll(check, timeout / 1000)
+    return None if result is None else result[0]
+
+def _find_page(session: FakeSession, args: list):
+    scope, kind, query, start, count = args
+    scope = session.document if scope is None else scope
+    if kind == "css":
+        matches = session.locate(scope, "css selector", query)
+    else:
+        try:
+            matches = evaluate_xpath(scope, query)
+        except XPathError as caught_exc:
+            raise RemoteError("javascript error", str(caught_exc))
+        if not isinstance(matches, list):
+            raise RemoteError("javascript error", f"The result of the XPath expression '{query}' is not a node-set.")
+    # as in the script, matches which are not elements are left out of the page after it is cut
+    return [[node for node in matches[start:start + count] if is_element(node)], len(matches)]
+
+def _find_chain(session: FakeSession, args: list):
+    scope, queries = args
+    try:
+        return select_chain(session.document if scope is None else scope, queries)
+    except (SelectorSyntaxError, XPathError) as caught_exc:
+        raise RemoteError("javascript error", str(caught_exc))
+
+def _snapshot(session: FakeSession, args: list):
+    root = args[0] if args[0] is not None else next((node for node in session.document.children if is_element(node)), None)
+    if root is None:
+        raise RemoteError("javascript error", "The document has no root element.")
+    return [root, str(root)]
+
+def _resolve_paths(session: FakeSession, args: list):
+    root, paths, names = args
+    resolved = []
+    for path, name in zip(paths, names):
+        elem = root
+        for index in path:
+            children = [child for child in elem.children if is_element(child)]
+            elem = children[index] if index < len(children) else None
+            if elem is None:
+                break
+        resolved.append(elem if elem is not None and elem.name == name else None)
+    return resolved
+
+def _fetch(session: FakeSession, args: list):
+    elements, names = args
+    def read(elem, name):
+        if name == "text":
+            return rendered_text(elem) if is_displayed(elem) else ""
+        elif name == "tag_name":
+            return elem.name
+        elif name == "displayed":
+            return is_displayed(elem)
+        elif name == "rect":
+            return list(_rect(elem).values())
+        return session.property_of(elem, name)
+    return [[read(elem, name) for elem in elements] for name in names]
+
+def _dom_generation(session: FakeSession, args: list):
+    session.document    # raises if the window has been closed
+    return f"{session.window.document_token}:{session.window.mutations}"
+
+def _navigate(session: FakeSession, args: list):
+    session.get({"url": args[0]})   # loaded at once, so the page is ready when next polled
+
+def _get_attribute(session: FakeSession, args: list):
+    elem, name = args
+    if name == "value" and elem.name in FORM_FIELDS:
+        return session.value_of(elem)
+    if name in BOOLEAN_ATTRIBUTES:
+        return "true" if elem.has_attr(name) else None
+    value = elem.get(name)
+    return None if value is None else attribute_string(value)
+
+register_script(FIND_ANCESTORS, _find_ancestors)
+register_script(WAIT_FOR, _wait_for)
+register_script(SNAPSHOT, _snapshot)
+register_script(RESOLVE_PATHS, _resolve_paths)
+register_script(FETCH, _fetch)
+register_script(FIND_PAGE, _find_page)
+register_script(FIND_CHAIN, _find_chain)
+register_script(DOM_GENERATION, _dom_generation)
+register_script(NAVIGATE, _navigate)
+register_script(PAGE_READY, lambda session, args: session.document is not None)
+register_script(CLEAR_STORAGE_SCRIPT, lambda session, args: None)
+register_script("/* isDisplayed */", lambda session, args: is_displayed(args[0]), prefix=True)
+register_script("/* getAttribute */", _get_attribute, prefix=True)
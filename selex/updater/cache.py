@@ -0,0 +1,130 @@
+"""
+A persistent cache of the versions looked up by the updater, shared by all processes of the user.
+
+Looking up the versions costs subprocesses (the browser and driver versions) and HTTP requests (the latest releases),
+which add seconds to every driver start that triggers an update. The versions are cached in a JSON file:
+    browser versions are keyed by the path and modification time of the browser executable,
+    driver versions by the path and modification time of the driver,
+    latest releases by the URL they are read from.
+Entries expire after the TTL, so that new releases are noticed. Setting the SELEX_UPDATER_NO_CACHE environment
+variable to a non-empty value bypasses the cache, as does VersionCache.bypass.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+CACHE_PATH_ENV = "SELEX_UPDATER_CACHE"     # environment variable overriding the path of the cache file
+NO_CACHE_ENV = "SELEX_UPDATER_NO_CACHE"    # environment variable bypassing the cache if set to a non-empty value
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "selex" / "updater_versions.json"
+DEFAULT_TTL = 6 * 60 * 60   # seconds
+
+
+def file_key(paths) -> str:
+    """
+    Returns a cache key made of the path and modification time of the first existing file of the paths,
+    so that the key changes when the file is replaced. Returns None if none of the files exist.
+    """
+    for path in paths:
+        try:
+            return f"{path}@{os.stat(path).st_mtime_ns}"
+        except OSError:
+            continue
+    return None
+
+
+class VersionCache:
+    """
+    Versions stored in a JSON file, each under a kind ('browser', 'driver' or 'release') and a key.
+
+    Parameters:
+        path (str): Path of the cache file. Defaults to the SELEX_UPDATER_CACHE environment variable,
+                    or ~/.cache/selex/updater_versions.json.
+        ttl (float): Seconds after which an entry expires.
+        bypass (bool): If True, every lookup computes the version and nothing is stored.
+                       If None, the cache is bypassed while the SELEX_UPDATER_NO_CACHE environment variable is set.
+
+    Attributes:
+        stats (dict): Numbers of lookups answered from the cache ("hits"), computed ("misses") and "bypassed".
+    """
+    def __init__(self, path: str = None, ttl: float = DEFAULT_TTL, bypass: bool = None):
+        self.path = Path(path or os.environ.get(CACHE_PATH_ENV) or DEFAULT_CACHE_PATH)
+        self.ttl = ttl
+        self.bypass = bypass
+        self.stats = {"hits": 0, "misses": 0, "bypassed": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def bypassed(self) -> bool:
+        """Returns True if lookups currently bypass the cache."""
+        if self.bypass is None:
+            return os.environ.get(NO_CACHE_ENV, "") != ""
+        return self.bypass
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):   # missing or corrupt, e.g. written by an older version
+            return {}
+
+    def _store(self, entries: dict):
+        """Writes the entries atomically, so that other processes never read a partially written file."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(entries, file)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass    # a read-only home directory only costs the lookups
+
+    def get(self, kind: str, key: str):
+        """Returns the cached version, or None if it is not cached or has expired."""
+        entry = self._load().get(f"{kind}|{key}")
+        if entry is None or time.time() - entry["time"] > self.ttl:
+            return None
+        return entry["value"]
+
+    def put(self, kind: str, key: str, value: str):
+        """Caches the version, keeping the entries stored by other processes in the meantime. Expired entries are dropped."""
+        with self._lock:
+            now = time.time()
+            entries = {name: entry for name, entry in self._load().items() if now - entry["time"] <= self.ttl}
+            entries[f"{kind}|{key}"] = {"value": value, "time": now}
+            self._store(entries)
+
+    def lookup(self, kind: str, key: str, compute):
+        """
+        Returns the cached version, or the one returned by compute(), which is then cached.
+        The version is always computed if the key is None (e.g. the file it would be keyed by does not exist),
+        or if the cache is bypassed. Exceptions raised by compute are not cached.
+        """
+        if key is None or self.bypassed == True:
+            self.stats["bypassed"] += 1
+            return compute()
+        value = self.get(kind, key)
+        if value is not None:
+            self.stats["hits"] += 1
+            return value
+        self.stats["misses"] += 1
+        value = compute()
+        self.put(kind, key, value)
+        return value
+
+    def clear(self):
+        """Removes all the cached versions."""
+        with self._lock:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def reset_stats(self):
+        for name in self.stats:
+            self.stats[name] = 0
+
+
+version_cache = VersionCache()     # the cache used by the updater
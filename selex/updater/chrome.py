@@ -1,14 +1,19 @@
 import re
 import requests
 import subprocess
+import time
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from bs4 import BeautifulSoup
 
 from selex.const import CMD_OUT_DECODING, CHROME
 from selex.exceptions import BrowserVersionUndeterminedError, NoSuchChromeDriverError
-from .generic import locate_generic_driver, newer_version_available, zip_download_and_extract
+from .cache import file_key, version_cache
+from .generic import locate_generic_driver, log_timings, newer_version_available, timed, zip_download_and_extract
+from .lock import UPDATE_LOCK_TIMEOUT, driver_update_lock
+from .mirror import get_mirror
 
 
 CHROME_PATH_WIN_32 = r"C:\\Program Files (x86)\\Google\\Chrome\\Application\\chrome.exe"
@@ -18,6 +23,7 @@ CHROMEDRIVER_LATEST_RELEASE = "https://chromedriver.storage.googleapis.com/LATES
 CHROMEDRIVER_DOWNLOADS_URL = "https://chromedriver.chromium.org/downloads"
 CHROMEDRIVER_API_HOME_URL = "https://chromedriver.storage.googleapis.com"
 CHROMEDRIVER_ZIP_WIN32 = "chromedriver_win32.zip"
+CHROMEDRIVER_PLATFORM = "win32"     # platform of the ChromeDriver archives, as named in the artifact mirror
 CHROMEDRIVER_EXE = "chromedriver.exe"
 CHROMEDRIVER = "ChromeDriver"
 
@@ -32,19 +38,22 @@ def get_chrome_version_win(chrome_exe_path: str = None) -> str:
     Retrieves the Chrome version on the Windows platform. 
     Checks the default installation folders of 32 and 64 bit versions.
     A custom Chrome exe path can also be specified.
+    The version is cached by the path and modification time of the first existing exe (see selex.updater.cache).
     """
     chrome_paths = [CHROME_PATH_WIN_64, CHROME_PATH_WIN_32]
     if chrome_exe_path is not None: 
         chrome_paths.insert(0, chrome_exe_path) # prepend custom path to start
-    for path in chrome_paths:
-        query = "wmic datafile where name=\"" + path + "\" get Version /value"   # problematic with f-strings
-        shell_out = subprocess.check_output(query, shell=True).decode(CMD_OUT_DECODING).strip()
-        if shell_out != "": 
-            break
-    try:
-        return chrome_version_regex.search(shell_out).group(1)
-    except AttributeError:
-        raise BrowserVersionUndeterminedError(CHROME, chrome_paths)
+    def query_version():
+        for path in chrome_paths:
+            query = "wmic datafile where name=\"" + path + "\" get Version /value"   # problematic with f-strings
+            shell_out = subprocess.check_output(query, shell=True).decode(CMD_OUT_DECODING).strip()
+            if shell_out != "": 
+                break
+        try:
+            return chrome_version_regex.search(shell_out).group(1)
+        except AttributeError:
+            raise BrowserVersionUndeterminedError(CHROME, chrome_paths)
+    return version_cache.lookup("browser", file_key(chrome_paths), query_version)    # cached until Chrome is updated
 
 
 def locate_chromedriver()-> Path:
@@ -57,11 +66,14 @@ def locate_chromedriver()-> Path:
 def get_chromedriver_version_win(chromedriver_path: str = None) -> int:
     """
     Retrieves the ChromeDriver version on the Windows platform.
+    The version is cached by the path and modification time of the driver (see selex.updater.cache).
     """
     if chromedriver_path is None:
         chromedriver_path = locate_chromedriver()
-    shell_out = subprocess.check_output(f"{chromedriver_path} -v", shell=True).decode(CMD_OUT_DECODING).strip()
-    return chromedriver_version_regex.search(shell_out).group(1)
+    def query_version():
+        shell_out = subprocess.check_output(f"{chromedriver_path} -v", shell=True).decode(CMD_OUT_DECODING).strip()
+        return chromedriver_version_regex.search(shell_out).group(1)
+    return version_cache.lookup("driver", file_key([chromedriver_path]), query_version)
 
 
 def get_latest_chromedriver_version(major_version: int = None, include_beta: False = False):
@@ -73,20 +85,31 @@ def get_latest_chromedriver_version(major_version: int = None, include_beta: Fal
                              If None is provided, searches for the latest stable major release.
         include_beta (bool): If True, search results include the ChromeDriver for the current Chrome beta release (if one exists).
                              'major_version' parameter is disregarded in this case.
+    
+    The answer is cached by the URL it is read from (see selex.updater.cache).
+    In the offline mode of the artifact mirror, the latest version in the mirror is returned instead (see selex.updater.mirror).
     """
+    mirror = get_mirror()
+    if mirror is not None and True == mirror.offline:
+        return mirror.latest(CHROMEDRIVER, CHROMEDRIVER_PLATFORM, None if True == include_beta else major_version)
     if True == include_beta:    # if beta versions are included, search the downloads page
-        return chromedriver_version_regex.search(\
-            BeautifulSoup(requests.get(CHROMEDRIVER_DOWNLOADS_URL).text, features="html.parser")\
-                .find("a", text=chromedriver_version_regex).text).group(1)
+        def read_version():
+            return chromedriver_version_regex.search(\
+                BeautifulSoup(requests.get(CHROMEDRIVER_DOWNLOADS_URL).text, features="html.parser")\
+                    .find("a", text=chromedriver_version_regex).text).group(1)
+        return version_cache.lookup("release", CHROMEDRIVER_DOWNLOADS_URL, read_version)
     else:   # otherwise access the LATEST_RELEASE file to get the latest version (much quicker)
         if None == major_version:
-            return requests.get(CHROMEDRIVER_LATEST_RELEASE).text
+            return version_cache.lookup("release", CHROMEDRIVER_LATEST_RELEASE,
+                                        lambda: requests.get(CHROMEDRIVER_LATEST_RELEASE).text)
         else:
-            version = requests.get(f"{CHROMEDRIVER_LATEST_RELEASE}_{major_version}").text
-            if not version.startswith(str(major_version)):  # if the received response is invalid
-                raise NoSuchChromeDriverError(major_version)
-            else:
+            url = f"{CHROMEDRIVER_LATEST_RELEASE}_{major_version}"
+            def read_version():
+                version = requests.get(url).text
+                if not version.startswith(str(major_version)):  # if the received response is invalid
+                    raise NoSuchChromeDriverError(major_version)
                 return version
+            return version_cache.lookup("release", url, read_version)   # invalid responses are not cached
 
 
 def parse_chrome_version(version_string: str):
@@ -96,34 +119,59 @@ def parse_chrome_version(version_string: str):
     return (ChromeVersion(*version_string.split('.')))
 
 
-def update_chromedriver(force: bool = False):
+def update_chromedriver(force: bool = False) -> dict:
     """
     Updates ChromeDriver matching the Chrome's major release version. 
     If the major versions already match, it looks for ChromeDriver updates for that particular major release.
     
+    The Chrome and ChromeDriver versions are queried concurrently. As soon as the ChromeDriver version is known, the latest
+    release for its major version is fetched speculatively, as it usually matches Chrome's. It is fetched again only
+    if Chrome turns out to be of another major version.
+    The driver's version is checked and the driver updated while holding a lock file next to it (see selex.updater.lock),
+    so that when many processes update the driver at once, one of them downloads it and the others find it up to date.
+    Returns the seconds every step took (also logged to the 'selex.updater' logger), "lock_wait" being the time spent
+    waiting for the lock and "total" the whole update. A wasted speculative fetch is reported as "latest_version_speculative".
+    
     Parameters:
         force (bool): If True, ChromeDriver will be updated even if the major version number
                       matches the one from Chrome. If False, ChromeDriver is updated only on
                       the major version number mismatch.
     """
-    browser_version_full = get_chrome_version_win()
-    browser_version_major = parse_chrome_version(browser_version_full).major
-    
-    driver_path = locate_chromedriver()
-    driver_version = get_chromedriver_version_win(driver_path)
-    latest_driver_version = get_latest_chromedriver_version(browser_version_major)  # only consider drivers suitable for the current browser
-    
-    print(f"{CHROME} version is {browser_version_full}.")
-    print(f"{CHROMEDRIVER} version is {driver_version}.")
-    print(f"{CHROMEDRIVER} version {latest_driver_version} is available.")
-    
-    if  (newer_version_available(driver_version, latest_driver_version) or
-        (browser_version_major != parse_chrome_version(latest_driver_version).major) or  # if a downgrade is required (old browser)
-        (True == force)):
-        print(f"Updating {CHROMEDRIVER}...")
-        download_link = f"{CHROMEDRIVER_API_HOME_URL}/{latest_driver_version}/{CHROMEDRIVER_ZIP_WIN32}"
-        zip_download_and_extract(download_link, driver_path.parent, [CHROMEDRIVER_EXE])
-        print(f"{CHROMEDRIVER} updated to {latest_driver_version}.")
-    else:
-        print("No update needed.")
-        
\ No newline at end of file
+    timings = {}
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="selex-updater") as executor:
+        browser_future = executor.submit(timed, timings, "browser_version", get_chrome_version_win)
+        driver_path = timed(timings, "locate_driver", locate_chromedriver)
+        with driver_update_lock(driver_path, UPDATE_LOCK_TIMEOUT) as lock:  # waits for other processes updating the driver
+            timings["lock_wait"] = lock.wait_seconds
+            driver_version = timed(timings, "driver_version", get_chromedriver_version_win, driver_path)   # as updated by them
+            guessed_major = parse_chrome_version(driver_version).major
+            speculative_future = executor.submit(timed, timings, "latest_version_speculative", get_latest_chromedriver_version, guessed_major)
+            
+            browser_version_full = browser_future.result()
+            browser_version_major = parse_chrome_version(browser_version_full).major
+            if browser_version_major != guessed_major:  # the speculative fetch was for the wrong major version, its result is ignored
+                latest_future = executor.submit(timed, timings, "latest_version", get_latest_chromedriver_version, browser_version_major)
+            else:
+                latest_future = speculative_future
+            latest_driver_version = latest_future.result()  # only consider drivers suitable for the current browser
+            if latest_future is speculative_future:     # timed once done, so the time is recorded by now
+                timings["latest_version"] = timings.pop("latest_version_speculative")
+            
+            print(f"{CHROME} version is {browser_version_full}.")
+            print(f"{CHROMEDRIVER} version is {driver_version}.")
+            print(f"{CHROMEDRIVER} version {latest_driver_version} is available.")
+            
+            if  (newer_version_available(driver_version, latest_driver_version) or
+                (browser_version_major != parse_chrome_version(latest_driver_version).major) or  # if a downgrade is required (old browser)
+                (True == force)):
+                print(f"Updating {CHROMEDRIVER}...")
+                download_link = f"{CHROMEDRIVER_API_HOME_URL}/{latest_driver_version}/{CHROMEDRIVER_ZIP_WIN32}"
+                timed(timings, "download", zip_download_and_extract, download_link, driver_path.parent, [CHROMEDRIVER_EXE],
+                      artifact=(CHROMEDRIVER, latest_driver_version, CHROMEDRIVER_PLATFORM))
+                print(f"{CHROMEDRIVER} updated to {latest_driver_version}.")
+            else:
+                print("No update needed.")
+    timings["total"] = time.perf_counter() - t_start
+    log_timings(CHROMEDRIVER, timings)
+    return timings
@@ -1,12 +1,17 @@
 import re
 import requests
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from bs4 import BeautifulSoup
 
 from selex.const import CMD_OUT_DECODING
-from .generic import locate_generic_driver, newer_version_available, zip_download_and_extract
+from .cache import file_key, version_cache
+from .generic import locate_generic_driver, log_timings, newer_version_available, timed, zip_download_and_extract
+from .lock import UPDATE_LOCK_TIMEOUT, driver_update_lock
+from .mirror import get_mirror
 
 
 GECKODRIVER = "GeckoDriver"
@@ -36,44 +41,68 @@ def locate_geckodriver() -> Path:
 def get_geckodriver_version_win(geckodriver_path: str = None) -> str:
     """
     Returns the current geckodriver.exe version as string.
+    The version is cached by the path and modification time of the driver (see selex.updater.cache).
     """
     if geckodriver_path == None:
         geckodriver_path = locate_geckodriver()
-    shell_out = subprocess.check_output(f"{geckodriver_path} --version", shell=True).decode(CMD_OUT_DECODING).strip()
-    return geckodriver_version_regex.search(shell_out).group(1)
+    def query_version():
+        shell_out = subprocess.check_output(f"{geckodriver_path} --version", shell=True).decode(CMD_OUT_DECODING).strip()
+        return geckodriver_version_regex.search(shell_out).group(1)
+    return version_cache.lookup("driver", file_key([geckodriver_path]), query_version)
 
 
 def get_latest_geckodriver_version():
     """
     Returns the latest available geckodriver release version from GitHub.
+    The answer is cached (see selex.updater.cache).
+    In the offline mode of the artifact mirror, the latest version in the mirror is returned instead (see selex.updater.mirror).
     """
-    href_regex = re.compile("/mozilla/geckodriver/releases/tag/")
-    link_text = BeautifulSoup(requests.get(GECKODRIVER_DOWNLOADS_URL).text, features="html.parser").find("a", href=href_regex).text
-    return link_text.strip().replace('v','')    # remove whitespace and preceeding 'v' character
+    mirror = get_mirror()
+    if mirror is not None and True == mirror.offline:
+        return mirror.latest(GECKODRIVER)
+    def read_version():
+        href_regex = re.compile("/mozilla/geckodriver/releases/tag/")
+        link_text = BeautifulSoup(requests.get(GECKODRIVER_DOWNLOADS_URL).text, features="html.parser").find("a", href=href_regex).text
+        return link_text.strip().replace('v','')    # remove whitespace and preceeding 'v' character
+    return version_cache.lookup("release", GECKODRIVER_DOWNLOADS_URL, read_version)
 
 
-def update_geckodriver(force: bool = False):
+def update_geckodriver(force: bool = False) -> dict:
     """
     Updates ChromeDriver to match the current Chrome version.
     
+    The latest release is fetched while the local GeckoDriver version is queried.
+    The version is checked and the driver updated while holding a lock file next to it (see selex.updater.lock).
+    Returns the seconds every step took (also logged to the 'selex.updater' logger), "lock_wait" being the time spent
+    waiting for the lock and "total" the whole update.
+    
     Parameters:
         force (bool): If True, ChromeDriver will be updated even if the major version number
                       matches the one from Chrome. If False, ChromeDriver is updated only on
                       the major version number mismatch.
     """
-    geckodriver_path = locate_geckodriver()
-    current_version = get_geckodriver_version_win(geckodriver_path)
-    latest_version = get_latest_geckodriver_version()
-    
-    print(f"Current {GECKODRIVER} version is {current_version}.")
-    print(f"Latest {GECKODRIVER} version is {latest_version}.")
-    
-    if (newer_version_available(current_version, latest_version) or (True == force)):
-        print(f"Updating {GECKODRIVER}...")
-        firefox_bits = get_firefox_bit_version_win()
-        download_link = f"https://github.com/mozilla/geckodriver/releases/download/v{latest_version}/geckodriver-v{latest_version}-win{firefox_bits}.zip"
-        zip_download_and_extract(download_link, geckodriver_path.parent, [GECKODRIVER_EXE])
-        print(f"{GECKODRIVER} updated to {latest_version}.")
-    else:
-        print("No update needed.")
-        
\ No newline at end of file
+    timings = {}
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="selex-updater") as executor:
+        latest_future = executor.submit(timed, timings, "latest_version", get_latest_geckodriver_version)
+        geckodriver_path = timed(timings, "locate_driver", locate_geckodriver)
+        with driver_update_lock(geckodriver_path, UPDATE_LOCK_TIMEOUT) as lock:     # waits for other processes updating the driver
+            timings["lock_wait"] = lock.wait_seconds
+            current_version = timed(timings, "driver_version", get_geckodriver_version_win, geckodriver_path)
+            latest_version = latest_future.result()
+            
+            print(f"Current {GECKODRIVER} version is {current_version}.")
+            print(f"Latest {GECKODRIVER} version is {latest_version}.")
+            
+            if (newer_version_available(current_version, latest_version) or (True == force)):
+                print(f"Updating {GECKODRIVER}...")
+                firefox_bits = get_firefox_bit_version_win()
+                download_link = f"https://github.com/mozilla/geckodriver/releases/download/v{latest_version}/geckodriver-v{latest_version}-win{firefox_bits}.zip"
+                timed(timings, "download", zip_download_and_extract, download_link, geckodriver_path.parent, [GECKODRIVER_EXE],
+                      artifact=(GECKODRIVER, latest_version, f"win{firefox_bits}"))
+                print(f"{GECKODRIVER} updated to {latest_version}.")
+            else:
+                print("No update needed.")
+    timings["total"] = time.perf_counter() - t_start
+    log_timings(GECKODRIVER, timings)
+    return timings
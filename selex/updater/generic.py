@@ -1,10 +1,22 @@
+import hashlib
+import logging
+import os
 import requests
 import sys
-from io import BytesIO
+import tempfile
+import time
 from pathlib import Path
+from urllib.parse import urlparse
 from zipfile import ZipFile
 
-from ..exceptions import WebdriverNotFoundError
+from ..exceptions import ArtifactNotMirroredError, ChecksumMismatchError, WebdriverNotFoundError
+from .mirror import get_mirror
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024     # bytes
+DOWNLOAD_RETRIES = 3    # times an interrupted download is resumed
+DOWNLOAD_TIMEOUT = 30   # seconds to connect, and between received chunks
+
+logger = logging.getLogger("selex.updater")
 
 
 def locate_on_syspath(pattern: str) -> Path:
@@ -41,15 +53,136 @@ def newer_version_available(current_version_local: str, latest_version_online: s
     return list(map(int, latest_version_online.split('.'))) > list(map(int, current_version_local.split('.')))
 
 
-def zip_download_and_extract(download_link: str, output_dir: str = None, files: list = None):
+def timed(timings: dict, step: str, func, *args, **kwargs):
+    """
+    Calls func(*args, **kwargs) and records the seconds it took in timings[step], also if it raises.
+    Used to report how long every step of a driver update takes, as the steps may run concurrently.
+    """
+    t_start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        timings[step] = time.perf_counter() - t_start
+
+
+def log_timings(driver_name: str, timings: dict):
+    """Logs the seconds every step of an update took, at the debug level of the 'selex.updater' logger."""
+    logger.debug("%s update steps took: %s", driver_name, ", ".join(f"{step} {seconds:.3f} s" for step, seconds in timings.items()))
+
+
+def _checksum_hasher(checksum: str):
+    """Returns the hashlib object and the expected hex digest of a checksum given as 'algorithm:hexdigest' or a SHA-256 hex digest."""
+    algorithm, _, digest = checksum.rpartition(":")
+    return hashlib.new(algorithm or "sha256"), digest.lower()
+
+
+def download_file(download_link: str, output_path: str, checksum: str = None, progress = None,
+                  chunk_size: int = DOWNLOAD_CHUNK_SIZE, retries: int = DOWNLOAD_RETRIES) -> Path:
+    """
+    Streams the file to disk in chunks, so that memory use does not depend on its size, and returns its path.
+    The file is written to '<output_path>.part' and renamed into place once complete and verified. A partial file left
+    by an interrupted download is resumed, if the server supports range requests.
+    
+    Parameters:
+        download_link (str): URL of the file.
+        output_path (str): Path the file is saved to.
+        checksum (str): Expected checksum, as 'algorithm:hexdigest' (any hashlib algorithm, e.g. 'sha256:9f86d0...')
+                        or a SHA-256 hex digest. Raises ChecksumMismatchError if the file does not match. Not verified if None.
+        progress (callable): Called after every chunk with the bytes downloaded so far, the size of the file
+                             (None if unknown) and the throughput in bytes per second.
+        chunk_size (int): Number of bytes read and written at once.
+        retries (int): Number of times an interrupted download is resumed before the error is raised.
+    """
+    output_path = Path(output_path)
+    part_path = output_path.with_name(output_path.name + ".part")
+    for attempt in range(retries + 1):
+        try:
+            _download_part(download_link, part_path, progress, chunk_size)
+            break
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+            if attempt == retries:
+                raise
+            logger.debug("Download of %s interrupted, resuming (attempt %d of %d).", download_link, attempt + 1, retries)
+    if checksum is not None:
+        hasher, expected = _checksum_hasher(checksum)
+        with open(part_path, "rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                hasher.update(chunk)
+        if hasher.hexdigest() != expected:
+            part_path.unlink()
+            raise ChecksumMismatchError(download_link, expected, hasher.hexdigest())
+    os.replace(part_path, output_path)
+    return output_path
+
+
+def _download_part(download_link: str, part_path: Path, progress, chunk_size: int):
+    """Downloads the file to the partial file, appending to it if the server can resume from its size."""
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+    with requests.get(download_link, stream=True, headers=headers, timeout=DOWNLOAD_TIMEOUT) as response:
+        if response.status_code == 416 and offset > 0:  # nothing left after the offset, the previous attempt was complete
+            return
+        response.raise_for_status()
+        if response.status_code != 206:     # the server sent the whole file
+            offset = 0
+        length = response.headers.get("Content-Length")
+        total = offset + int(length) if length is not None else None
+        downloaded = offset
+        t_start = time.perf_counter()
+        with open(part_path, "ab" if offset > 0 else "wb") as file:
+            for chunk in response.iter_content(chunk_size):
+                file.write(chunk)
+                downloaded += len(chunk)
+                if progress is not None:
+                    elapsed = time.perf_counter() - t_start
+                    progress(downloaded, total, (downloaded - offset) / elapsed if elapsed > 0 else 0.0)
+
+
+def zip_download_and_extract(download_link: str, output_dir: str = None, files: list = None, checksum: str = None,
+                             progress = None, artifact: tuple = None):
     """
-    Downloads the Zip file straight to RAM and extracts the nominated files to the output folder.
+    Streams the Zip file to a temporary file and extracts the nominated files to the output folder.
+    Every file is extracted next to its destination and renamed into place, so that a driver is never left half written.
     
     Parameters:
         download_link (str): URL to the Zip archive.
         output_dir (str): Folder to which the file(s) will be extracted to. Uses CWD if None.
         files (list): Names of files to be extracted. Extracts all if None.
+        checksum (str): Expected checksum of the Zip archive, see download_file.
+        progress (callable): Called with the progress of the download, see download_file.
+        artifact (tuple): The (name, version, platform) of the archive. If given and an artifact mirror is configured
+                          (see selex.updater.mirror), the archive is taken from the mirror if present, and added
+                          to it once downloaded otherwise.
     """
-    with ZipFile(BytesIO(requests.get(download_link, stream=True).content)) as zipf:
-        zipf.extractall(output_dir, files)
-        
\ No newline at end of file
+    output_dir = Path(output_dir or ".")
+    mirror = get_mirror() if artifact is not None else None
+    archive_path = None if mirror is None else mirror.get(*artifact)
+    downloaded = archive_path is None
+    if downloaded == True:
+        if mirror is not None and mirror.offline == True:
+            raise ArtifactNotMirroredError(*artifact)
+        file_name = Path(urlparse(download_link).path).name
+        # named after the URL, so that only a download of the same archive is resumed
+        archive_name = f".{hashlib.sha1(download_link.encode()).hexdigest()[:10]}-{file_name}"
+        archive_path = download_file(download_link, output_dir / archive_name, checksum, progress)
+    try:
+        if downloaded == True and mirror is not None:
+            try:
+                mirror.put(*artifact, archive_path, file_name)
+            except OSError as caught_exc:   # e.g. a read-only or full share, which must not fail the update
+                logger.warning("Could not add %s to the artifact mirror: %s", file_name, caught_exc)
+        with ZipFile(archive_path) as zipf, tempfile.TemporaryDirectory(dir=output_dir, prefix=".selex-") as temp_dir:
+            if files is None:
+                members = [member for member in zipf.infolist() if not member.is_dir()]
+            else:   # raises KeyError for a file missing from the archive, as extractall does
+                members = [zipf.getinfo(name) for name in files]
+            for member in members:
+                extracted = Path(zipf.extract(member, temp_dir))    # the member name is sanitised by extract
+                destination = output_dir / extracted.relative_to(temp_dir)
+                if not destination.resolve().is_relative_to(output_dir.resolve()):
+                    raise ValueError(f"The archive member '{member.filename}' would be extracted outside '{output_dir}'.")
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(extracted, destination)
+    finally:
+        if downloaded == True:
+            archive_path.unlink()
@@ -0,0 +1,141 @@
+"""
+A lock file coordinating webdriver updates between processes.
+
+When many processes fail to start their browsers at once (typically after the browser updated itself), they all try
+to update the same driver. The update holds a lock file next to the driver, so that one process downloads the driver
+while the others wait, and then find it up to date:
+    with FileLock(driver_path.with_name(driver_path.name + ".lock")) as lock:
+        ...     # check the driver version and update it if needed
+    print(lock.wait_seconds)
+
+The lock is held by an operating system lock on the file (flock on POSIX, msvcrt.locking on Windows), so it is released
+when the process dies, and a stale lock file never blocks an update.
+If the lock file cannot be created next to the driver (e.g. a driver in /usr/bin or Program Files, which the user can
+run but not update), it is created in the user's cache directory instead, named after the driver's path.
+"""
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+
+from selex.exceptions import UpdateLockTimeoutError
+from .cache import DEFAULT_CACHE_PATH
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    import msvcrt
+    fcntl = None
+
+LOCK_POLL_INTERVAL = 0.1    # seconds between attempts to acquire a lock held by another process
+UPDATE_LOCK_TIMEOUT = 300   # seconds a driver update waits for the updates of other processes
+FALLBACK_LOCK_DIR = DEFAULT_CACHE_PATH.parent / "locks"     # lock files of drivers in directories the user cannot write to
+
+logger = logging.getLogger("selex.updater")
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:     # held by another process (BlockingIOError on POSIX, PermissionError on Windows)
+        return False
+
+
+def _unlock(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """
+    An exclusive lock on a file, held by at most one process (or thread) at a time. The file is created if needed
+    and left in place when the lock is released.
+
+    Parameters:
+        path (str): Path of the lock file.
+        timeout (float): Seconds to wait for the lock before UpdateLockTimeoutError is raised. Waits forever if None.
+        poll_interval (float): Seconds between attempts to acquire the lock while it is held elsewhere.
+        fallback_path (str): Path of the lock file used if the one at path cannot be created, e.g. because its directory
+                             is read-only. The path attribute is then set to it.
+
+    Attributes:
+        wait_seconds (float): Time the last acquire() waited for the lock.
+        contended (bool): True if the last acquire() found the lock held elsewhere.
+    """
+    def __init__(self, path: str, timeout: float = None, poll_interval: float = LOCK_POLL_INTERVAL, fallback_path: str = None):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.fallback_path = None if fallback_path is None else Path(fallback_path)
+        self.wait_seconds = 0.0
+        self.contended = False
+        self._fd = None
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def _open(self) -> int:
+        """Opens the lock file, creating it if needed, at the fallback path if it cannot be created at the path."""
+        try:
+            return os.open(self.path, os.O_RDWR | os.O_CREAT)
+        except OSError as caught_exc:
+            if self.fallback_path is None:
+                raise
+            logger.warning("Could not create the lock file %s (%s), using %s instead.", self.path, caught_exc, self.fallback_path)
+        self.path, self.fallback_path = self.fallback_path, None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return os.open(self.path, os.O_RDWR | os.O_CREAT)
+
+    def acquire(self):
+        """Waits until the lock is acquired. Raises UpdateLockTimeoutError if the timeout elapses first."""
+        if self._fd is not None:
+            raise RuntimeError(f"The lock '{self.path}' is already held.")
+        fd = self._open()
+        t_start = time.monotonic()
+        self.contended = False
+        while not _try_lock(fd):
+            self.contended = True
+            if self.timeout is not None and time.monotonic() - t_start >= self.timeout:
+                os.close(fd)
+                self.wait_seconds = time.monotonic() - t_start
+                raise UpdateLockTimeoutError(self.path, self.timeout)
+            time.sleep(self.poll_interval)
+        self.wait_seconds = time.monotonic() - t_start
+        self._fd = fd
+
+    def release(self):
+        """Releases the lock, if held."""
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+def driver_update_lock(driver_path: Path, timeout: float = None) -> FileLock:
+    """
+    Returns the lock coordinating the updates of the driver, held in a '.lock' file next to it,
+    or in FALLBACK_LOCK_DIR if the file cannot be created there.
+    """
+    driver_path = Path(driver_path)
+    digest = hashlib.sha256(str(driver_path.absolute()).encode("utf-8")).hexdigest()[:16]
+    return FileLock(driver_path.with_name(driver_path.name + ".lock"), timeout,
+                    fallback_path=FALLBACK_LOCK_DIR / f"{driver_path.name}-{digest}.lock")
@@ -0,0 +1,167 @@
+"""
+A shared store of webdriver archives, consulted by the updater before downloading and populated after it.
+
+Hosts sharing a mirror (a local directory or a network share) download every driver release only once:
+    set_mirror(ArtifactMirror("/mnt/shared/selex-drivers"))
+    update_chromedriver()   # copies the archive from the mirror if present, otherwise downloads and adds it
+
+Archives are stored as <root>/<name>/<version>/<platform>/<file name>, and indexed by a manifest.json in the root, so that
+finding an archive is a dictionary lookup. In offline mode nothing is downloaded: the latest versions are resolved from
+the archives in the mirror, and ArtifactNotMirroredError is raised for any archive it lacks, so that the updater works
+on runners without internet access.
+
+The mirror can also be configured by the environment: SELEX_DRIVER_MIRROR sets its root, and SELEX_DRIVER_MIRROR_OFFLINE
+set to a non-empty value enables offline mode.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+
+from selex.exceptions import ArtifactNotMirroredError
+from .lock import FileLock
+
+MIRROR_ENV = "SELEX_DRIVER_MIRROR"
+MIRROR_OFFLINE_ENV = "SELEX_DRIVER_MIRROR_OFFLINE"
+MANIFEST = "manifest.json"
+MANIFEST_LOCK = ".manifest.lock"
+
+logger = logging.getLogger("selex.updater")
+
+_mirror = None          # the mirror used by the updater, see get_mirror and set_mirror
+_mirror_configured = False
+
+
+def _version_key(version: str) -> list:
+    return list(map(int, version.split('.')))
+
+
+def _sha256(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(64 * 1024), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class ArtifactMirror:
+    """
+    Webdriver archives stored in a directory, keyed by the driver name, version and platform.
+
+    Parameters:
+        root (str): Directory of the mirror, created if needed.
+        offline (bool): If True, the updater resolves the latest versions from the mirror and never downloads.
+
+    Attributes:
+        stats (dict): Numbers of archives found in the mirror ("hits"), not found ("misses") and "added".
+    """
+    def __init__(self, root: str, offline: bool = False):
+        self.root = Path(root)
+        self.offline = offline
+        self.stats = {"hits": 0, "misses": 0, "added": 0}
+        self._manifest = {}
+        self._manifest_mtime = None
+
+    def _manifest_path(self) -> Path:
+        return self.root / MANIFEST
+
+    def manifest(self) -> dict:
+        """Returns the index of the archives ('name|version|platform' -> entry), reloaded only if another process changed it."""
+        try:
+            mtime = self._manifest_path().stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if mtime != self._manifest_mtime:
+            with open(self._manifest_path(), "r", encoding="utf-8") as file:
+                self._manifest = json.load(file)
+            self._manifest_mtime = mtime
+        return self._manifest
+
+    def get(self, name: str, version: str, platform: str) -> Path:
+        """
+        Returns the path of the archive in the mirror, or None if it is not there. An archive which does not match
+        the size and SHA-256 checksum in the manifest (e.g. truncated or tampered with) counts as not there.
+        """
+        entry = self.manifest().get(f"{name}|{version}|{platform}")
+        path = None if entry is None else self.root / entry["path"]
+        try:
+            valid = path is not None and path.stat().st_size == entry["size"] and _sha256(path) == entry["sha256"]
+        except OSError:
+            valid = False
+        if valid == False:
+            if path is not None and path.exists():
+                logger.warning("The mirrored archive '%s' does not match its checksum and is ignored.", path)
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return path
+
+    def require(self, name: str, version: str, platform: str) -> Path:
+        """Returns the path of the archive in the mirror. Raises ArtifactNotMirroredError if it is not there."""
+        path = self.get(name, version, platform)
+        if path is None:
+            raise ArtifactNotMirroredError(name, version, platform)
+        return path
+
+    def put(self, name: str, version: str, platform: str, archive_path: str, file_name: str = None) -> Path:
+        """
+        Copies the archive into the mirror under the file name (defaults to the archive's) and adds it to the manifest,
+        returning its path in the mirror.
+        The archive is copied under a temporary name and renamed, so that other hosts never see a partial copy.
+        """
+        archive_path = Path(archive_path)
+        relative_path = Path(name, version, platform, file_name or archive_path.name)
+        destination = self.root / relative_path
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+        shutil.copyfile(archive_path, temp_path)
+        os.replace(temp_path, destination)
+        entry = {"name": name, "version": version, "platform": platform, "path": relative_path.as_posix(),
+                 "sha256": _sha256(destination), "size": destination.stat().st_size, "time": time.time()}
+        with FileLock(self.root / MANIFEST_LOCK):   # other hosts may be adding archives at the same time
+            self._manifest_mtime = None     # reread, to keep the entries they added
+            manifest = dict(self.manifest())
+            manifest[f"{name}|{version}|{platform}"] = entry
+            temp_path = self._manifest_path().with_name(f".{MANIFEST}.{os.getpid()}.tmp")
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(manifest, file, indent=1)
+            os.replace(temp_path, self._manifest_path())
+        self.stats["added"] += 1
+        return destination
+
+    def versions(self, name: str, platform: str = None) -> list:
+        """Returns the versions of the driver in the mirror, oldest first. Only those for the platform if given."""
+        versions = {entry["version"] for entry in self.manifest().values()
+                    if entry["name"] == name and (platform is None or entry["platform"] == platform)}
+        return sorted(versions, key=_version_key)
+
+    def latest(self, name: str, platform: str = None, major_version: int = None) -> str:
+        """
+        Returns the latest version of the driver in the mirror, optionally only those for the platform and of the major
+        version. Raises ArtifactNotMirroredError if there is none.
+        """
+        versions = [version for version in self.versions(name, platform)
+                    if major_version is None or version.split('.')[0] == str(major_version)]
+        if len(versions) == 0:
+            raise ArtifactNotMirroredError(name, None if major_version is None else f"{major_version}.*", platform)
+        return versions[-1]
+
+
+def get_mirror() -> ArtifactMirror:
+    """Returns the mirror used by the updater, configured by set_mirror or the environment. None if there is none."""
+    global _mirror, _mirror_configured
+    if _mirror_configured == False:
+        root = os.environ.get(MIRROR_ENV, "")
+        _mirror = ArtifactMirror(root, offline=os.environ.get(MIRROR_OFFLINE_ENV, "") != "") if root != "" else None
+        _mirror_configured = True
+    return _mirror
+
+
+def set_mirror(mirror: ArtifactMirror):
+    """Sets the mirror used by the updater, overriding the environment. None disables the mirror."""
+    global _mirror, _mirror_configured
+    _mirror = mirror
+    _mirror_configured = True
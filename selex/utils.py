@@ -3,7 +3,20 @@ import time
 
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 
-from selex.enums import By
+from selenium.common.exceptions import (JavascriptException, NoSuchElementException, StaleElementReferenceException,
+                                        TimeoutException)
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support.wait import WebDriverWait
+
+from selex.cache import bypass_cache
+from selex.enums import By, Condition
+from selex.scripts import FETCH, FIND_ANCESTORS, FIND_PAGE, WAIT_FOR
+
+MAX_ACTIONS_DURATION = 60   # seconds of pauses sent in one actions request, keeps each request well within the HTTP timeout
+SCRIPT_TIMEOUT_MARGIN = 5   # seconds added to the script timeout on top of the time an asynchronous script waits for
+OBSERVER_RECHECK_INTERVAL = 250     # ms between in-browser rechecks of a waited for condition, in addition to DOM mutations
+FETCH_CHUNK_SIZE = 1000     # elements read per WebDriver call by fetch, keeps each response of a manageable size
+ITER_PAGE_SIZE = 500    # elements fetched per WebDriver call by iter_elements
 
 def chrome_options(user_data_path: str, profile_name: str = 'Default'):
     """Returns the webdriver Chrome options for the provided user data path and profile name."""
@@ -19,20 +32,231 @@ def random_wait(max_wait: float, min_wait: float = 0):
     time.sleep(random.uniform(min_wait, max_wait))
 
 
-def make_text_search_query(text: str, exact_match: bool):
-    """Generates the xpath search query that finds the specified text in the webpage."""
-    return f"//*[text()='{text}']" if exact_match is True else f"//*[contains(text(), '{text}')]"
+def random_delays(count: int, max_delay: float, min_delay: float = 0):
+    """Returns a list of random delays between min_delay and max_delay."""
+    return [random.uniform(min_delay, max_delay) for _ in range(count)]
+
+
+def slow_type_actions(driver, text: str, delays: list, leading_delay: float = None):
+    """
+    Yields ActionChains which type in the text, pausing for the given delay after each character.
+    The pauses are performed by the browser, so typing takes one request per MAX_ACTIONS_DURATION seconds
+    rather than one request per character. An optional leading_delay is paused for before the first character.
+    """
+    action = ActionChains(driver)
+    duration = 0
+    pending = False     # True if the current action holds anything to be performed
+    if leading_delay is not None:
+        action.w3c_actions.key_action.pause(leading_delay)
+        duration, pending = leading_delay, True
+    for char, delay in zip(text, delays):
+        if pending and duration + delay > MAX_ACTIONS_DURATION:
+            yield action
+            action = ActionChains(driver)
+            duration = 0
+        action.send_keys(char)
+        action.w3c_actions.key_action.pause(delay)  # ActionChains.pause() would truncate the pause to whole seconds
+        duration, pending = duration + delay, True
+    if pending:
+        yield action
+
+
+def xpath_literal(text: str):
+    """Returns the text as an XPath string literal. Texts containing both quote types are built using concat()."""
+    if "'" not in text:
+        return f"'{text}'"
+    elif '"' not in text:
+        return f'"{text}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in text.split("'")) + ")"
+
+def make_text_search_query(text: str, exact_match: bool, relative: bool = False, normalize_space: bool = False):
+    """
+    Generates the xpath search query that finds the specified text in the webpage.
+    
+    Parameters:
+        text (str): Text to search for. May contain any quotes.
+        exact_match (bool): If True, an element's text must equal the text. If False, it must contain the text.
+        relative (bool): If True, only the descendants of the context node are searched (for searching within an element).
+        normalize_space (bool): If True, leading and trailing whitespace is ignored and any other whitespace sequence 
+                                is treated as a single space, both in the element's text and in the searched for text.
+    """
+    prefix = ".//*" if relative == True else "//*"
+    if normalize_space == True:
+        text, node_text = " ".join(text.split()), "normalize-space(.)"
+    else:
+        node_text = "."
+    if exact_match == True:
+        return f"{prefix}[text()[{node_text}={xpath_literal(text)}]]"
+    else:
+        return f"{prefix}[text()[contains({node_text}, {xpath_literal(text)})]]"
 
-def find_element_by_text(driver, text: str, exact_match: bool):
+def find_element_by_text(driver, text: str, exact_match: bool, normalize_space: bool = False, relative: bool = False):
     """
     Finds element(s) by their text. 
     A base function for Driver and Element class methods, not to be invoked directly.
     """
-    return driver.find_element(By.XPATH, make_text_search_query(text, exact_match))
+    return driver.find_element(By.XPATH, make_text_search_query(text, exact_match, relative, normalize_space))
 
-def find_elements_by_text(driver, text: str, exact_match: bool):
+def find_elements_by_text(driver, text: str, exact_match: bool, normalize_space: bool = False, relative: bool = False):
     """
     Finds element(s) by their text. 
     A base function for Driver and Element class methods, not to be invoked directly.
     """
-    return driver.find_elements(By.XPATH, make_text_search_query(text, exact_match))
\ No newline at end of file
+    return driver.find_elements(By.XPATH, make_text_search_query(text, exact_match, relative, normalize_space))
+
+
+def validate_ancestor_level(level: int):
+    """Raises an exception if the ancestor level is not a non-negative integer."""
+    err_msg_neg_non_int = "Parameter 'level' must be a non-negative integer."
+    if type(level) != int:
+        raise TypeError(err_msg_neg_non_int)
+    if level < 0:
+        raise ValueError(err_msg_neg_non_int)
+
+def find_ancestors(driver, elements: list, level: int, recursive: bool):
+    """
+    Finds the n-th ancestor of every element in a single WebDriver call.
+    A base function for Driver and Element class methods, not to be invoked directly.
+    """
+    validate_ancestor_level(level)
+    if level == 0 or len(elements) == 0:
+        return list(elements)
+    ancestors = driver.execute_script(FIND_ANCESTORS, list(elements), level, recursive)
+    if None in ancestors:   # only possible if not recursive
+        raise NoSuchElementException("No such element exists because the document boundaries have been exceeded.")
+    return ancestors
+
+
+def fetch(driver, elements: list, properties: list, chunk_size: int, numpy: bool):
+    """
+    Reads the properties of all the elements, using a WebDriver call per chunk of elements, and returns them by column.
+    A base function for Driver class methods, not to be invoked directly.
+    """
+    if type(chunk_size) != int or chunk_size < 1:
+        raise ValueError("Parameter 'chunk_size' must be a positive integer.")
+    elements = list(elements)
+    properties = list(dict.fromkeys(properties))    # without duplicates, in order
+    columns = {name: [] for name in properties}
+    if len(properties) > 0:
+        for start in range(0, len(elements), chunk_size):
+            chunk = driver.execute_script(FETCH, elements[start:start + chunk_size], properties)
+            for name, values in zip(properties, chunk):
+                columns[name].extend(values)
+    if "rect" in columns:
+        if numpy == True:
+            try:
+                import numpy as np
+            except ImportError as caught_exc:
+                raise ImportError("NumPy is required to fetch rects as arrays (numpy=True).") from caught_exc
+            columns["rect"] = np.array(columns["rect"], dtype=float).reshape(-1, 4)
+        else:
+            columns["rect"] = [dict(zip(("x", "y", "width", "height"), rect)) for rect in columns["rect"]]
+    return columns
+
+
+def css_string(value: str):
+    """Returns the value as a quoted CSS string."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def js_locator(by: By, value: str):
+    """
+    Translates the locator into a (kind, query) pair, where kind is 'css' or 'xpath', which can be evaluated in the browser.
+    Raises ValueError if the locator strategy cannot be translated.
+    """
+    if by == By.TEXT:
+        return "xpath", make_text_search_query(value, True)
+    elif by == By.PARTIAL_TEXT:
+        return "xpath", make_text_search_query(value, False)
+    elif by == By.XPATH:
+        return "xpath", value
+    elif by == By.CSS_SELECTOR:
+        return "css", value
+    elif by == By.ID:
+        return "css", f"[id={css_string(value)}]"
+    elif by == By.NAME:
+        return "css", f"[name={css_string(value)}]"
+    elif by == By.CLASS_NAME:
+        return "css", f".{value}"
+    elif by == By.TAG_NAME:
+        return "css", value
+    raise ValueError(f"Locator strategy '{by}' cannot be evaluated in the browser.")
+
+
+def iter_elements(driver, scope, by: By, value: str, page_size: int, normalize_space: bool):
+    """
+    Returns a generator of the elements matching the locator within the scope (an element, or None for the whole page),
+    which fetches them a page at a time. Falls back to a single find_elements call if the locator cannot be evaluated
+    in the browser.
+    A base function for Driver and Element class methods, not to be invoked directly.
+    """
+    if type(page_size) != int or page_size < 1:
+        raise ValueError("Parameter 'page_size' must be a positive integer.")
+    if by == By.TEXT or by == By.PARTIAL_TEXT:
+        kind, query = "xpath", make_text_search_query(value, by == By.TEXT, scope is not None, normalize_space)
+    else:
+        try:
+            kind, query = js_locator(by, value)
+        except ValueError:
+            return iter_find_elements(scope or driver, by, value)
+    return iter_pages(driver, scope, kind, query, page_size)
+
+def iter_find_elements(scope, by: By, value: str):
+    """Yields the elements found by a single find_elements call, on the first request for an element."""
+    yield from scope.find_elements(by, value)
+
+def iter_pages(driver, scope, kind: str, query: str, page_size: int):
+    """Yields the matches of a query evaluated in the browser, fetching a page at a time until all are read."""
+    start, total = 0, 1
+    while start < total:
+        page, total = driver.execute_script(FIND_PAGE, scope, kind, query, start, page_size)
+        yield from page
+        start += page_size
+
+def wait_for(driver, locator: tuple, condition: Condition, timeout: float, poll: bool):
+    """
+    Waits until the condition holds for the element(s) matching the locator.
+    A MutationObserver installed in the browser resolves the wait as soon as the condition holds, using a single request.
+    Falls back to polling if the locator cannot be evaluated in the browser or the script fails (e.g. the page is unloaded).
+    A base function for Driver class methods, not to be invoked directly.
+    """
+    by, value = locator
+    condition = Condition(condition)
+    message = f"Condition '{condition.value}' not met for ({by}, {value}) within {timeout} seconds."
+    if poll == False:
+        try:
+            kind, query = js_locator(by, value)
+        except ValueError:
+            poll = True
+    if poll == False:
+        t_start = time.monotonic()
+        try:
+            with driver._script_timeout_scope(timeout + SCRIPT_TIMEOUT_MARGIN):
+                result = driver.execute_async_script(WAIT_FOR, kind, query, condition.value, int(timeout * 1000), OBSERVER_RECHECK_INTERVAL)
+        except JavascriptException:
+            timeout = max(0, timeout - (time.monotonic() - t_start))    # continue by polling for the remaining time
+        else:
+            if result is None:
+                raise TimeoutException(message)
+            return result
+    return poll_for(driver, by, value, condition, timeout, message)
+
+def poll_for(driver, by: By, value: str, condition: Condition, timeout: float, message: str = "", poll_frequency: float = 0.5):
+    """
+    Waits until the condition holds for the element(s) matching the locator by repeatedly searching for them.
+    A base function for Driver class methods, not to be invoked directly.
+    """
+    def condition_met(driver):
+        elems = driver.find_elements(by, value)
+        try:
+            if condition is Condition.PRESENT:
+                return elems[0] if len(elems) > 0 else False
+            elif condition is Condition.VISIBLE:
+                return elems[0] if len(elems) > 0 and elems[0].is_displayed() else False
+            elif condition is Condition.ABSENT:
+                return len(elems) == 0
+            else:   # Condition.INVISIBLE
+                return len(elems) == 0 or not elems[0].is_displayed()
+        except StaleElementReferenceException:  # element removed after being found
+            return condition is Condition.INVISIBLE
+    with driver.implicit_wait_scope(0), bypass_cache(driver):    # every poll searches the page anew
+        return WebDriverWait(driver, timeout, poll_frequency).until(condition_met, message)
\ No newline at end of file
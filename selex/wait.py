@@ -1,3 +1,6 @@
+from functools import wraps
+
+
 def wait(time: float): 
     """
     Intended for use as a decorator within the Driver class. 
@@ -9,13 +12,10 @@ def wait(time: float):
         method is executed with an implicit webdriver wait of 5 seconds.
     """
     def decorator(method):
+        @wraps(method)
         def wrapper(self, *args, **kwargs):
-            old_wait = self.implicit_wait
-            self.implicit_wait = time
-            try:
+            with self.implicit_wait_scope(time):
                 return method(self, *args, **kwargs)
-            finally:
-                self.implicit_wait = old_wait
         return wrapper
     return decorator
 
@@ -47,13 +47,10 @@ def wait_factory(driver_attr_name: str):
             method is executed with an implicit webdriver wait of 5 seconds.
         """
         def decorator(method):
+            @wraps(method)
             def wrapper(self, *args, **kwargs):
-                old_wait = getattr(self, driver_attr_name).implicit_wait
-                getattr(self, driver_attr_name).implicit_wait = time
-                try:
+                with getattr(self, driver_attr_name).implicit_wait_scope(time):
                     return method(self, *args, **kwargs)
-                finally:
-                    getattr(self, driver_attr_name).implicit_wait = old_wait
             return wrapper
         return decorator
     return wait
\ No newline at end of file
@@ -1,12 +1,56 @@
 import os
-from typing import List
+from typing import Iterator, List
 
 from selenium.common.exceptions import NoSuchElementException, InvalidSelectorException
 from selenium.webdriver.remote.webelement import WebElement as BaseWebElement
 
 from .enums import By
 from .keypress import ElemKeyPress
-from .utils import find_element_by_text, find_elements_by_text, random_wait
+from .locator import find_element_by_chain, find_elements_by_chain
+from .metrics import operation
+from .utils import ITER_PAGE_SIZE, find_ancestors, find_element_by_text, find_elements_by_text, iter_elements, random_delays, slow_type_actions, validate_ancestor_level
+
+
+class ElementRef:
+    """
+    A lightweight reference to a web element, holding only the driver and the element id.
+    Returned by find_elements(..., lean=True) and should not be instantiated directly.
+    
+    Compares equal to, and hashes like, web elements with the same id. Any WebElement attribute or method (text,
+    click, find_ancestor, press etc.) is available as well: it is looked up on a full WebElement created for the call,
+    so bulk results only pay for the interaction features which are used.
+    """
+    __slots__ = ("_parent", "_id")
+    
+    def __init__(self, parent, id_: str):
+        self._parent = parent
+        self._id = id_
+    
+    @property
+    def id(self) -> str:
+        """Internal ID used by Selenium, the same as the full web element's."""
+        return self._id
+    
+    @property
+    def parent(self):
+        """The driver the element was found by."""
+        return self._parent
+    
+    def upgrade(self) -> "WebElement":
+        """Returns the full selex WebElement this is a reference to."""
+        return self._parent._web_element_cls(self._parent, self._id)
+    
+    def __getattr__(self, name: str):
+        if name in ElementRef.__slots__ or name.startswith("__"):  # unset slots (e.g. while unpickling) and protocol lookups
+            raise AttributeError(name)
+        return getattr(self.upgrade(), name)
+    
+    __eq__ = BaseWebElement.__eq__
+    __ne__ = BaseWebElement.__ne__
+    __hash__ = BaseWebElement.__hash__
+    
+    def __repr__(self):
+        return f'<{type(self).__module__}.{type(self).__name__} (element="{self._id}")>'
 
 
 class WebElement(BaseWebElement):
@@ -21,61 +65,95 @@ class WebElement(BaseWebElement):
     Methods:
         find_element_by_text: Returns the first sub-element with the fully or partially matching textual value. 
         find_elements_by_text: Returns a list of sub-elements with the fully or partially matching textual values.
+        iter_elements: Lazily yields the matching sub-elements, fetched in pages.
         slow_type: Types the text into the element with a variable time delay between characters.
     """
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.press = ElemKeyPress(self)
+    @property
+    def press(self) -> ElemKeyPress:
+        """
+        Interface for simulating key presses into this element, e.g. element.press.ENTER().
+        Created on access rather than stored, so elements which never press keys do not pay for it.
+        """
+        return ElemKeyPress(self)
     
+    @operation("find_ancestor")
     def find_ancestor(self, level: int = 1, recursive: bool = True):
         """
         Returns the n-th ancestor of the current web element.
         
         Parameters:
             level (int): Generation of the ancestor element to be returned (1: parent, 2: grandparent etc.)
-            recursive (bool): If True, the ancestor element is searched for recursively. 
+            recursive (bool): If True, the ancestor element is searched for by walking up the tree in the browser (single call). 
                               If level exceeds the number of ancestors, the last ancestor is returned.
-                              if False, the search is faster but a NoSuchElement exception is raised on a nonexistant ancestor.
+                              if False, a single XPath query is used and a NoSuchElement exception is raised on a nonexistant ancestor.
         """
-        err_msg_neg_non_int = "Parameter 'level' must be a non-negative integer."
-        if type(level) != int:
-            raise TypeError(err_msg_neg_non_int)
-        if level < 0:
-            raise ValueError(err_msg_neg_non_int)
+        validate_ancestor_level(level)
         if level == 0:
             return self
-        if level > 0:
-            if recursive == True:
-                try:
-                    parent = self.find_element(By.XPATH, "..")
-                    return parent.find_ancestor(level - 1, recursive=True)
-                except InvalidSelectorException:
-                    return self
-            else: # if recursive == False
-                try:
-                    return self.find_element(By.XPATH, ".." + (level-1) * "/..")
-                except (InvalidSelectorException, NoSuchElementException):
-                    raise NoSuchElementException("No such element exists because the document boundaries have been exceeded.")
+        if recursive == True:
+            return find_ancestors(self._parent, [self], level, True)[0]
+        else: # if recursive == False
+            try:
+                return self.find_element(By.XPATH, ".." + (level-1) * "/..")
+            except (InvalidSelectorException, NoSuchElementException):
+                raise NoSuchElementException("No such element exists because the document boundaries have been exceeded.")
     
     
-    def find_element(self, by: By.ID, value: str = None) -> "WebElement":
-        """Finds and returns an element by its text value."""
+    def find_element(self, by: By.ID, value: str = None, normalize_space: bool = False) -> "WebElement":
+        """
+        Finds and returns a sub-element, also by its text value or a chain of locators (By.CHAIN, see selex.locator).
+        Whitespace in text is normalized for text searches if normalize_space is True.
+        """
+        cache = getattr(self._parent, "element_cache", None)
+        if cache is not None:
+            return cache.lookup(self._parent, ("element", by, value, normalize_space, False, self._id),
+                                lambda: self._find_element(by, value, normalize_space))
+        return self._find_element(by, value, normalize_space)
+
+    def _find_element(self, by: By, value: str, normalize_space: bool) -> "WebElement":
         if by is By.TEXT:
-            return find_element_by_text(self._parent, value, True)
+            return find_element_by_text(self, value, True, normalize_space, relative=True)
         elif by is By.PARTIAL_TEXT:
-            return find_element_by_text(self._parent, value, False)
+            return find_element_by_text(self, value, False, normalize_space, relative=True)
+        elif by is By.CHAIN:
+            return find_element_by_chain(self._parent, self, value)
         else:
             return super().find_element(by, value)
         
-    def find_elements(self, by: By.ID, value: str = None) -> List["WebElement"]:
-        """Finds and returns elements by their text value."""
+    def find_elements(self, by: By.ID, value: str = None, normalize_space: bool = False, lean: bool = False) -> List["WebElement"]:
+        """
+        Finds and returns sub-elements, also by their text value or a chain of locators (By.CHAIN, see selex.locator).
+        Whitespace in text is normalized for text searches if normalize_space is True.
+        If lean is True, lightweight ElementRefs are returned (see Driver.find_elements).
+        """
+        cache = getattr(self._parent, "element_cache", None)
+        if cache is not None:
+            return cache.lookup(self._parent, ("elements", by, value, normalize_space, lean, self._id),
+                                lambda: self._find_elements(by, value, normalize_space, lean))
+        return self._find_elements(by, value, normalize_space, lean)
+
+    def _find_elements(self, by: By, value: str, normalize_space: bool, lean: bool) -> List["WebElement"]:
+        if lean == True:
+            with self._parent._lean_scope():
+                return self._find_elements(by, value, normalize_space, False)
         if by is By.TEXT:
-            return find_elements_by_text(self._parent, value, True)
+            return find_elements_by_text(self, value, True, normalize_space, relative=True)
         elif by is By.PARTIAL_TEXT:
-            return find_elements_by_text(self._parent, value, False)
+            return find_elements_by_text(self, value, False, normalize_space, relative=True)
+        elif by is By.CHAIN:
+            return find_elements_by_chain(self._parent, self, value)
         else:
             return super().find_elements(by, value)
 
+    def iter_elements(self, by: By = By.ID, value: str = None, page_size: int = ITER_PAGE_SIZE,
+                      normalize_space: bool = False) -> Iterator["WebElement"]:
+        """
+        Lazily yields the matching sub-elements, fetching them in pages of page_size elements per WebDriver call.
+        See Driver.iter_elements.
+        """
+        return iter_elements(self._parent, self, by, value, page_size, normalize_space)
+
+    @operation("save_as_png")
     def save_as_png(self, output_file: str):
         """Saves the web element as a PNG image. 'output_file' does not need to include the .png extension."""     
         if os.path.splitext(output_file)[1] == '':   # append .png extension if none exists
@@ -83,10 +161,18 @@ class WebElement(BaseWebElement):
         with open(output_file,"wb") as f:  # save the element screenshot as .png
             f.write(self.screenshot_as_png)
 
+    @operation("slow_type")
     def slow_type(self, text: str, max_delay: float = 0.5, auto_clear: bool = True, min_delay: float = 0.1):
-        """Types the text into this element with a variable delay between characters."""
+        """
+        Types the text into this element with a variable delay between characters.
+        The first character is sent to the element, which focuses it. The rest of the text is typed
+        into the focused element in a single request, with the delays paused for by the browser.
+        """
         if auto_clear == True:
             self.clear()
-        for char in text:
-            self.send_keys(char)
-            random_wait(max_delay, min_delay)
\ No newline at end of file
+        if len(text) == 0:
+            return
+        delays = random_delays(len(text), max_delay, min_delay)
+        self.send_keys(text[0])
+        for action in slow_type_actions(self._parent, text[1:], delays[1:], leading_delay=delays[0]):
+            action.perform()
\ No newline at end of file
@@ -5,8 +5,10 @@ import unittest
 from collections import namedtuple
 from pathlib import Path
 from time import sleep
+from unittest.mock import patch
 
 from selex import get_driver, Browser, By
+from selex.updater.cache import version_cache
 
 TestObjects = namedtuple("SelexObjects", "driver elem")
 test_website = os.path.join("resources", "test_website.html")
@@ -50,6 +52,16 @@ class BaseTestCase(unittest.TestCase):
         elif inclusive == True:
             self.assertGreaterEqual(value, lower_limit)
             self.assertLessEqual(value, upper_limit)
+
+
+class UpdaterTestCase(unittest.TestCase):
+    """Base test class for the updater, bypassing the version cache and the artifact mirror the environment may configure."""
+    
+    def setUp(self):
+        for patcher in (patch.object(version_cache, "bypass", True),
+                        patch.multiple("selex.updater.mirror", _mirror=None, _mirror_configured=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
             
 
 if __name__ == "__main__":
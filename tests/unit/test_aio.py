@@ -0,0 +1,73 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+from selenium.webdriver.common.keys import Keys
+
+from selex import aio, Browser, By
+from selex.aio import AsyncDriver, AsyncWebElement
+from selex.keypress import DriverKeyPress, ElemKeyPress
+
+
+class AsyncDriverTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests the 'AsyncDriver' and 'AsyncWebElement' facades.
+    """
+    
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.driver = Mock()
+        self.async_driver = AsyncDriver(self.driver, self.executor)
+    
+    def tearDown(self):
+        self.executor.shutdown()
+    
+    @patch("selex.driver.get_driver")
+    async def test_get_driver(self, mock_get_driver):
+        async_driver = await aio.get_driver(Browser.CHROME, self.executor, kw1=3)
+        mock_get_driver.assert_called_once_with(Browser.CHROME, kw1=3)
+        self.assertIs(async_driver.driver, mock_get_driver.return_value)
+    
+    async def test_find_element(self):
+        elem = await self.async_driver.find_element(By.TEXT, "Heading")
+        self.driver.find_element.assert_called_once_with(By.TEXT, "Heading")
+        self.assertIsInstance(elem, AsyncWebElement)
+        self.assertIs(elem.element, self.driver.find_element.return_value)
+    
+    async def test_find_elements(self):
+        self.driver.find_elements.return_value = [Mock(), Mock()]
+        elems = await self.async_driver.find_elements(By.CSS_SELECTOR, "p")
+        self.assertEqual([elem.element for elem in elems], self.driver.find_elements.return_value)
+    
+    async def test_slow_type(self):
+        await self.async_driver.slow_type("abc", max_delay=0.2, min_delay=0.1)
+        self.driver.slow_type.assert_called_once_with("abc", 0.2, 0.1)     # batched in a single request
+        self.driver.type_in.assert_not_called()
+    
+    @patch("selex.keypress.ActionChains")
+    async def test_driver_press(self, mock_action_chains):
+        self.driver.press = DriverKeyPress(self.driver)
+        await self.async_driver.press.ENTER()
+        mock_action_chains.return_value.send_keys.assert_called_once_with(Keys.ENTER)
+    
+    async def test_element_methods(self):
+        element = Mock()
+        element.press = ElemKeyPress(element)
+        async_elem = AsyncWebElement(element, self.executor)
+        await async_elem.press.TAB()
+        element.send_keys.assert_called_once_with(Keys.TAB)
+        ancestor = await async_elem.find_ancestor(2, recursive=False)
+        element.find_ancestor.assert_called_once_with(2, False)
+        self.assertIs(ancestor.element, element.find_ancestor.return_value)
+        await async_elem.save_as_png("image.png")
+        element.save_as_png.assert_called_once_with("image.png")
+    
+    async def test_element_slow_type(self):
+        element = Mock()
+        await AsyncWebElement(element, self.executor).slow_type("ab", max_delay=0, min_delay=0)
+        element.slow_type.assert_called_once_with("ab", 0, True, 0)
+        element.send_keys.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -0,0 +1,115 @@
+import math
+import unittest
+
+from selex.dom import (element_path, evaluate_xpath, is_displayed, parse_html, rendered_text, select_css,
+                       select_xpath)
+from selex.exceptions import XPathError
+from selex.utils import make_text_search_query
+
+HTML = """<!DOCTYPE html>
+<html><head><title>Title</title></head>
+<body>
+    <div id="main" class="box wide"><p>Hello  world</p><p>It's "quoted"</p><span>Hello</span></div>
+    <form><input name="user" value="Tanner"><label>Hello</label><label hidden>Hidden</label></form>
+</body></html>"""
+
+
+def names(elements):
+    return [elem.name for elem in elements]
+
+
+class XPathTest(unittest.TestCase):
+    """
+    Tests the XPath evaluator of the 'dom' module.
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.doc = parse_html(HTML)
+        cls.main = select_css(cls.doc, "#main")[0]
+    
+    def test_text_search_queries(self):
+        cases = [(("Hello", True), ["span", "label"]),
+                 (("Hello", False), ["p", "span", "label"]),
+                 (("It's \"quoted\"", True), ["p"]),
+                 ((" Hello world ", True, False, True), ["p"])]
+        for args, expected in cases:
+            with self.subTest(args):
+                self.assertEqual(names(select_xpath(self.doc, make_text_search_query(*args))), expected)
+    
+    def test_relative_queries(self):
+        self.assertEqual(names(select_xpath(self.main, make_text_search_query("Hello", True, relative=True))), ["span"])
+        self.assertEqual(names(select_xpath(self.main, "//label")), ["label", "label"])   # absolute despite the context
+        self.assertEqual(names(select_xpath(self.main, "..")), ["body"])
+        self.assertEqual(names(select_xpath(self.main, "../..")), ["html"])
+    
+    def test_predicates(self):
+        cases = [("//p[2]", ["p"]),
+                 ("(//p | //span)[last()]", ["span"]),
+                 ("//div/*[position() > 1]", ["p", "span"]),
+                 ("//*[@class='box wide']", ["div"]),
+                 ("//*[contains(@class, 'wide') and @id]", ["div"]),
+                 ("//input[@name='user']/following-sibling::label[1]", ["label"]),
+                 ("//label/ancestor::*", ["html", "body", "form"]),
+                 ("//p[last() - 1]", ["p"]),
+                 ("//div/*[position() mod 2 = 1]", ["p", "span"]),
+                 ("//span/preceding::*", ["head", "title", "p", "p"]),
+                 ("//span/preceding::p[1]", ["p"]),
+                 ("//div/p[2]/following::*", ["span", "form", "input", "label", "label"]),
+                 ("//div/@id/following::*[1]", ["p"]),
+                 ("//DIV/P", ["p", "p"]),
+                 ("/html/body/div/p[not(starts-with(., 'Hello'))]", ["p"])]
+        for query, expected in cases:
+            with self.subTest(query):
+                self.assertEqual(names(select_xpath(self.doc, query)), expected)
+    
+    def test_values(self):
+        self.assertEqual(evaluate_xpath(self.doc, "count(//p)"), 2)
+        self.assertEqual(evaluate_xpath(self.doc, "string(//title)"), "Title")
+        self.assertEqual(evaluate_xpath(self.doc, "normalize-space(//div/p[1])"), "Hello world")
+        self.assertEqual(evaluate_xpath(self.doc, "concat(name(//form/*[1]), '-', //input/@value)"), "input-Tanner")
+        self.assertEqual(evaluate_xpath(self.doc, "translate(substring('selenium', 1, 3), 'se', 'SE')"), "SEl")
+        self.assertIs(evaluate_xpath(self.doc, "//p = 'Hello  world'"), True)
+    
+    def test_arithmetic(self):
+        cases = [("1 + 2 * 3", 7), ("(1 + 2) * 3", 9), ("7 div 2", 3.5), ("7 mod -3", 1), ("-7 mod 3", -1),
+                 ("-count(//p) - -1", -1), ("1 div 0", math.inf), ("-1 div 0", -math.inf), ("sum(//p) + 1", math.nan),
+                 ("floor(-1.5) + ceiling(1.2) + round(2.5)", 3)]
+        for query, expected in cases:
+            with self.subTest(query):
+                if math.isnan(expected):
+                    self.assertTrue(math.isnan(evaluate_xpath(self.doc, query)))
+                else:
+                    self.assertEqual(evaluate_xpath(self.doc, query), expected)
+        self.assertEqual(names(select_xpath(self.doc, "//div/*[count(//form) + 1]")), ["p"])     # selects by position
+    
+    def test_invalid_queries(self):
+        for query in ["//p[", "//p/namespace::a", "unknown(1)", "//p + 1", "count(//p)", "//p/text()"]:
+            with self.subTest(query):
+                with self.assertRaises(XPathError):
+                    select_xpath(self.doc, query)
+
+
+class RenderingTest(unittest.TestCase):
+    """
+    Tests the visibility and text approximations of the 'dom' module.
+    """
+    
+    def test_is_displayed(self):
+        doc = parse_html(HTML)
+        self.assertTrue(is_displayed(doc.span))
+        self.assertFalse(is_displayed(doc.title))
+        self.assertFalse(is_displayed(select_css(doc, "label[hidden]")[0]))
+        self.assertFalse(is_displayed(parse_html("<div style='display: none'><p>x</p></div>").p))
+    
+    def test_rendered_text(self):
+        doc = parse_html(HTML)
+        self.assertEqual(rendered_text(doc.body), 'Hello world\nIt\'s "quoted"\nHello\nHello')
+    
+    def test_element_path(self):
+        doc = parse_html(HTML)
+        self.assertEqual(element_path(doc.label), [0, 1, 1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -3,7 +3,7 @@ from unittest.mock import patch, ANY, call
 
 from selenium.common.exceptions import SessionNotCreatedException
 
-from selex import get_driver, chrome_options, Browser
+from selex import get_driver, chrome_options, Browser, ChromeDriver, FirefoxDriver, IeDriver, EdgeDriver
 
 USER_DATA_PATH = "dummy/user/data/path"
 USER_PROFILE = "Profile 99"
@@ -57,6 +57,22 @@ class DriverInitTest(unittest.TestCase):
             get_driver(Browser.EDGE, **KWARGS)
         mock_browser.assert_called_once_with(ANY, **KWARGS)
 
+    @patch("selenium.webdriver.Edge.__init__")
+    @patch("selenium.webdriver.Ie.__init__")
+    @patch("selenium.webdriver.Firefox.__init__")
+    @patch("selenium.webdriver.Chrome.__init__")
+    def test_driver_class_cached(self, *mocks):
+        for browser, driver_cls in zip(SUPPORTED_BROWSERS, [ChromeDriver, FirefoxDriver, IeDriver, EdgeDriver]):
+            with self.subTest(browser):
+                driver1, driver2 = get_driver(browser), get_driver(browser)
+                self.assertIs(type(driver1), type(driver2))
+                self.assertIsInstance(driver1, driver_cls)
+    
+    @patch("selenium.webdriver.Chrome.__init__")
+    def test_driver_class_default_browser(self, mock_browser):
+        ChromeDriver(**KWARGS)
+        mock_browser.assert_called_once_with(ANY, **KWARGS)
+
 
 class ChromeOptionsTest(unittest.TestCase):
     """
@@ -0,0 +1,114 @@
+import time
+import unittest
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from selex import By, Condition
+from selex.cache import ElementCache
+from selex.testing import FakeRemote
+
+HTML = "<html><body><form id='login'><button>Submit</button><p>One</p><p>Two</p></form></body></html>"
+
+
+class ElementCacheTest(unittest.TestCase):
+    """
+    Tests the element cache enabled by 'Driver.enable_element_cache', using the fake remote end.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.remote = FakeRemote(HTML, pages={"https://example.com/": HTML})
+        cls.driver = cls.remote.get_driver()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.driver.quit()
+        cls.remote.close()
+
+    def setUp(self):
+        self.remote.load(HTML)
+        self.cache = self.driver.enable_element_cache()
+        self.remote.reset_stats()
+
+    def tearDown(self):
+        self.driver.element_cache = None
+
+    def test_hits(self):
+        button = self.driver.find_element(By.TEXT, "Submit")
+        self.assertEqual(self.remote.stats["findElement"], 1)
+        self.assertIs(self.driver.find_element(By.TEXT, "Submit"), button)
+        self.assertEqual(self.remote.stats["findElement"], 1)
+        self.assertEqual(self.remote.stats["w3cExecuteScript"], 1)    # the DOM generation is trusted for a second
+        self.assertEqual(sum(self.remote.stats.values()), 2)
+        self.assertEqual(self.cache.stats, {"hits": 1, "misses": 1, "invalidations": 0})
+        self.assertIsInstance(self.cache, ElementCache)
+        self.assertIs(self.driver.enable_element_cache(), self.cache)
+
+    def test_keys(self):
+        form = self.driver.find_element(By.ID, "login")
+        paragraphs = self.driver.find_elements(By.TAG_NAME, "p")
+        self.assertEqual(form.find_elements(By.TAG_NAME, "p"), paragraphs)
+        self.assertEqual(self.driver.find_elements(By.TAG_NAME, "p", lean=True), paragraphs)
+        self.assertEqual(self.driver.find_element(By.TAG_NAME, "p"), paragraphs[0])
+        self.assertEqual(self.cache.stats["misses"], 5)
+        paragraphs.clear()  # results are copies
+        self.assertEqual(len(form.find_elements(By.TAG_NAME, "p")), 2)
+        self.assertEqual(self.cache.stats["hits"], 1)
+
+    def test_not_found(self):
+        for _ in range(2):
+            with self.assertRaises(NoSuchElementException):
+                self.driver.find_element(By.ID, "missing")
+        self.assertEqual(self.cache.stats["misses"], 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_navigation(self):
+        button = self.driver.find_element(By.TEXT, "Submit")
+        self.driver.get("https://example.com/")
+        self.assertEqual(len(self.cache), 0)
+        self.assertNotEqual(self.driver.find_element(By.TEXT, "Submit"), button)
+        self.driver.switch_to.window(self.driver.current_window_handle)
+        self.driver.find_element(By.TEXT, "Submit")
+        self.assertEqual(self.cache.stats, {"hits": 0, "misses": 3, "invalidations": 2})
+
+    def test_mutations(self):
+        self.driver.element_cache = None
+        self.cache = self.driver.enable_element_cache(check_interval=0)
+        self.driver.find_elements(By.TAG_NAME, "p")
+        self.remote.mutate(lambda document: document.find("p").decompose())
+        self.assertEqual(len(self.driver.find_elements(By.TAG_NAME, "p")), 1)
+        self.assertEqual(self.cache.stats, {"hits": 0, "misses": 2, "invalidations": 1})
+
+    def test_check_interval(self):
+        self.driver.element_cache = None
+        cache = self.driver.enable_element_cache(check_interval=0.1)
+        self.driver.find_elements(By.TAG_NAME, "p")
+        self.remote.mutate(lambda document: document.find("p").decompose())
+        self.assertEqual(len(self.driver.find_elements(By.TAG_NAME, "p")), 2)    # within the interval
+        time.sleep(0.15)
+        self.assertEqual(len(self.driver.find_elements(By.TAG_NAME, "p")), 1)
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 2, "invalidations": 1})
+        self.assertEqual(self.remote.stats["w3cExecuteScript"], 2)
+
+    def test_without_mutation_checks(self):
+        self.driver.element_cache = None
+        cache = self.driver.enable_element_cache(check_mutations=False)
+        self.driver.find_elements(By.TAG_NAME, "p")
+        self.remote.mutate(lambda document: document.find("p").decompose())
+        self.assertEqual(len(self.driver.find_elements(By.TAG_NAME, "p")), 2)    # trusted until cleared
+        self.assertEqual(sum(self.remote.stats.values()), 1)
+        cache.clear()
+        self.assertEqual(len(self.driver.find_elements(By.TAG_NAME, "p")), 1)
+
+    def test_polling_bypasses_cache(self):
+        self.driver.element_cache = None
+        self.driver.enable_element_cache(check_mutations=False)
+        self.driver.find_elements(By.TAG_NAME, "p")
+        self.remote.mutate(lambda document: [p.decompose() for p in document.find_all("p")])
+        self.assertTrue(self.driver.wait_for((By.TAG_NAME, "p"), Condition.ABSENT, timeout=1, poll=True))
+        with self.assertRaises(TimeoutException):
+            self.driver.wait_for((By.TAG_NAME, "p"), Condition.PRESENT, timeout=0.2, poll=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
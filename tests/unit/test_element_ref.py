@@ -0,0 +1,63 @@
+import unittest
+
+from selex import By
+from selex.testing import FakeRemote
+from selex.webelement import ElementRef, WebElement
+
+HTML = "<html><body><form><label>Name</label><input name='user'><p>One</p><p>Two</p></form></body></html>"
+
+
+class ElementRefTest(unittest.TestCase):
+    """
+    Tests the 'ElementRef' class returned by find_elements in lean mode, using the fake remote end.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.remote = FakeRemote(HTML)
+        cls.driver = cls.remote.get_driver()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.driver.quit()
+        cls.remote.close()
+
+    def setUp(self):
+        self.remote.load(HTML)
+
+    def test_lean_results(self):
+        refs = self.driver.find_elements(By.TAG_NAME, "p", lean=True)
+        self.assertEqual([type(ref) for ref in refs], [ElementRef, ElementRef])
+        self.assertFalse(hasattr(refs[0], "__dict__"))
+        self.assertEqual(refs, self.driver.find_elements(By.TAG_NAME, "p"))
+        self.assertEqual(self.driver.find_elements(By.TAG_NAME, "p"), refs)
+        self.assertEqual(len({*refs, *self.driver.find_elements(By.TAG_NAME, "p")}), 2)
+        self.assertIsInstance(self.driver.find_element(By.TAG_NAME, "p"), WebElement)    # lean mode does not persist
+
+    def test_text_search(self):
+        refs = self.driver.find_elements(By.TEXT, "Two", lean=True)
+        self.assertIsInstance(refs[0], ElementRef)
+        form = self.driver.find_element(By.TAG_NAME, "form")
+        self.assertEqual(form.find_elements(By.PARTIAL_TEXT, "T", lean=True), refs)
+
+    def test_upgrade(self):
+        label, = self.driver.find_elements(By.TAG_NAME, "label", lean=True)
+        self.assertEqual(label.text, "Name")
+        self.assertEqual(label.find_ancestor(1).tag_name, "form")
+        self.assertIsInstance(label.upgrade(), WebElement)
+        self.assertEqual(label.upgrade(), label)
+        field, = self.driver.find_elements(By.NAME, "user", lean=True)
+        field.slow_type("ab", max_delay=0, min_delay=0)
+        field.press.BACKSPACE()
+        self.assertEqual(field.get_attribute("value"), "a")
+        with self.assertRaises(AttributeError):
+            field.missing
+
+    def test_script_arguments(self):
+        refs = self.driver.find_elements(By.TAG_NAME, "p", lean=True)
+        self.assertEqual(self.driver.fetch(refs, ["text"])["text"], ["One", "Two"])
+        self.assertEqual(self.driver.find_ancestors(refs, 1), [self.driver.find_element(By.TAG_NAME, "form")] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import time
+import unittest
+
+from selenium.common.exceptions import (JavascriptException, NoSuchElementException, StaleElementReferenceException,
+                                        TimeoutException, WebDriverException)
+
+from selex import By, Condition, RemoteDriver
+from selex.pool import reset_driver
+from selex.testing import FakeRemote
+
+HTML = """<html><head><title>Fake page</title></head><body>
+<form id="login"><label>Name</label><input name="user"><button>Sign in</button></form>
+<p>First</p><p>Second</p>
+</body></html>"""
+
+
+class FakeRemoteTest(unittest.TestCase):
+    """
+    Tests the selex driver attached to the 'FakeRemote' remote end.
+    """
+    
+    def setUp(self):
+        self.remote = FakeRemote(HTML)
+        self.driver = self.remote.get_driver()
+        self.remote.reset_stats()
+    
+    def tearDown(self):
+        self.driver.quit()
+        self.remote.close()
+    
+    def test_session(self):
+        self.assertIsInstance(self.driver, RemoteDriver)
+        self.assertEqual(self.driver.title, "Fake page")
+        self.assertEqual(self.driver.timeouts.script, 30)
+        self.assertEqual(self.remote.stats["getTitle"], 1)
+    
+    def test_find_elements(self):
+        self.assertEqual(self.driver.find_element(By.TEXT, "Sign in").tag_name, "button")
+        self.assertEqual([elem.text for elem in self.driver.find_elements(By.TAG_NAME, "p")], ["First", "Second"])
+        form = self.driver.find_element(By.ID, "login")
+        self.assertEqual(form.find_element(By.PARTIAL_TEXT, "Na").tag_name, "label")
+        with self.assertRaises(NoSuchElementException):
+            form.find_element(By.TEXT, "First")
+    
+    def test_round_trips(self):
+        labels = self.driver.find_elements(By.TAG_NAME, "label")
+        self.remote.reset_stats()
+        self.assertEqual(labels[0].find_ancestor(2).tag_name, "body")
+        self.assertEqual(self.remote.stats["w3cExecuteScript"], 1)
+        self.assertEqual(sum(self.remote.stats.values()), 2)    # find_ancestor + tag name
+    
+    def test_typing(self):
+        elem = self.driver.find_element(By.NAME, "user")
+        elem.slow_type("Tannerx", max_delay=0.02, min_delay=0.01)
+        elem.press.BACKSPACE()
+        self.assertEqual(elem.get_attribute("value"), "Tanner")
+        self.assertEqual(self.remote.stats["actions"], 1)
+        self.assertGreater(self.remote.pause_time, 0.05)
+    
+    def test_wait_for(self):
+        self.assertEqual(self.driver.wait_for((By.TEXT, "Second")).text, "Second")
+        self.assertIs(self.driver.wait_for((By.ID, "missing"), Condition.ABSENT), True)
+        with self.assertRaises(TimeoutException):
+            self.driver.wait_for((By.ID, "missing"), timeout=0.1)
+        self.assertEqual(self.remote.stats["w3cExecuteScriptAsync"], 3)
+    
+    def test_navigation(self):
+        elem = self.driver.find_element(By.TAG_NAME, "p")
+        self.remote.pages["https://example.com/"] = "<h1>Example</h1>"
+        self.driver.get("https://example.com/")
+        self.assertEqual(self.driver.find_element(By.TAG_NAME, "h1").text, "Example")
+        with self.assertRaises(StaleElementReferenceException):
+            elem.text
+        self.driver.back()
+        self.assertEqual(self.driver.current_url, "about:blank")
+        with self.assertRaises(WebDriverException):
+            self.driver.get("https://unknown.example.com/")
+    
+    def test_load(self):
+        self.remote.load("<p>Reloaded</p>")
+        self.assertEqual(self.driver.find_element(By.TAG_NAME, "p").text, "Reloaded")
+    
+    def test_unknown_script(self):
+        with self.assertRaises(JavascriptException):
+            self.driver.execute_script("return document.title;")
+    
+    def test_windows(self):
+        self.driver.switch_to.new_window("tab")
+        self.assertEqual(len(self.driver.window_handles), 2)
+        reset_driver(self.driver)
+        self.assertEqual(len(self.driver.window_handles), 1)
+        self.assertEqual(self.driver.current_url, "about:blank")
+    
+    def test_latency(self):
+        self.remote.latency = 0.05
+        t_start = time.perf_counter()
+        self.driver.find_elements(By.TAG_NAME, "p")
+        self.assertGreaterEqual(time.perf_counter() - t_start, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
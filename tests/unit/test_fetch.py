@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import patch
+
+from selex import By
+from selex.testing import FakeRemote
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+HTML = """<html><body>
+<a href="/one" class="link">One</a>
+<a href="/two" class="link" style="display: none">Two</a>
+<a class="link">Three</a>
+<input id="field" value="Tanner">
+</body></html>"""
+
+
+class FetchTest(unittest.TestCase):
+    """
+    Tests the 'Driver.fetch' method, using the fake remote end.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.remote = FakeRemote(HTML)
+        cls.driver = cls.remote.get_driver()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.driver.quit()
+        cls.remote.close()
+
+    def setUp(self):
+        self.remote.load(HTML)
+        self.links = self.driver.find_elements(By.CLASS_NAME, "link")
+        self.remote.reset_stats()
+
+    def test_columns(self):
+        columns = self.driver.fetch(self.links, ["text", "tag_name", "displayed", "href", "class"])
+        self.assertEqual(list(columns), ["text", "tag_name", "displayed", "href", "class"])
+        self.assertEqual(columns["text"], ["One", "", "Three"])
+        self.assertEqual(columns["tag_name"], ["a", "a", "a"])
+        self.assertEqual(columns["displayed"], [True, False, True])
+        self.assertEqual(columns["href"], ["/one", "/two", None])
+        self.assertEqual(columns["class"], ["link", "link", "link"])
+        self.assertEqual(self.remote.stats["w3cExecuteScript"], 1)
+        self.assertEqual(sum(self.remote.stats.values()), 1)
+
+    def test_matches_live_values(self):
+        columns = self.driver.fetch(self.links, ["text", "rect"])
+        self.assertEqual(columns["text"], [elem.text for elem in self.links])
+        self.assertEqual(columns["rect"], [elem.rect for elem in self.links])
+
+    def test_live_value(self):
+        field = self.driver.find_element(By.ID, "field")
+        field.send_keys("!")
+        self.assertEqual(self.driver.fetch([field], ["value"])["value"], ["Tanner!"])
+
+    def test_chunks(self):
+        columns = self.driver.fetch(self.links, ["tag_name", "tag_name"], chunk_size=2)
+        self.assertEqual(columns, {"tag_name": ["a", "a", "a"]})
+        self.assertEqual(self.remote.stats["w3cExecuteScript"], 2)
+        with self.assertRaises(ValueError):
+            self.driver.fetch(self.links, ["text"], chunk_size=0)
+
+    def test_no_elements(self):
+        self.assertEqual(self.driver.fetch([], ["text", "rect"]), {"text": [], "rect": []})
+        self.assertEqual(sum(self.remote.stats.values()), 0)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_rects(self):
+        rects = self.driver.fetch(self.links, ["rect"], numpy=True)["rect"]
+        self.assertEqual(rects.shape, (3, 4))
+        self.assertEqual(rects[:, 2].tolist(), [100, 0, 100])
+
+    def test_numpy_missing(self):
+        with patch.dict("sys.modules", {"numpy": None}):
+            with self.assertRaises(ImportError):
+                self.driver.fetch(self.links, ["rect"], numpy=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
 import unittest
+from unittest.mock import Mock
 
 from tests.setup import BaseTestCase
 from selex import *
+from selex.scripts import FIND_ANCESTORS
+from selex.webelement import WebElement
 
 LEVELS = ['label', 'form', 'body', 'html']
 
@@ -47,6 +50,37 @@ class ElemFindAncestorTest(BaseTestCase):
     
     def test_non_recursive_out_of_bounds(self):
         out_of_bounds(self, recursive=False)
+    
+    def test_batch(self):
+        elems = [self.elem, self.driver.find_element(By.ID, "form1")]
+        tags = [elem.tag_name for elem in self.driver.find_ancestors(elems, level=2)]
+        self.assertEqual(tags, ['body', 'body'])
+    
+    def test_batch_out_of_bounds(self):
+        elems = [self.elem, self.driver.find_element(By.CSS_SELECTOR, "body")]
+        tags = [elem.tag_name for elem in self.driver.find_ancestors(elems, level=3, recursive=True)]
+        self.assertEqual(tags, ['html', 'html'])
+        with self.assertRaises(NoSuchElementException):
+            self.driver.find_ancestors(elems, level=3, recursive=False)
+
+
+class ElemFindAncestorCallsTest(unittest.TestCase):
+    """
+    Tests that the recursive ancestor search takes a single WebDriver call, without a browser.
+    """
+    
+    def test_single_call(self):
+        driver = Mock()
+        driver.execute_script.return_value = [Mock()]
+        elem = WebElement(driver, "id")
+        self.assertIs(elem.find_ancestor(level=10), driver.execute_script.return_value[0])
+        driver.execute_script.assert_called_once_with(FIND_ANCESTORS, [elem], 10, True)
+    
+    def test_level_zero(self):
+        driver = Mock()
+        elem = WebElement(driver, "id")
+        self.assertIs(elem.find_ancestor(level=0), elem)
+        driver.execute_script.assert_not_called()
   
             
 if __name__ == "__main__":
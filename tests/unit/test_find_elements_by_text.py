@@ -1,7 +1,10 @@
 import unittest
+from unittest.mock import patch
 
 from tests.setup import BaseTestCase
 from selex import NoSuchElementException, By
+from selex.utils import make_text_search_query, xpath_literal
+from selex.webelement import WebElement, BaseWebElement
 
 
 class BaseFindElementsByTextTest:
@@ -73,7 +76,46 @@ class ElemFindElementsByTextTest(BaseTestCase, BaseFindElementsByTextTest):
     def setUpClass(cls):
         super().setUpClass()
         cls.subject = cls.elem
-                
+    
+    def test_scoped_to_element(self):
+        form = self.driver.find_element(By.CSS_SELECTOR, "form")
+        self.assertEqual(len(form.find_elements(By.PARTIAL_TEXT, "Heading")), 0)
+        self.assertEqual(form.find_element(By.TEXT, "Form field:").tag_name, "label")
+    
+    def test_normalize_space(self):
+        self.assertEqual(len(self.subject.find_elements(By.TEXT, "  Heading   1 ")), 0)
+        self.assertEqual(len(self.subject.find_elements(By.TEXT, "  Heading   1 ", normalize_space=True)), 1)
+
+
+class TextSearchQueryTest(unittest.TestCase):
+    """
+    Tests the generation of the text search queries, without a browser.
+    """
+    
+    def test_literal_no_quotes(self):
+        self.assertEqual(xpath_literal("Heading 1"), "'Heading 1'")
+    
+    def test_literal_single_quote(self):
+        self.assertEqual(xpath_literal("Don't"), '"Don\'t"')
+    
+    def test_literal_both_quotes(self):
+        self.assertEqual(xpath_literal("""Say "don't" """), """concat('Say "don', "'", 't" ')""")
+    
+    def test_exact(self):
+        self.assertEqual(make_text_search_query("Heading", True), "//*[text()[.='Heading']]")
+    
+    def test_partial_relative(self):
+        self.assertEqual(make_text_search_query("Heading", False, relative=True), ".//*[text()[contains(., 'Heading')]]")
+    
+    def test_normalize_space(self):
+        self.assertEqual(make_text_search_query(" Heading \n 1 ", True, normalize_space=True), 
+                         "//*[text()[normalize-space(.)='Heading 1']]")
+    
+    @patch.object(BaseWebElement, "find_elements")
+    def test_element_search_relative(self, mock_find_elements):
+        WebElement(None, "id").find_elements(By.PARTIAL_TEXT, "Heading")
+        mock_find_elements.assert_called_once_with(By.XPATH, ".//*[text()[contains(., 'Heading')]]")
+
 
 if __name__ == "__main__":
     unittest.main(exit=False)
\ No newline at end of file
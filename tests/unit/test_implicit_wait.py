@@ -1,5 +1,8 @@
 import time
 import unittest
+from unittest.mock import Mock, patch
+
+from selenium.webdriver.remote.command import Command
 
 from tests.setup import BaseTestCase
 from selex import *
@@ -36,7 +39,7 @@ class DriverImplicitWaitFactoryTest(BaseTestCase):
 class DriverImplicitWaitTest(unittest.TestCase):
     """Tests the standalone @wait decorator in a child class of Driver."""
     
-    class TestDriver(type(get_driver(Browser.CHROME))):
+    class TestDriver(ChromeDriver):
         @wait(TEST_WAIT)    
         def search_for_nothing(self):
             self.find_element(By.ID, "Nonexistent id")
@@ -56,5 +59,68 @@ class DriverImplicitWaitTest(unittest.TestCase):
             driver.quit()   # important not to forget this
 
 
+class TimeoutCacheTest(unittest.TestCase):
+    """Tests that timeout commands are only sent when the timeout changes, without a browser."""
+    
+    class TestDriver(ChromeDriver):
+        @wait(0)
+        def search_without_wait(self):
+            pass
+        
+        @wait(TEST_WAIT)
+        def search_with_wait(self):
+            return self.implicit_wait
+    
+    def setUp(self):
+        with patch("selenium.webdriver.Chrome.__init__", return_value=None):
+            self.driver = self.TestDriver()
+        self.driver.execute = Mock()
+    
+    def timeout_commands(self):
+        return [c.args[1] for c in self.driver.execute.call_args_list if c.args[0] == Command.SET_TIMEOUTS]
+    
+    def test_unchanged_not_sent(self):
+        self.driver.implicit_wait = 0
+        self.assertEqual(self.timeout_commands(), [])
+        self.driver.implicit_wait = 5
+        self.driver.implicit_wait = 5
+        self.assertEqual(self.timeout_commands(), [{"implicit": 5000}])
+        self.assertEqual(self.driver.timeout_stats, {"sent": 1, "avoided": 2})
+    
+    def test_decorator_same_wait(self):
+        for _ in range(10):
+            self.driver.search_without_wait()
+        self.assertEqual(self.timeout_commands(), [])
+    
+    def test_decorator_restores_wait(self):
+        self.assertEqual(self.driver.search_with_wait(), TEST_WAIT)
+        self.assertEqual(self.driver.implicit_wait, 0)
+        self.assertEqual(self.timeout_commands(), [{"implicit": 1000 * TEST_WAIT}, {"implicit": 0}])
+    
+    def test_scope(self):
+        with self.driver.implicit_wait_scope(3):
+            self.assertEqual(self.driver.implicit_wait, 3)
+            with self.driver.implicit_wait_scope(3):
+                pass
+        self.assertEqual(self.driver.implicit_wait, 0)
+        self.assertEqual(self.driver.timeout_stats, {"sent": 2, "avoided": 2})
+    
+    def test_other_timeouts(self):
+        self.driver.set_script_timeout(30)
+        self.driver.set_script_timeout(30)
+        self.driver.set_page_load_timeout(10)
+        self.assertEqual(self.timeout_commands(), [{"script": 30000}, {"pageLoad": 10000}])
+    
+    def test_seeded_from_capabilities(self):
+        driver = self.TestDriver.__new__(self.TestDriver)
+        driver.caps = {"timeouts": {"implicit": 2000, "pageLoad": 300000, "script": 30000}}
+        with patch("selenium.webdriver.Chrome.__init__", return_value=None):
+            driver.__init__()
+        driver.execute = Mock()
+        self.assertEqual(driver.implicit_wait, 2)
+        driver.set_page_load_timeout(300)
+        driver.execute.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main(exit=False)
\ No newline at end of file
@@ -0,0 +1,63 @@
+import types
+import unittest
+
+from selex import By
+from selex.testing import FakeRemote
+
+HTML = ("<html><body><div id='list'>" + "".join(f"<p class='item'>Item {i}</p>" for i in range(25)) + "</div>"
+        + "<p class='item'>Outside</p><a href='/more'>More</a></body></html>")
+
+
+class IterElementsTest(unittest.TestCase):
+    """
+    Tests the 'iter_elements' method of the Driver and WebElement classes, using the fake remote end.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.remote = FakeRemote(HTML)
+        cls.driver = cls.remote.get_driver()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.driver.quit()
+        cls.remote.close()
+
+    def setUp(self):
+        self.remote.load(HTML)
+        self.remote.reset_stats()
+
+    def test_pages(self):
+        elements = self.driver.iter_elements(By.CLASS_NAME, "item", page_size=10)
+        self.assertIsInstance(elements, types.GeneratorType)
+        self.assertEqual(sum(self.remote.stats.values()), 0)   # nothing is fetched until iterated
+        self.assertEqual(next(elements).text, "Item 0")
+        self.assertEqual(self.remote.stats["w3cExecuteScript"], 1)
+        self.assertEqual(len(list(elements)), 25)
+        self.assertEqual(self.remote.stats["w3cExecuteScript"], 3)
+
+    def test_same_as_find_elements(self):
+        for by, value in [(By.TAG_NAME, "p"), (By.XPATH, "//p[position() > 3]"), (By.PARTIAL_TEXT, "Item 1"),
+                          (By.LINK_TEXT, "More")]:
+            with self.subTest(by=by):
+                self.assertEqual(list(self.driver.iter_elements(by, value, page_size=4)), self.driver.find_elements(by, value))
+
+    def test_exact_pages(self):
+        self.assertEqual(len(list(self.driver.iter_elements(By.CLASS_NAME, "item", page_size=13))), 26)
+        self.assertEqual(self.remote.stats["w3cExecuteScript"], 2)
+        self.assertEqual(list(self.driver.iter_elements(By.ID, "missing")), [])
+
+    def test_element_scope(self):
+        container = self.driver.find_element(By.ID, "list")
+        texts = [elem.text for elem in container.iter_elements(By.TAG_NAME, "p", page_size=7)]
+        self.assertEqual(texts, [f"Item {i}" for i in range(25)])
+        self.assertEqual(list(container.iter_elements(By.TEXT, "Outside")), [])
+
+    def test_page_size(self):
+        for page_size in [0, -1, 1.5]:
+            with self.assertRaises(ValueError):
+                self.driver.iter_elements(By.TAG_NAME, "p", page_size=page_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,13 @@
 import unittest
+from unittest.mock import Mock, patch
+
+from selenium.webdriver.common.keys import Keys
 
 from tests.setup import BaseTestCase
 
 from selex import By
+from selex.keypress import DriverKeyPress, ElemKeyPress, KeyPress
+from selex.webelement import WebElement
 
 def test_numpad_nums(self, driver, focus_click: bool):
     """"
@@ -97,5 +102,43 @@ class KeypressTest(BaseTestCase):
         test_arrows_bksp_del(self, self.form_field, focus_click = False)
             
 
+class KeypressDispatchTest(unittest.TestCase):
+    """
+    Tests the key press dispatch without a browser.
+    """
+    
+    def test_keys_defined_on_class(self):
+        for key_name in ["ENTER", "TAB", "NUMPAD0", "DELETE"]:
+            self.assertIn(key_name, KeyPress.keys)
+            self.assertTrue(callable(getattr(KeyPress, key_name)))
+    
+    def test_no_instance_state(self):
+        with self.assertRaises(AttributeError):
+            ElemKeyPress(Mock()).__dict__
+    
+    def test_base_class_abstract(self):
+        with self.assertRaises(TypeError):
+            KeyPress()
+    
+    def test_element_press_lazy(self):
+        elem = WebElement(None, "id")
+        self.assertNotIn("press", vars(elem))  # nothing is built on construction
+        self.assertIsInstance(elem.press, ElemKeyPress)
+    
+    def test_element_press(self):
+        elem = WebElement(None, "id")
+        with patch.object(WebElement, "send_keys") as mock_send_keys:
+            elem.press.ENTER()
+        mock_send_keys.assert_called_once_with(Keys.ENTER)
+    
+    @patch("selex.keypress.ActionChains")
+    def test_driver_press(self, mock_action_chains):
+        driver = Mock()
+        DriverKeyPress(driver).TAB()
+        mock_action_chains.assert_called_once_with(driver)
+        mock_action_chains.return_value.send_keys.assert_called_once_with(Keys.TAB)
+        mock_action_chains.return_value.send_keys.return_value.perform.assert_called_once()
+
+
 if __name__ == "__main__":
     unittest.main(exit=False)
\ No newline at end of file
@@ -0,0 +1,118 @@
+import unittest
+
+from selenium.common.exceptions import NoSuchElementException
+
+from selex import By, Chain
+from selex.locator import compile_chain
+from selex.testing import FakeRemote
+
+HTML = """<html><body>
+<div class="row"><div><span>Price</span></div><b class="value">1.99</b></div>
+<div class="row"><div><span>Tax</span></div><b class="value">0.20</b></div>
+<div class="row"><div><span>Price</span></div></div>
+</body></html>"""
+
+
+class CompileChainTest(unittest.TestCase):
+    """
+    Tests the compilation of chained locators.
+    """
+
+    def test_fused_xpath(self):
+        chain = Chain(By.TEXT, "Price").ancestor(2).find(By.CLASS_NAME, "value")
+        self.assertEqual(compile_chain(chain), (("xpath", "((.//*[text()[.='Price']])/./ancestor::*[2])/"
+                                                 ".//*[contains(concat(' ', normalize-space(@class), ' '), ' value ')]"),))
+
+    def test_css_steps(self):
+        chain = Chain(By.TEXT, "Price").ancestor(2).find(By.CSS_SELECTOR, "b.value")
+        self.assertEqual(compile_chain(chain), (("xpath", "(.//*[text()[.='Price']])/./ancestor::*[2]"), ("css", "b.value")))
+        chain = Chain(By.CSS_SELECTOR, "div").find(By.XPATH, "//b").find(By.ID, "x")
+        self.assertEqual(compile_chain(chain), (("css", "div"), ("xpath", "(//b)/.//*[@id='x']")))
+
+    def test_union_not_fused(self):
+        chain = Chain(By.ID, "a").find(By.XPATH, ".//i | .//b[@title='x|y']")
+        self.assertEqual(compile_chain(chain), (("xpath", ".//*[@id='a']"), ("xpath", ".//i | .//b[@title='x|y']")))
+        chain = Chain(By.XPATH, ".//i | .//b").find(By.TAG_NAME, "u")
+        self.assertEqual(compile_chain(chain), (("xpath", "(.//i | .//b)/.//u"),))
+        chain = Chain(By.ID, "a").find(By.XPATH, ".//*[self::i | self::b]")
+        self.assertEqual(compile_chain(chain), (("xpath", "(.//*[@id='a'])/.//*[self::i | self::b]"),))
+
+    def test_cached(self):
+        chain = Chain(By.TAG_NAME, "div").ancestor(0).ancestor(1)
+        self.assertEqual(chain, Chain(By.TAG_NAME, "div").ancestor(0).ancestor(1))
+        self.assertIs(compile_chain(chain), compile_chain(Chain(By.TAG_NAME, "div").ancestor(0).ancestor(1)))
+        self.assertEqual(compile_chain(chain), (("xpath", "(.//div)/./ancestor::*[1]"),))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            compile_chain(Chain())
+        with self.assertRaises(ValueError):
+            compile_chain(Chain(By.LINK_TEXT, "Home"))
+        with self.assertRaises(ValueError):
+            Chain(By.TAG_NAME, "div").ancestor(-1)
+
+
+class FindByChainTest(unittest.TestCase):
+    """
+    Tests finding elements by chained locators, using the fake remote end.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.remote = FakeRemote(HTML)
+        cls.driver = cls.remote.get_driver()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.driver.quit()
+        cls.remote.close()
+
+    def setUp(self):
+        self.remote.load(HTML)
+        self.remote.reset_stats()
+
+    def test_single_round_trip(self):
+        for step in [(By.CSS_SELECTOR, ".value"), (By.CLASS_NAME, "value")]:
+            with self.subTest(step=step):
+                self.remote.reset_stats()
+                chain = Chain(By.TEXT, "Price").ancestor(2).find(*step)
+                price = self.driver.find_element(By.CHAIN, chain)
+                self.assertEqual(sum(self.remote.stats.values()), 1)
+                self.assertEqual(price.text, "1.99")
+                self.assertEqual(self.driver.find_elements(By.CHAIN, chain), [price])
+
+    def test_same_as_steps(self):
+        chained = self.driver.find_elements(By.CHAIN, Chain(By.CLASS_NAME, "row").find(By.CSS_SELECTOR, "span").ancestor(2))
+        self.assertEqual(chained, self.driver.find_elements(By.CLASS_NAME, "row"))
+
+    def test_element_scope(self):
+        row = self.driver.find_elements(By.CLASS_NAME, "row")[1]
+        chain = Chain(By.TAG_NAME, "span").ancestor(2).find(By.CSS_SELECTOR, "b")
+        self.assertEqual(row.find_element(By.CHAIN, chain).text, "0.20")
+        self.assertEqual(len(self.driver.find_elements(By.CHAIN, chain)), 2)
+
+    def test_not_found(self):
+        with self.assertRaises(NoSuchElementException):
+            self.driver.find_element(By.CHAIN, Chain(By.TEXT, "Total").find(By.CSS_SELECTOR, "b"))
+        self.assertEqual(self.driver.find_elements(By.CHAIN, Chain(By.TEXT, "Total").find(By.CSS_SELECTOR, "b")), [])
+
+    def test_above_root(self):
+        self.assertEqual(self.driver.find_element(By.CHAIN, Chain(By.TAG_NAME, "span").ancestor(4)).tag_name, "html")
+        for step in [(By.CSS_SELECTOR, "b"), (By.TAG_NAME, "b")]:    # evaluated by the script and natively
+            with self.subTest(step=step):
+                chain = Chain(By.TAG_NAME, "span").ancestor(5).find(*step)
+                self.assertEqual(self.driver.find_elements(By.CHAIN, chain), [])
+                self.assertEqual(self.driver.snapshot().find_elements(By.CHAIN, chain), [])
+
+    def test_union_step(self):
+        self.remote.load("<div id='a'><i>1</i><b>2</b></div><i>3</i><b>4</b>")
+        chain = Chain(By.ID, "a").find(By.XPATH, ".//i | .//b")
+        self.assertEqual([elem.text for elem in self.driver.find_elements(By.CHAIN, chain)], ["1", "2"])
+
+    def test_snapshot(self):
+        chain = Chain(By.TEXT, "Price").ancestor(2).find(By.CSS_SELECTOR, ".value")
+        self.assertEqual([elem.text for elem in self.driver.snapshot().find_elements(By.CHAIN, chain)], ["1.99"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from selex import ChromeDriver
+from selex.metrics import CommandMetrics, Histogram, find_metrics, operation
+from selex.webelement import WebElement
+
+
+class HistogramTest(unittest.TestCase):
+    """
+    Tests the 'Histogram' class.
+    """
+    
+    def test_observe(self):
+        histogram = Histogram((1, 10))
+        for value in [0.5, 1, 5, 50, 100]:
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 2])
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.sum, 156.5)
+        self.assertEqual(list(histogram.cumulative()), [(1, 2), (10, 3), ("+Inf", 5)])
+        self.assertEqual(histogram.snapshot()["buckets"], {"1": 2, "10": 1, "+Inf": 2})
+
+
+class CommandMetricsTest(unittest.TestCase):
+    """
+    Tests the 'CommandMetrics' class.
+    """
+    
+    def setUp(self):
+        self.metrics = CommandMetrics()
+    
+    def test_groups(self):
+        self.metrics.record("findElement", 0.01)
+        with self.metrics.group("find_ancestor"):
+            with self.metrics.group("nested"):     # merged into the outermost group
+                self.metrics.record("executeScript", 0.02)
+                self.metrics.record("executeScript", 0.02)
+        snapshot = self.metrics.snapshot()
+        keys = sorted((c["group"], c["command"], c["latency_seconds"]["count"]) for c in snapshot["commands"])
+        self.assertEqual(keys, [("", "findElement", 1), ("find_ancestor", "executeScript", 2)])
+        self.assertEqual(snapshot["operations"], {"find_ancestor": {"calls": 1, "round_trips": 2, "round_trips_per_call": 2}})
+    
+    def test_execute(self):
+        execute = Mock(return_value={"value": "abc"})
+        response = self.metrics.execute(execute, Command.FIND_ELEMENT, {"using": "css selector", "value": "p"})
+        self.assertIs(response, execute.return_value)
+        stats = self.metrics.snapshot()["commands"][0]
+        self.assertEqual(stats["command"], Command.FIND_ELEMENT)
+        self.assertEqual(stats["request_bytes"]["sum"], len(json.dumps({"using": "css selector", "value": "p"})))
+        self.assertEqual(stats["response_bytes"]["sum"], len('"abc"'))
+    
+    def test_json(self):
+        self.metrics.record("screenshot", 0.3, 10, 20000)
+        self.assertEqual(json.loads(self.metrics.to_json()), self.metrics.snapshot())
+    
+    def test_prometheus(self):
+        with self.metrics.group("slow_type"):
+            self.metrics.record("actions", 0.003)
+        text = self.metrics.to_prometheus()
+        self.assertIn("# TYPE selex_command_duration_seconds histogram", text)
+        self.assertIn('selex_command_duration_seconds_bucket{command="actions",group="slow_type",le="0.005"} 1', text)
+        self.assertIn('selex_command_duration_seconds_bucket{command="actions",group="slow_type",le="0.0025"} 0', text)
+        self.assertIn('selex_command_duration_seconds_count{command="actions",group="slow_type"} 1', text)
+        self.assertIn('selex_operations_total{operation="slow_type"} 1', text)
+    
+    def test_reset(self):
+        self.metrics.record("findElement", 0.01)
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot(), {"commands": [], "operations": {}})
+
+
+@patch.object(RemoteWebDriver, "execute", return_value={"value": None})
+class DriverMetricsTest(unittest.TestCase):
+    """
+    Tests recording the metrics of the Driver's commands, without a browser.
+    """
+    
+    def setUp(self):
+        with patch("selenium.webdriver.Chrome.__init__", return_value=None):
+            self.driver = ChromeDriver()
+    
+    def test_disabled(self, mock_execute):
+        self.assertIsNone(self.driver.metrics)
+        self.driver.execute(Command.GET_TITLE)
+        mock_execute.assert_called_once_with(Command.GET_TITLE, None)
+    
+    def test_enabled(self, mock_execute):
+        metrics = self.driver.enable_metrics()
+        self.assertIs(self.driver.enable_metrics(), metrics)
+        self.driver.execute(Command.GET_TITLE)
+        self.assertEqual(metrics.snapshot()["commands"][0]["command"], Command.GET_TITLE)
+    
+    def test_operation_groups(self, mock_execute):
+        metrics = self.driver.enable_metrics()
+        elem = WebElement(self.driver, "id")
+        def execute_script(*args):
+            self.driver.execute(Command.W3C_EXECUTE_SCRIPT)
+            return [elem]
+        with patch.object(self.driver, "execute_script", side_effect=execute_script):
+            elem.find_ancestor(3)
+        with patch.object(WebElement, "send_keys", side_effect=lambda keys: self.driver.execute(Command.SEND_KEYS_TO_ELEMENT)):
+            elem.press.ENTER()
+        operations = metrics.snapshot()["operations"]
+        self.assertEqual(operations["find_ancestor"]["round_trips"], 1)
+        self.assertEqual(operations["press.ENTER"]["round_trips"], 1)
+    
+    def test_find_metrics(self, mock_execute):
+        self.assertIsNone(find_metrics(WebElement(self.driver, "id").press))
+        metrics = self.driver.enable_metrics()
+        self.assertIs(find_metrics(WebElement(self.driver, "id").press), metrics)
+        self.assertIs(find_metrics(self.driver.press), metrics)
+        self.assertIsNone(find_metrics(Mock()))
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
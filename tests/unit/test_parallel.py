@@ -0,0 +1,102 @@
+import os
+import unittest
+
+from selenium.webdriver.common.options import ArgOptions
+
+from selex import Browser, By
+from selex.exceptions import WorkerRestartLimitError
+from selex.parallel import ParallelMap, UrlResult, map_urls
+from selex.testing import FakeRemote
+
+PAGES = {f"https://example.com/{i}": f"<h1>Page {i}</h1>" for i in range(12)}
+EMPTY_PAGE = "https://example.com/empty"
+
+
+def heading(driver, url):
+    return driver.find_element(By.TAG_NAME, "h1").text
+
+def quit_on_one(driver, url):
+    if url.endswith("/1"):
+        driver.quit()   # leaves the worker without a browser
+        raise RuntimeError("browser gone")
+    return url
+
+def crash_on_odd(driver, url):
+    if int(url.rsplit("/", 1)[1]) % 2 == 1:
+        os._exit(1)
+    return url
+
+
+@unittest.skipIf(os.name != "posix", "the fake remote end is shared with forked workers")
+class MapUrlsTest(unittest.TestCase):
+    """
+    Tests the 'map_urls' function, with worker processes attached to the fake remote end.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.remote = FakeRemote(pages={**PAGES, EMPTY_PAGE: "<p>No heading</p>"})
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.remote.close()
+
+    def map_urls(self, task, urls, **kwargs):
+        return map_urls(task, urls, Browser.REMOTE, start_method="fork", command_executor=self.remote.url,
+                        options=ArgOptions(), **kwargs)
+
+    def test_results(self):
+        results = self.map_urls(heading, list(PAGES) + [EMPTY_PAGE], workers=3)
+        self.assertIsInstance(results, ParallelMap)
+        collected = sorted(results)
+        self.assertTrue(all(isinstance(result, UrlResult) for result in collected))
+        self.assertEqual([result.value for result in collected[:-1]], [f"Page {i}" for i in range(12)])
+        self.assertIsNone(collected[-1].value)
+        self.assertTrue(collected[-1].error.startswith("NoSuchElementException"))
+        self.assertEqual(results.stats, {"completed": 13, "errors": 1, "retries": 0, "restarts": 0})
+        report = results.report()
+        self.assertEqual([worker["worker"] for worker in report], [0, 1, 2])
+        self.assertEqual(sum(worker["tasks"] for worker in report), 13)
+        self.assertTrue(all(worker["tasks_per_second"] > 0 for worker in report))
+
+    def test_lazy_urls(self):
+        taken = []
+        def urls():
+            for url in PAGES:
+                taken.append(url)
+                yield url
+        results = iter(self.map_urls(heading, urls(), workers=2))
+        next(results)
+        self.assertLessEqual(len(taken), 4)     # a URL per worker, and one more once a worker is done
+        results.close()
+
+    def test_crashed_workers(self):
+        urls = [f"https://example.com/{i}" for i in range(4)]
+        results = self.map_urls(crash_on_odd, urls, workers=2, retries=1)
+        collected = sorted(results)
+        self.assertEqual([result.value for result in collected], [urls[0], None, urls[2], None])
+        self.assertTrue(collected[1].error.startswith("WorkerCrashed"))
+        self.assertEqual(results.stats["retries"], 2)
+        self.assertEqual(results.stats["restarts"], 4)
+
+    def test_unhealthy_worker(self):
+        urls = [f"https://example.com/{i}" for i in range(4)]
+        results = self.map_urls(quit_on_one, urls, workers=1, retries=0)
+        collected = sorted(results)
+        self.assertEqual([result.value for result in collected], [urls[0], None, urls[2], urls[3]])
+        self.assertEqual(collected[1].error, "RuntimeError: browser gone")
+        self.assertEqual(results.stats, {"completed": 4, "errors": 1, "retries": 0, "restarts": 1})
+
+    def test_restart_limit(self):
+        results = map_urls(heading, list(PAGES), Browser.REMOTE, workers=1, max_restarts=2, start_method="fork",
+                           command_executor="http://127.0.0.1:9", options=ArgOptions())
+        with self.assertRaises(WorkerRestartLimitError):
+            list(results)
+
+    def test_workers(self):
+        with self.assertRaises(ValueError):
+            map_urls(heading, [], workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
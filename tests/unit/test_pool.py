@@ -0,0 +1,161 @@
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+from selex import DriverPool, Browser, WebDriverException
+from selex.exceptions import DriverPoolTimeoutError
+from selex.pool import reset_driver, BLANK_PAGE
+
+
+def mock_driver(*args, **kwargs):
+    """Returns a mock driver with a single open window."""
+    driver = Mock()
+    driver.window_handles = ["main"]
+    return driver
+
+
+@patch("selex.pool.get_driver", side_effect=mock_driver)
+class DriverPoolTest(unittest.TestCase):
+    """
+    Tests the 'DriverPool' class.
+    """
+    
+    def test_prestart(self, mock_get_driver):
+        pool = DriverPool(Browser.CHROME, size=3, kw1=5)
+        self.assertEqual(mock_get_driver.call_count, 3)
+        mock_get_driver.assert_called_with(Browser.CHROME, kw1=5)
+        self.assertEqual(len(pool), 3)
+    
+    def test_lazy_start(self, mock_get_driver):
+        pool = DriverPool(Browser.CHROME, size=3, prestart=False)
+        mock_get_driver.assert_not_called()
+        with pool.lease():
+            pass
+        self.assertEqual(mock_get_driver.call_count, 1)
+    
+    def test_invalid_size(self, mock_get_driver):
+        for size in [0, -1, 2.5]:
+            with self.assertRaises(ValueError):
+                DriverPool(Browser.CHROME, size=size)
+    
+    def test_driver_reused(self, mock_get_driver):
+        pool = DriverPool(Browser.CHROME, size=1)
+        with pool.lease() as driver1:
+            pass
+        with pool.lease() as driver2:
+            pass
+        self.assertIs(driver1, driver2)
+        self.assertEqual(mock_get_driver.call_count, 1)
+        self.assertEqual(pool.stats["leases"], 2)
+        driver1.get.assert_called_with(BLANK_PAGE)    # reset on return
+    
+    def test_max_uses(self, mock_get_driver):
+        pool = DriverPool(Browser.CHROME, size=1, max_uses=2)
+        drivers = []
+        for _ in range(3):
+            with pool.lease() as driver:
+                drivers.append(driver)
+        self.assertIs(drivers[0], drivers[1])
+        self.assertIsNot(drivers[1], drivers[2])
+        drivers[0].quit.assert_called_once()
+        self.assertEqual(pool.stats["recycled"], 1)
+        self.assertEqual(len(pool), 1)
+    
+    def test_unhealthy_replaced(self, mock_get_driver):
+        pool = DriverPool(Browser.CHROME, size=1)
+        with pool.lease() as driver1:
+            pass
+        driver1.execute.side_effect = WebDriverException
+        with pool.lease() as driver2:
+            pass
+        self.assertIsNot(driver1, driver2)
+        self.assertEqual(pool.stats["unhealthy"], 1)
+    
+    def test_dead_browser_frees_slot(self, mock_get_driver):
+        pool = DriverPool(Browser.CHROME, size=1)
+        with pool.lease() as driver1:
+            driver1.execute.side_effect = ConnectionError  # raised by urllib3 when the browser is gone
+            driver1.get.side_effect = ConnectionError
+        self.assertEqual(len(pool), 0)  # the reset failed, so the driver was quit
+        with pool.lease() as driver2:
+            driver2.execute.side_effect = ConnectionError
+        self.assertEqual(len(pool), 1)
+        driver2.get.side_effect = None
+        driver2.quit.side_effect = ConnectionError
+        with pool.lease(timeout=1) as driver3:
+            pass
+        self.assertIsNot(driver2, driver3)
+        self.assertEqual(len(pool), 1)
+        self.assertEqual(pool.stats["unhealthy"], 1)
+
+    def test_release_after_close(self, mock_get_driver):
+        pool = DriverPool(Browser.CHROME, size=1)
+        with pool.lease() as driver:
+            pool.close()
+        driver.get.assert_not_called()  # not reset, only quit
+        driver.quit.assert_called_once()
+        self.assertEqual(len(pool), 0)
+
+    def test_foreign_driver(self, mock_get_driver):
+        pool = DriverPool(Browser.CHROME, size=1)
+        foreign = mock_driver()
+        pool.release(foreign)
+        foreign.quit.assert_called_once()
+        self.assertEqual(len(pool), 1)
+
+    def test_failed_job_discards_driver(self, mock_get_driver):
+        pool = DriverPool(Browser.CHROME, size=1)
+        with self.assertRaises(WebDriverException):
+            with pool.lease() as driver1:
+                raise WebDriverException
+        driver1.quit.assert_called_once()
+        with pool.lease() as driver2:
+            pass
+        self.assertIsNot(driver1, driver2)
+    
+    def test_timeout(self, mock_get_driver):
+        pool = DriverPool(Browser.CHROME, size=1)
+        with pool.lease():
+            with self.assertRaises(DriverPoolTimeoutError):
+                pool.acquire(timeout=0.01)
+    
+    def test_waits_for_release(self, mock_get_driver):
+        pool = DriverPool(Browser.CHROME, size=1)
+        driver = pool.acquire()
+        threading.Timer(0.05, pool.release, args=[driver]).start()
+        self.assertIs(pool.acquire(timeout=5), driver)
+    
+    def test_close(self, mock_get_driver):
+        with DriverPool(Browser.CHROME, size=2) as pool:
+            drivers = [pool.acquire(), pool.acquire()]
+            pool.release(drivers[0])
+        drivers[0].quit.assert_called_once()
+        drivers[1].quit.assert_not_called()     # still leased
+        pool.release(drivers[1])
+        drivers[1].quit.assert_called_once()
+        with self.assertRaises(RuntimeError):
+            pool.acquire()
+
+
+class ResetDriverTest(unittest.TestCase):
+    """
+    Tests the 'reset_driver' function.
+    """
+    
+    def test_extra_windows_closed(self):
+        driver = mock_driver()
+        driver.window_handles = ["main", "popup1", "popup2"]
+        reset_driver(driver)
+        self.assertEqual(driver.close.call_count, 2)
+        driver.switch_to.window.assert_called_with("main")
+        driver.get.assert_called_once_with(BLANK_PAGE)
+    
+    def test_cookie_fallback(self):
+        driver = mock_driver()
+        driver.execute_cdp_cmd.side_effect = WebDriverException
+        reset_driver(driver)
+        driver.delete_all_cookies.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -0,0 +1,104 @@
+import time
+import unittest
+
+from tests.setup import BaseTestCase, test_website_path
+from selex import By
+from selex.scripts import DOM_GENERATION, FETCH, FIND_CHAIN, FIND_PAGE, NAVIGATE, PAGE_READY, WAIT_FOR
+from selex.testing import FakeRemote
+
+
+def tag_names(elements):
+    return [elem.tag_name for elem in elements]
+
+
+class BaseScriptsTest:
+    """
+    Base test case for the scripts selex executes in the browser, run against a real browser and the fake remote end,
+    so that the emulations of the fake remote end are checked against the scripts which ship.
+    """
+
+    def setUp(self):
+        self.driver.get(test_website_path())
+
+    def test_find_page(self):
+        page, total = self.driver.execute_script(FIND_PAGE, None, "css", "p", 1, 5)
+        self.assertEqual([elem.text for elem in page], ["Bold text", "Italic text"])
+        self.assertEqual(total, 3)
+        form = self.driver.find_element(By.TAG_NAME, "form")
+        page, total = self.driver.execute_script(FIND_PAGE, form, "xpath", ".//input | .//label", 0, 1)
+        self.assertEqual(tag_names(page), ["label"])
+        self.assertEqual(total, 2)
+
+    def test_find_page_text_nodes(self):
+        # matches which are not elements count in the total and are left out of the page they fall in
+        page, total = self.driver.execute_script(FIND_PAGE, None, "xpath", "//p | //label/text()", 2, 2)
+        self.assertEqual([elem.text for elem in page], ["Italic text"])
+        self.assertEqual(total, 4)
+
+    def test_find_chain(self):
+        found = self.driver.execute_script(FIND_CHAIN, None, [["css", "form"], ["xpath", ".//input | .//label"]])
+        self.assertEqual(tag_names(found), ["label", "input"])
+        self.assertEqual(self.driver.execute_script(FIND_CHAIN, None, [["css", "p"], ["xpath", "./text()"]]), [])
+        self.assertEqual(self.driver.execute_script(FIND_CHAIN, None, [["css", "html"], ["xpath", ".."]]), [])
+
+    def test_fetch(self):
+        paragraphs = self.driver.find_elements(By.TAG_NAME, "p")
+        texts, names, displayed, rects = self.driver.execute_script(FETCH, paragraphs, ["text", "tag_name", "displayed", "rect"])
+        self.assertEqual(texts, ["Normal text", "Bold text", "Italic text"])
+        self.assertEqual(names, ["p", "p", "p"])
+        self.assertEqual(displayed, [True, True, True])
+        self.assertTrue(all(len(rect) == 4 for rect in rects))
+        field = self.driver.find_element(By.ID, "form1")
+        self.assertEqual(self.driver.execute_script(FETCH, [field], ["value", "type"]), [[""], ["text"]])
+
+    def test_wait_for(self):
+        self.driver.set_script_timeout(5)
+        found = self.driver.execute_async_script(WAIT_FOR, "css", "label", "present", 1000, 100)
+        self.assertEqual(found.text, "Form field:")
+        self.assertEqual(self.driver.execute_async_script(WAIT_FOR, "xpath", "//table", "absent", 1000, 100), True)
+        self.assertIsNone(self.driver.execute_async_script(WAIT_FOR, "css", "table", "present", 200, 100))
+
+    def test_dom_generation(self):
+        generation = self.driver.execute_script(DOM_GENERATION)
+        self.assertEqual(self.driver.execute_script(DOM_GENERATION), generation)
+        self.remove("form")
+        changed = self.driver.execute_script(DOM_GENERATION)
+        self.assertNotEqual(changed, generation)
+        self.assertEqual(changed.split(":")[0], generation.split(":")[0])     # the same document
+        self.driver.get(test_website_path())
+        self.assertNotEqual(self.driver.execute_script(DOM_GENERATION).split(":")[0], generation.split(":")[0])
+
+    def test_navigate(self):
+        self.remove("form")
+        self.driver.execute_script(NAVIGATE, test_website_path())
+        t_end = time.monotonic() + 10
+        while self.driver.execute_script(PAGE_READY) != True:
+            self.assertLess(time.monotonic(), t_end, "The page did not load.")
+            time.sleep(0.05)
+        self.assertEqual(len(self.driver.find_elements(By.TAG_NAME, "form")), 1)     # the new document
+
+
+class BrowserScriptsTest(BaseTestCase, BaseScriptsTest):
+
+    def remove(self, css_selector: str):
+        self.driver.execute_script("document.querySelector(arguments[0]).remove();", css_selector)
+
+
+class FakeRemoteScriptsTest(BaseScriptsTest, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.remote = FakeRemote()
+        cls.driver = cls.remote.get_driver()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.driver.quit()
+        cls.remote.close()
+
+    def remove(self, css_selector: str):
+        self.remote.mutate(lambda document: document.select_one(css_selector).decompose())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+from selex import By
+from selex.snapshot import Snapshot, SnapshotElement
+from selex.testing import FakeRemote
+
+HTML = """<html><body>
+<table id="prices">
+    <tr><td>Apples</td><td class="price">1.99</td></tr>
+    <tr><td>Pears</td><td class="price">2.49</td></tr>
+</table>
+<form><label>User  name</label><input name="user" value="Tanner"></form>
+<p><a href="/faq"> FAQ  list </a><a href="/about">About us</a></p>
+</body></html>"""
+
+
+class SnapshotTest(unittest.TestCase):
+    """
+    Tests the 'Driver.snapshot' method and the 'Snapshot' class, using the fake remote end.
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.remote = FakeRemote(HTML)
+        cls.driver = cls.remote.get_driver()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.driver.quit()
+        cls.remote.close()
+    
+    def setUp(self):
+        self.remote.load(HTML)
+        self.remote.reset_stats()
+    
+    def test_single_round_trip(self):
+        snapshot = self.driver.snapshot()
+        self.assertIsInstance(snapshot, Snapshot)
+        prices = [cell.text for cell in snapshot.find_elements(By.CLASS_NAME, "price")]
+        names = [row.find_element(By.XPATH, "./td[1]").text for row in snapshot.find_elements(By.CSS_SELECTOR, "tr")]
+        self.assertEqual(prices, ["1.99", "2.49"])
+        self.assertEqual(names, ["Apples", "Pears"])
+        self.assertEqual(sum(self.remote.stats.values()), 1)
+    
+    def test_locators(self):
+        snapshot = self.driver.snapshot()
+        self.assertEqual(snapshot.root.tag_name, "html")
+        self.assertEqual(snapshot.find_element(By.TEXT, "Pears").tag_name, "td")
+        self.assertEqual(len(snapshot.find_elements(By.PARTIAL_TEXT, "e")), 3)
+        self.assertEqual(snapshot.find_element(By.TEXT, "User name", normalize_space=True).tag_name, "label")
+        self.assertEqual(snapshot.find_element(By.NAME, "user").get_attribute("value"), "Tanner")
+        self.assertIsNone(snapshot.find_element(By.NAME, "user").get_attribute("missing"))
+        self.assertEqual(snapshot.find_element(By.ID, "prices").find_elements(By.TAG_NAME, "td")[2].text, "Pears")
+        with self.assertRaises(NoSuchElementException):
+            snapshot.find_element(By.TEXT, "Plums")
+    
+    def test_link_text(self):
+        snapshot = self.driver.snapshot()
+        self.assertEqual(snapshot.find_element(By.LINK_TEXT, "FAQ list").get_attribute("href"), "/faq")
+        self.assertEqual(len(snapshot.find_elements(By.LINK_TEXT, "About")), 0)
+        self.assertEqual(snapshot.find_element(By.PARTIAL_LINK_TEXT, "About").get_attribute("href"), "/about")
+        self.assertEqual(len(snapshot.root.find_elements(By.PARTIAL_LINK_TEXT, "")), 2)
+    
+    def test_subtree(self):
+        table = self.driver.find_element(By.ID, "prices")
+        snapshot = self.driver.snapshot(table)
+        self.assertEqual(snapshot.root.tag_name, "table")
+        self.assertEqual(len(snapshot.find_elements(By.TAG_NAME, "tr")), 2)
+        self.assertEqual(snapshot.find_elements(By.TAG_NAME, "label"), [])
+        self.assertEqual(snapshot.root.live(), table)
+    
+    def test_live(self):
+        snapshot = self.driver.snapshot()
+        cells = snapshot.find_elements(By.CLASS_NAME, "price")
+        self.remote.reset_stats()
+        live_cells = snapshot.live(cells)
+        self.assertEqual(self.remote.stats["w3cExecuteScript"], 1)
+        self.assertEqual([cell.text for cell in live_cells], ["1.99", "2.49"])
+        self.assertEqual(cells[0].live(), live_cells[0])
+        self.assertEqual(snapshot.find_element(By.NAME, "user").live(), self.driver.find_element(By.NAME, "user"))
+    
+    def test_live_after_change(self):
+        snapshot = self.driver.snapshot()
+        label = snapshot.find_element(By.TAG_NAME, "label")
+        self.remote.load("<html><body><p>Changed</p></body></html>")
+        self.driver.snapshot()  # the new page has no form
+        with self.assertRaises(StaleElementReferenceException):
+            label.live()
+    
+    def test_element_identity(self):
+        snapshot = self.driver.snapshot()
+        self.assertEqual(snapshot.find_element(By.TEXT, "Apples"), snapshot.find_elements(By.TAG_NAME, "td")[0])
+        self.assertIsInstance(snapshot.root, SnapshotElement)
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
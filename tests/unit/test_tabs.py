@@ -0,0 +1,145 @@
+import unittest
+
+from selex import By, TabPool
+from selex.parallel import UrlResult
+from selex.testing import FakeRemote
+
+PAGES = {f"https://example.com/{i}": f"<h1>Page {i}</h1>" for i in range(10)}
+EMPTY_PAGE = "https://example.com/empty"
+
+
+def heading(driver, url):
+    return driver.find_element(By.TAG_NAME, "h1").text
+
+
+class WindowTrackingTest(unittest.TestCase):
+    """
+    Tests the tracking of the current window and frame by the driver, using the fake remote end.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.remote = FakeRemote()
+        cls.driver = cls.remote.get_driver()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.driver.quit()
+        cls.remote.close()
+
+    def setUp(self):
+        self.remote.reset_stats()
+
+    def test_current_window_handle(self):
+        handle = self.driver.current_window_handle
+        self.assertEqual(self.driver.current_window_handle, handle)
+        self.assertLessEqual(self.remote.stats["w3cGetCurrentWindowHandle"], 1)
+
+    def test_redundant_switch_avoided(self):
+        handle = self.driver.current_window_handle
+        stats = dict(self.driver.switch_stats)
+        self.driver.switch_to.window(handle)
+        self.driver.switch_to.window(handle)
+        self.assertEqual(self.driver.switch_stats["avoided"], stats["avoided"] + 2)
+        self.driver.switch_to.frame(None)
+        self.driver.switch_to.window(handle)
+        self.assertEqual(self.driver.switch_stats["avoided"], stats["avoided"] + 3)
+
+    def test_switch_after_frame(self):
+        handle = self.driver.current_window_handle
+        self.driver._in_top_frame = False     # as after switching to a frame, which the fake remote end lacks
+        self.driver.switch_to.window(handle)
+        self.assertEqual(self.remote.stats["switchToWindow"], 1)
+        self.driver.switch_to.window(handle)
+        self.assertEqual(self.remote.stats["switchToWindow"], 1)
+
+    def test_switch_by_name(self):
+        handle = self.driver.current_window_handle
+        for session in self.remote.sessions.values():
+            session.window.name = "main"
+        try:
+            self.driver.switch_to.window("main")
+            self.assertEqual(self.driver.current_window_handle, handle)    # asked for, not the name
+            self.assertEqual(self.remote.stats["w3cGetCurrentWindowHandle"], 1)
+            self.driver.switch_to.window(handle)
+            self.assertEqual(self.remote.stats["switchToWindow"], 1)     # the handle is known, so the switch is skipped
+        finally:
+            for session in self.remote.sessions.values():
+                session.window.name = ""
+
+    def test_new_and_closed_windows(self):
+        origin = self.driver.current_window_handle
+        self.driver.switch_to.new_window("tab")
+        handle = self.driver.current_window_handle
+        self.assertNotEqual(handle, origin)
+        self.assertEqual(handle, self.driver.window_handles[-1])
+        self.driver.close()
+        self.driver.switch_to.window(origin)
+        self.assertEqual(self.driver.current_window_handle, origin)
+        self.assertEqual(self.remote.stats["switchToWindow"], 2)
+
+
+class TabPoolTest(unittest.TestCase):
+    """
+    Tests scheduling tasks across the tabs of a session with 'TabPool', using the fake remote end.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.remote = FakeRemote(pages={**PAGES, EMPTY_PAGE: "<p>No heading</p>"})
+        cls.driver = cls.remote.get_driver()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.driver.quit()
+        cls.remote.close()
+
+    def test_results(self):
+        origin = self.driver.current_window_handle
+        with TabPool(self.driver, tabs=3) as pool:
+            self.assertEqual(len(self.driver.window_handles), 3)
+            collected = sorted(pool.map_urls(heading, list(PAGES) + [EMPTY_PAGE]))
+        self.assertTrue(all(isinstance(result, UrlResult) for result in collected))
+        self.assertEqual([result.value for result in collected[:-1]], [f"Page {i}" for i in range(10)])
+        self.assertTrue(collected[-1].error.startswith("NoSuchElementException"))
+        self.assertEqual({result.worker for result in collected}, {0, 1, 2})
+        self.assertEqual(pool.stats, {"completed": 11, "errors": 1, "timeouts": 0, "polls": 0})
+        self.assertEqual(self.driver.window_handles, [origin])
+        self.assertEqual(self.driver.current_window_handle, origin)
+
+    def test_lazy_urls(self):
+        taken = []
+        def urls():
+            for url in PAGES:
+                taken.append(url)
+                yield url
+        with TabPool(self.driver, tabs=2) as pool:
+            results = pool.map_urls(heading, urls())
+            next(results)
+            self.assertEqual(len(taken), 3)     # a URL per tab, and the next one for the tab which is done
+            results.close()
+
+    def test_switches(self):
+        with TabPool(self.driver, tabs=1) as pool:
+            self.remote.reset_stats()
+            self.assertEqual(len(list(pool.map_urls(heading, PAGES))), 10)
+        self.assertEqual(self.remote.stats["switchToWindow"], 0)    # a single tab is never switched away from
+        self.assertEqual(self.remote.stats["w3cExecuteScript"], 20)  # a navigation and a readiness check per URL
+
+    def test_load_timeout(self):
+        with TabPool(self.driver, tabs=2, load_timeout=0) as pool:
+            pool.driver.execute_script = lambda script, *args: False if "readyState" in script else None
+            try:
+                collected = list(pool.map_urls(heading, list(PAGES)[:3]))
+            finally:
+                del pool.driver.execute_script
+        self.assertTrue(all(result.error.startswith("TimeoutException") for result in collected))
+        self.assertEqual(pool.stats["timeouts"], 3)
+
+    def test_tabs(self):
+        with self.assertRaises(ValueError):
+            TabPool(self.driver, tabs=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,12 @@
 import time
 import unittest
+from unittest.mock import Mock, patch
+
+from selenium.webdriver.remote.command import Command
 
 from tests.setup import BaseTestCase
 from selex import *
+from selex.webelement import WebElement
 
 min_max_delay = (0.1, 0.15)
 tolerance = 0.2
@@ -92,5 +96,56 @@ class TypingTest(BaseTestCase):
         self.assertEqual(self.get_field_text(), '')
 
 
+class TypingRequestsTest(unittest.TestCase):
+    """
+    Tests that slow typing is sent as a single actions request with browser-side pauses, without a browser.
+    """
+    
+    def setUp(self):
+        with patch("selenium.webdriver.Chrome.__init__", return_value=None):
+            self.driver = ChromeDriver()
+        self.driver.execute = Mock()
+    
+    def actions_requests(self):
+        return [c.args[1]["actions"] for c in self.driver.execute.call_args_list if c.args[0] == Command.W3C_ACTIONS]
+    
+    def key_actions(self, request):
+        """Returns the key actions of the request as a flat list."""
+        return [action for source in request if source["type"] == "key" for action in source["actions"]]
+    
+    def test_driver_slow_type(self):
+        test_phrase = "Tanner"
+        self.driver.slow_type(test_phrase, max_delay=min_max_delay[1], min_delay=min_max_delay[0])
+        requests = self.actions_requests()
+        self.assertEqual(len(requests), 1)
+        actions = self.key_actions(requests[0])
+        typed = "".join(action["value"] for action in actions if action["type"] == "keyDown")
+        self.assertEqual(typed, test_phrase)
+        pauses = [action["duration"] for action in actions if action["type"] == "pause"]
+        self.assertEqual(len(pauses), len(test_phrase))
+        for pause in pauses:
+            self.assertBetween(pause, 1000*min_max_delay[0], 1000*min_max_delay[1])
+    
+    def test_driver_slow_type_long_pauses(self):
+        """Pauses are split into multiple requests so that no request takes too long."""
+        self.driver.slow_type("abc", max_delay=40, min_delay=40)
+        self.assertEqual(len(self.actions_requests()), 3)
+    
+    def test_elem_slow_type(self):
+        elem = WebElement(self.driver, "id")
+        with patch.object(WebElement, "send_keys") as mock_send_keys, patch.object(WebElement, "clear") as mock_clear:
+            elem.slow_type("Dr1v3r", max_delay=0, min_delay=0)
+        mock_clear.assert_called_once()
+        mock_send_keys.assert_called_once_with("D")     # focuses the element
+        requests = self.actions_requests()
+        self.assertEqual(len(requests), 1)
+        typed = "".join(action["value"] for action in self.key_actions(requests[0]) if action["type"] == "keyDown")
+        self.assertEqual(typed, "r1v3r")
+
+    def assertBetween(self, value: float, lower_limit: float, upper_limit: float):
+        self.assertGreaterEqual(value, lower_limit)
+        self.assertLessEqual(value, upper_limit)
+
+
 if __name__ == "__main__":
     unittest.main(exit=False)
\ No newline at end of file
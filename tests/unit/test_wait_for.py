@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+from selex import ChromeDriver, By, Condition
+from selex.scripts import WAIT_FOR
+
+
+class DriverWaitForTest(unittest.TestCase):
+    """
+    Tests the 'Driver.wait_for' method without a browser.
+    """
+    
+    def setUp(self):
+        with patch("selenium.webdriver.Chrome.__init__", return_value=None):
+            self.driver = ChromeDriver()
+        self.driver.execute = Mock()
+        self.driver.execute_async_script = Mock()
+        self.driver.find_elements = Mock()
+    
+    def test_observer_resolves(self):
+        elem = Mock()
+        self.driver.execute_async_script.return_value = elem
+        self.assertIs(self.driver.wait_for((By.TEXT, "Done"), timeout=3), elem)
+        self.driver.execute_async_script.assert_called_once_with(WAIT_FOR, "xpath", "//*[text()[.='Done']]", "present", 3000, ANY_INT)
+        self.driver.find_elements.assert_not_called()
+    
+    def test_observer_timeout(self):
+        self.driver.execute_async_script.return_value = None
+        with self.assertRaises(TimeoutException):
+            self.driver.wait_for((By.ID, "spinner"), Condition.ABSENT, timeout=1)
+        self.assertEqual(self.driver.execute_async_script.call_args.args[1:4], ("css", '[id="spinner"]', "absent"))
+    
+    def test_script_timeout_restored(self):
+        self.driver.execute_async_script.return_value = True
+        self.driver.wait_for((By.CSS_SELECTOR, ".modal"), Condition.INVISIBLE, timeout=20)
+        self.assertEqual(self.driver.timeout_stats["sent"], 0)     # the default timeout is long enough
+        self.driver.execute_async_script.return_value = None
+        with self.assertRaises(TimeoutException):
+            self.driver.wait_for((By.CSS_SELECTOR, ".modal"), Condition.INVISIBLE, timeout=40)
+        self.assertEqual(self.driver.timeout_stats["sent"], 2)     # raised for the wait, then restored
+        self.assertEqual(self.driver._timeouts["script"], 30000)
+    
+    def test_fallback_on_script_error(self):
+        elem = Mock()
+        self.driver.execute_async_script.side_effect = JavascriptException("document unloaded while waiting for result")
+        self.driver.find_elements.side_effect = [[], [elem]]
+        self.assertIs(self.driver.wait_for((By.TEXT, "Done"), timeout=3), elem)
+        self.assertEqual(self.driver.find_elements.call_count, 2)
+    
+    def test_unsupported_locator_polls(self):
+        elem = Mock()
+        elem.is_displayed.return_value = True
+        self.driver.find_elements.return_value = [elem]
+        self.assertIs(self.driver.wait_for((By.LINK_TEXT, "Home"), Condition.VISIBLE), elem)
+        self.driver.execute_async_script.assert_not_called()
+    
+    def test_poll_timeout(self):
+        self.driver.find_elements.return_value = [Mock()]
+        with self.assertRaises(TimeoutException):
+            self.driver.wait_for((By.ID, "spinner"), Condition.ABSENT, timeout=0.1, poll=True)
+
+
+class AnyInt:
+    def __eq__(self, other):
+        return type(other) == int
+
+ANY_INT = AnyInt()
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
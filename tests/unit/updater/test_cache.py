@@ -0,0 +1,118 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from tests.setup import UpdaterTestCase
+import selex.updater.chrome    # must import like this before "from A import B", else function B is not patchable
+from selex.updater.cache import VersionCache, file_key
+from selex.updater.chrome import get_chromedriver_version_win, get_latest_chromedriver_version
+from selex.exceptions import NoSuchChromeDriverError
+
+
+class VersionCacheTest(unittest.TestCase):
+    """
+    Tests the 'VersionCache' class.
+    """
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "versions.json"
+        self.cache = VersionCache(self.path, bypass=False)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_hits(self):
+        compute = Mock(return_value="92.0.4515.107")
+        for _ in range(3):
+            self.assertEqual(self.cache.lookup("release", "https://example.com/LATEST", compute), "92.0.4515.107")
+        compute.assert_called_once()
+        self.assertEqual(self.cache.stats, {"hits": 2, "misses": 1, "bypassed": 0})
+
+    def test_persistent(self):
+        self.cache.lookup("release", "url", lambda: "1.0")
+        self.assertEqual(VersionCache(self.path, bypass=False).lookup("release", "url", lambda: "2.0"), "1.0")
+        self.assertEqual(self.cache.lookup("driver", "url", lambda: "3.0"), "3.0")    # keyed by the kind as well
+
+    def test_expired(self):
+        cache = VersionCache(self.path, ttl=0.01, bypass=False)
+        cache.lookup("release", "url", lambda: "1.0")
+        time.sleep(0.02)
+        self.assertEqual(cache.lookup("release", "url", lambda: "2.0"), "2.0")
+        self.assertEqual(cache.stats["misses"], 2)
+
+    def test_bypass(self):
+        compute = Mock(return_value="1.0")
+        self.cache.bypass = True
+        self.cache.lookup("release", "url", compute)
+        self.cache.bypass = None
+        with patch.dict(os.environ, {"SELEX_UPDATER_NO_CACHE": "1"}):
+            self.cache.lookup("release", "url", compute)
+        with patch.dict(os.environ, {"SELEX_UPDATER_NO_CACHE": ""}):
+            self.cache.lookup("release", "url", compute)
+            self.cache.lookup("release", None, compute)  # no key, e.g. the file keyed by does not exist
+        self.assertEqual(compute.call_count, 4)
+        self.assertEqual(self.cache.stats, {"hits": 0, "misses": 1, "bypassed": 3})
+
+    def test_errors_not_cached(self):
+        with self.assertRaises(ValueError):
+            self.cache.lookup("release", "url", Mock(side_effect=ValueError))
+        self.assertEqual(self.cache.lookup("release", "url", lambda: "1.0"), "1.0")
+
+    def test_corrupt_file(self):
+        self.path.write_text("{not json")
+        self.assertEqual(self.cache.lookup("release", "url", lambda: "1.0"), "1.0")
+        self.cache.clear()
+        self.assertFalse(self.path.exists())
+
+    def test_file_key(self):
+        driver_path = Path(self.temp_dir.name) / "chromedriver.exe"
+        self.assertIsNone(file_key([driver_path]))
+        driver_path.write_bytes(b"old")
+        key = file_key(["missing.exe", driver_path])
+        self.assertTrue(key.startswith(str(driver_path)))
+        os.utime(driver_path, ns=(0, 10**9))
+        self.assertNotEqual(file_key([driver_path]), key)   # changes when the driver is replaced
+
+
+class CachedLookupsTest(UpdaterTestCase):
+    """
+    Tests that the updater's version lookups are cached.
+    """
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = VersionCache(Path(self.temp_dir.name) / "versions.json", bypass=False)
+        patcher = patch("selex.updater.chrome.version_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @patch("requests.get")
+    def test_latest_release(self, mock_requests_get):
+        mock_requests_get.return_value.text = "92.0.4515.107"
+        for _ in range(2):
+            self.assertEqual(get_latest_chromedriver_version(major_version=92), "92.0.4515.107")
+        mock_requests_get.assert_called_once()
+        with self.assertRaises(NoSuchChromeDriverError):     # a different URL
+            get_latest_chromedriver_version(major_version=93)
+
+    @patch("subprocess.check_output")
+    def test_driver_version(self, mock_check_output):
+        driver_path = Path(self.temp_dir.name) / "chromedriver.exe"
+        driver_path.write_bytes(b"")
+        mock_check_output.return_value = b"ChromeDriver 92.0.4515.107 (87a818b1)\r\n"
+        for _ in range(2):
+            self.assertEqual(get_chromedriver_version_win(driver_path), "92.0.4515.107")
+        mock_check_output.assert_called_once()
+        os.utime(driver_path, ns=(0, 10**9))     # the driver was updated
+        mock_check_output.return_value = b"ChromeDriver 93.0.4577.15 (87a818b1)\r\n"
+        self.assertEqual(get_chromedriver_version_win(driver_path), "93.0.4577.15")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
+import tempfile
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
+from tests.setup import UpdaterTestCase
 import selex.updater.chrome    # must import like this before "from A import B", else function B is not patchable
 from selex.updater.chrome import (get_chrome_version_win, 
                                   get_chromedriver_version_win,
@@ -16,7 +19,7 @@ from selex.exceptions import BrowserVersionUndeterminedError, NoSuchChromeDriver
 
 
 @patch("subprocess.check_output")
-class GetChromeVersionTest(unittest.TestCase):
+class GetChromeVersionTest(UpdaterTestCase):
     """
     Tests the 'get_chrome_version_win' function.
     """
@@ -58,7 +61,7 @@ class LocateChromeDriverTest(unittest.TestCase):
 
 @patch("subprocess.check_output")
 @patch("selex.updater.chrome.locate_chromedriver")
-class GetChromeDriverVersionTest(unittest.TestCase):
+class GetChromeDriverVersionTest(UpdaterTestCase):
     """
     Tests the 'get_chromedriver_version_win' function.
     """
@@ -77,7 +80,7 @@ class GetChromeDriverVersionTest(unittest.TestCase):
 
 
 @patch("requests.get")
-class GetLatestChromeDriverVersionTest(unittest.TestCase):
+class GetLatestChromeDriverVersionTest(UpdaterTestCase):
     """
     Tests the 'get_latest_chromedriver_version' function.
     
@@ -133,7 +136,7 @@ class ParseChromeDriverTest(unittest.TestCase):
         self.assertEqual(result.sub, "0")
         
 
-class UpdateChromeDriverTest(unittest.TestCase):
+class UpdateChromeDriverTest(UpdaterTestCase):
     """
     Tests the 'update_chromedriver' function.
     """
@@ -141,6 +144,7 @@ class UpdateChromeDriverTest(unittest.TestCase):
     CURRENT_BROWSER_VERSION = "92.0.4515.131"
     CHROMEDRIVER_PATH = Path("2013/metaldays/chromedriver.exe")
     
+    @patch("selex.updater.chrome.driver_update_lock")    # the driver's folder does not exist
     @patch("builtins.print")
     @patch("selex.updater.chrome.zip_download_and_extract")
     @patch("selex.updater.chrome.get_chrome_version_win")
@@ -154,18 +158,22 @@ class UpdateChromeDriverTest(unittest.TestCase):
                     mock_get_chrome_version_win,
                     mock_zip_download_and_extract,
                     mock_print,
+                    mock_driver_update_lock,
                     force_update: bool,
                     latest_driver_version: str,
                     update_triggered: bool):
         
         mock_locate_chromedriver.return_value = self.CHROMEDRIVER_PATH
         mock_get_chrome_version_win.return_value = self.CURRENT_BROWSER_VERSION
+        mock_driver_update_lock.return_value.__enter__.return_value.wait_seconds = 0.0
         mock_get_chromedriver_version_win.return_value = self.CURRENT_DRIVER_VERSION
         mock_get_latest_chromedriver_version.return_value = latest_driver_version 
         
         update_chromedriver(force = force_update)
         
         mock_locate_chromedriver.assert_called_once()
+        mock_driver_update_lock.assert_called_once()
+        self.assertEqual(mock_driver_update_lock.call_args.args[0], self.CHROMEDRIVER_PATH)
         mock_get_chromedriver_version_win.assert_called_once_with(self.CHROMEDRIVER_PATH)
         mock_get_latest_chromedriver_version.assert_called_once()
         mock_get_chrome_version_win.assert_called_once()
@@ -211,6 +219,48 @@ class UpdateChromeDriverTest(unittest.TestCase):
                         latest_driver_version = "93.0.4577.15",
                         update_triggered = True)
 
+
+class UpdateChromeDriverConcurrencyTest(UpdaterTestCase):
+    """
+    Tests the concurrent version lookups of the 'update_chromedriver' function.
+    """
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.CHROMEDRIVER_PATH = Path(self.temp_dir.name) / "chromedriver.exe"
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    @patch("builtins.print")
+    @patch("selex.updater.chrome.zip_download_and_extract")
+    @patch("selex.updater.chrome.get_chrome_version_win")
+    @patch("selex.updater.chrome.get_latest_chromedriver_version")
+    @patch("selex.updater.chrome.get_chromedriver_version_win")
+    @patch("selex.updater.chrome.locate_chromedriver")
+    def test_speculative_fetch_missed(self, mock_locate_chromedriver, mock_get_chromedriver_version_win,
+                                      mock_get_latest_chromedriver_version, mock_get_chrome_version_win,
+                                      mock_zip_download_and_extract, mock_print):
+        """Tests the case when the browser was updated to a new major version, so the speculative fetch is wasted."""
+        mock_locate_chromedriver.return_value = self.CHROMEDRIVER_PATH
+        mock_get_chrome_version_win.return_value = "93.0.4577.63"
+        mock_get_chromedriver_version_win.return_value = "92.0.4515.107"
+        def get_latest_version(major):
+            if major == "92":
+                time.sleep(0.3)     # the wasted fetch finishes last
+            return {"92": "92.0.4515.107", "93": "93.0.4577.63"}[major]
+        mock_get_latest_chromedriver_version.side_effect = get_latest_version
+        
+        timings = update_chromedriver()
+        
+        self.assertEqual([call.args for call in mock_get_latest_chromedriver_version.call_args_list], [("92",), ("93",)])
+        self.assertIn("93.0.4577.63", mock_zip_download_and_extract.call_args.args[0])
+        self.assertEqual(set(timings), {"browser_version", "locate_driver", "lock_wait", "driver_version", "latest_version",
+                                        "latest_version_speculative", "download", "total"})
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
+        self.assertGreaterEqual(timings["latest_version_speculative"], 0.3)
+        self.assertLess(timings["latest_version"], 0.3)     # not overwritten by the wasted fetch
+
  
 if __name__ == "__main__":
     unittest.main(exit=False)
\ No newline at end of file
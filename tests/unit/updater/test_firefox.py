@@ -2,6 +2,7 @@ import unittest
 from pathlib import Path
 from unittest.mock import patch
 
+from tests.setup import UpdaterTestCase
 import selex.updater.firefox    # must import like this before "from A import B", else function B is not patchable
 from selex.updater.firefox import (get_firefox_bit_version_win, 
                                    get_geckodriver_version_win, 
@@ -50,7 +51,7 @@ class LocateGeckoDriverTest(unittest.TestCase):
 
 @patch("subprocess.check_output")
 @patch("selex.updater.firefox.locate_geckodriver")
-class GetGeckoDriverVersionTest(unittest.TestCase):
+class GetGeckoDriverVersionTest(UpdaterTestCase):
     """
     Tests the 'get_geckodriver_version_win' function.
     """
@@ -73,7 +74,7 @@ of the license at https://mozilla.org/MPL/2.0/.\n"""
 
 
 @patch("requests.get")
-class GetLatestGeckoDriverVersionTest(unittest.TestCase):
+class GetLatestGeckoDriverVersionTest(UpdaterTestCase):
     """
     Tests the 'get_latest_geckodriver_version' function.
     
@@ -87,13 +88,14 @@ class GetLatestGeckoDriverVersionTest(unittest.TestCase):
             self.assertEqual(VERSION, get_latest_geckodriver_version())
 
 
-class UpdateGeckoDriverTest(unittest.TestCase):
+class UpdateGeckoDriverTest(UpdaterTestCase):
     """
     Tests the 'update_geckodriver' function.
     """
     CURRENT_VERSION = "0.29.1"
     GECKODRIVER_PATH = Path("2012/metalfest/geckodriver.exe")
     
+    @patch("selex.updater.firefox.driver_update_lock")    # the driver's folder does not exist
     @patch("builtins.print")
     @patch("selex.updater.firefox.zip_download_and_extract")
     @patch("selex.updater.firefox.get_firefox_bit_version_win")
@@ -107,17 +109,20 @@ class UpdateGeckoDriverTest(unittest.TestCase):
                     mock_get_firefox_bit_version_win,
                     mock_zip_download_and_extract,
                     mock_print,
+                    mock_driver_update_lock,
                     force_update: bool,
                     latest_driver_version: str,
                     update_triggered: bool):
         
         mock_locate_geckodriver.return_value = self.GECKODRIVER_PATH
+        mock_driver_update_lock.return_value.__enter__.return_value.wait_seconds = 0.0
         mock_get_geckodriver_version_win.return_value = self.CURRENT_VERSION
         mock_get_latest_geckodriver_version.return_value = latest_driver_version 
         
         update_geckodriver(force = force_update)
         
         mock_locate_geckodriver.assert_called_once()
+        mock_driver_update_lock.assert_called_once()
         mock_get_geckodriver_version_win.assert_called_once_with(self.GECKODRIVER_PATH)
         mock_get_latest_geckodriver_version.assert_called_once()
         
@@ -1,10 +1,17 @@
+import hashlib
+import io
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import Mock, patch
+from zipfile import ZipFile
+
+import requests
 
 import selex.updater.generic    # must import like this before "from ... import locate_on_syspath", else the function is not patchable
-from selex.updater.generic import locate_generic_driver, locate_on_syspath, newer_version_available, zip_download_and_extract 
-from selex.exceptions import WebdriverNotFoundError
+from selex.updater.generic import (download_file, locate_generic_driver, locate_on_syspath, newer_version_available,
+                                  zip_download_and_extract, DOWNLOAD_TIMEOUT)
+from selex.exceptions import ChecksumMismatchError, WebdriverNotFoundError
 
 
 @patch.object(Path, "glob")
@@ -79,25 +86,135 @@ class NewerVersionAvailableTest(unittest.TestCase):
         self.assertFalse(newer_version_available(self.current_version, latest_version))
 
 
-@patch("selex.updater.generic.ZipFile")
-@patch("selex.updater.generic.BytesIO")
+def make_zip(files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with ZipFile(buffer, "w") as zipf:
+        for name, data in files.items():
+            zipf.writestr(name, data)
+    return buffer.getvalue()
+
+
+class FakeResponse:
+    """A streamed response of requests.get, optionally cut off after a number of bytes."""
+    def __init__(self, data: bytes, status_code: int = 200, fail_after: int = None):
+        self.data = data
+        self.status_code = status_code
+        self.fail_after = fail_after
+        self.headers = {"Content-Length": str(len(data))}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(self.status_code)
+
+    def iter_content(self, chunk_size: int):
+        for start in range(0, len(self.data), chunk_size):
+            if self.fail_after is not None and start >= self.fail_after:
+                raise requests.exceptions.ChunkedEncodingError("Connection broken")
+            yield self.data[start:start + chunk_size]
+
+
+@patch("requests.get")
+class DownloadFileTest(unittest.TestCase):
+    """
+    Tests the 'download_file' function.
+    """
+    DATA = bytes(range(256)) * 40
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "driver.zip"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_chunked(self, mock_requests_get):
+        mock_requests_get.return_value = FakeResponse(self.DATA)
+        progress = Mock()
+        self.assertEqual(download_file("https://example.com/driver.zip", self.path, progress=progress, chunk_size=1024), self.path)
+        self.assertEqual(self.path.read_bytes(), self.DATA)
+        self.assertFalse(self.path.with_name("driver.zip.part").exists())
+        self.assertEqual(progress.call_count, 10)
+        self.assertEqual(progress.call_args.args[:2], (len(self.DATA), len(self.DATA)))
+        mock_requests_get.assert_called_once_with("https://example.com/driver.zip", stream=True, headers={}, timeout=DOWNLOAD_TIMEOUT)
+
+    def test_resume(self, mock_requests_get):
+        mock_requests_get.side_effect = [FakeResponse(self.DATA, fail_after=4096), FakeResponse(self.DATA[4096:], 206)]
+        download_file("https://example.com/driver.zip", self.path, chunk_size=1024)
+        self.assertEqual(self.path.read_bytes(), self.DATA)
+        self.assertEqual(mock_requests_get.call_args.kwargs["headers"], {"Range": "bytes=4096-"})
+
+    def test_resume_not_supported(self, mock_requests_get):
+        mock_requests_get.side_effect = [FakeResponse(self.DATA, fail_after=4096), FakeResponse(self.DATA)]
+        download_file("https://example.com/driver.zip", self.path, chunk_size=1024)
+        self.assertEqual(self.path.read_bytes(), self.DATA)
+
+    def test_retries_exhausted(self, mock_requests_get):
+        mock_requests_get.side_effect = lambda *args, **kwargs: FakeResponse(self.DATA, fail_after=0)
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            download_file("https://example.com/driver.zip", self.path, retries=2)
+        self.assertEqual(mock_requests_get.call_count, 3)
+        self.assertFalse(self.path.exists())
+
+    def test_checksum(self, mock_requests_get):
+        mock_requests_get.side_effect = lambda *args, **kwargs: FakeResponse(self.DATA)
+        download_file("https://example.com/driver.zip", self.path, checksum=hashlib.sha256(self.DATA).hexdigest())
+        download_file("https://example.com/driver.zip", self.path, checksum="md5:" + hashlib.md5(self.DATA).hexdigest().upper())
+        self.path.unlink()
+        with self.assertRaises(ChecksumMismatchError):
+            download_file("https://example.com/driver.zip", self.path, checksum="sha256:" + "0" * 64)
+        self.assertFalse(self.path.exists())
+        self.assertFalse(self.path.with_name("driver.zip.part").exists())
+
+
 @patch("requests.get")
 class ZipDownloadAndExtractTest(unittest.TestCase):
     """
     Tests the 'zip_download_and_extract' function.
     """
+    FILES = {"Wine.bottle": b"red", "Beer.bottle": b"lager", "crate/Water.bottle": b"still"}
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
 
-    def test_default(self, mock_requests_get, mock_bytes_io, mock_zipfile):
+    def test_default(self, mock_requests_get):
         download_link = "www.drunkenpensioner.com/k-plus.zip"
-        output_dir = "/festivals/2012/metalfest"
-        files = ["Wine.bottle", "Beer.bottle"]
-        mock_zipf = Mock()
-        mock_zipfile.return_value.__enter__.return_value = mock_zipf
-        zip_download_and_extract(download_link, output_dir, files)
-        mock_requests_get.assert_called_with(download_link, stream=True)
-        mock_bytes_io.assert_called()
-        mock_zipfile.assert_called()
-        mock_zipf.extractall.assert_called_with(output_dir, files)
+        mock_requests_get.return_value = FakeResponse(make_zip(self.FILES))
+        (self.output_dir / "Wine.bottle").write_bytes(b"old")
+        zip_download_and_extract(download_link, self.output_dir, ["Wine.bottle", "Beer.bottle"])
+        self.assertEqual(mock_requests_get.call_args.args, (download_link,))
+        self.assertTrue(mock_requests_get.call_args.kwargs["stream"])
+        self.assertEqual((self.output_dir / "Wine.bottle").read_bytes(), b"red")
+        self.assertEqual(sorted(path.name for path in self.output_dir.iterdir()), ["Beer.bottle", "Wine.bottle"])
+
+    def test_extract_all(self, mock_requests_get):
+        mock_requests_get.return_value = FakeResponse(make_zip(self.FILES))
+        zip_download_and_extract("https://example.com/bottles.zip", self.output_dir)
+        for name, data in self.FILES.items():
+            self.assertEqual((self.output_dir / name).read_bytes(), data)
+
+    def test_path_traversal(self, mock_requests_get):
+        mock_requests_get.return_value = FakeResponse(make_zip({"../evil.txt": b"evil", "/abs/evil.txt": b"evil"}))
+        zip_download_and_extract("https://example.com/bottles.zip", self.output_dir)
+        self.assertFalse((self.output_dir.parent / "evil.txt").exists())
+        self.assertEqual((self.output_dir / "evil.txt").read_bytes(), b"evil")
+        self.assertEqual((self.output_dir / "abs" / "evil.txt").read_bytes(), b"evil")
+
+    def test_missing_file(self, mock_requests_get):
+        mock_requests_get.return_value = FakeResponse(make_zip(self.FILES))
+        with self.assertRaisesRegex(KeyError, "chromedriver.exe"):
+            zip_download_and_extract("https://example.com/bottles.zip", self.output_dir, ["Wine.bottle", "chromedriver.exe"])
+        self.assertFalse((self.output_dir / "Wine.bottle").exists())
+        self.assertEqual(list(self.output_dir.iterdir()), [])     # the archive is removed
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from selex.exceptions import UpdateLockTimeoutError
+from selex.updater.lock import FileLock, driver_update_lock
+
+
+def hold_lock(path: str, seconds: float, acquired):
+    with FileLock(path):
+        acquired.set()
+        time.sleep(seconds)
+
+def die_holding_lock(path: str, acquired):
+    FileLock(path).acquire()
+    acquired.set()
+    time.sleep(0.2)
+    os._exit(1)
+
+
+class FileLockTest(unittest.TestCase):
+    """
+    Tests the 'FileLock' class, with the lock held by another process.
+    """
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "chromedriver.exe.lock"
+        self.context = multiprocessing.get_context()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def start_holder(self, target, *args):
+        acquired = self.context.Event()
+        process = self.context.Process(target=target, args=(str(self.path), *args, acquired))
+        process.start()
+        self.addCleanup(process.join)
+        self.assertTrue(acquired.wait(10))
+        return process
+
+    def test_uncontended(self):
+        with FileLock(self.path) as lock:
+            self.assertTrue(lock.locked)
+            self.assertFalse(lock.contended)
+        self.assertFalse(lock.locked)
+        self.assertTrue(self.path.exists())     # left in place for the next update
+        with lock:
+            pass
+
+    def test_waits_for_holder(self):
+        self.start_holder(hold_lock, 0.3)
+        with FileLock(self.path, poll_interval=0.01) as lock:
+            self.assertTrue(lock.contended)
+            self.assertGreater(lock.wait_seconds, 0.1)
+
+    def test_timeout(self):
+        self.start_holder(hold_lock, 1)
+        lock = FileLock(self.path, timeout=0.1, poll_interval=0.01)
+        with self.assertRaises(UpdateLockTimeoutError):
+            lock.acquire()
+        self.assertFalse(lock.locked)
+
+    def test_released_when_holder_dies(self):
+        self.start_holder(die_holding_lock)
+        with FileLock(self.path, timeout=10, poll_interval=0.01) as lock:
+            self.assertTrue(lock.contended)
+
+    def test_not_reentrant(self):
+        with FileLock(self.path) as lock:
+            with self.assertRaises(RuntimeError):
+                lock.acquire()
+
+    def test_driver_update_lock(self):
+        lock = driver_update_lock(Path(self.temp_dir.name) / "chromedriver.exe", timeout=5)
+        self.assertEqual(lock.path, self.path)
+        self.assertEqual(lock.timeout, 5)
+
+    def test_unwritable_driver_directory(self):
+        fallback_dir = Path(self.temp_dir.name) / "locks"
+        not_a_directory = Path(self.temp_dir.name) / "file"
+        not_a_directory.write_text("")  # the lock file cannot be created below it, even by root
+        with patch("selex.updater.lock.FALLBACK_LOCK_DIR", fallback_dir):
+            lock = driver_update_lock(not_a_directory / "chromedriver.exe")
+            other = driver_update_lock(Path(self.temp_dir.name) / "other" / "chromedriver.exe")
+        with self.assertLogs("selex.updater", "WARNING"):
+            with lock:
+                self.assertEqual(lock.path.parent, fallback_dir)
+        self.assertTrue(lock.path.exists())
+        self.assertNotEqual(other.fallback_path, lock.path)     # named after the driver's path
+        with self.assertRaises(OSError):
+            FileLock(not_a_directory / "chromedriver.exe.lock").acquire()
+
+
+if __name__ == "__main__":
+    unittest.main()
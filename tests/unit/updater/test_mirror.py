@@ -0,0 +1,145 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from zipfile import ZipFile
+
+from tests.setup import UpdaterTestCase
+import selex.updater.mirror    # must import like this before "from A import B", else function B is not patchable
+from selex.updater.chrome import get_latest_chromedriver_version
+from selex.updater.generic import zip_download_and_extract
+from selex.updater.mirror import ArtifactMirror, get_mirror, set_mirror
+from selex.exceptions import ArtifactNotMirroredError
+
+DOWNLOAD_LINK = "https://chromedriver.storage.googleapis.com/92.0.4515.107/chromedriver_win32.zip"
+
+
+def make_zip(files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with ZipFile(buffer, "w") as zipf:
+        for name, data in files.items():
+            zipf.writestr(name, data)
+    return buffer.getvalue()
+
+
+class ArtifactMirrorTest(unittest.TestCase):
+    """
+    Tests the 'ArtifactMirror' class.
+    """
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name) / "mirror"
+        self.mirror = ArtifactMirror(self.root)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def add(self, version: str, platform: str = "win32", mirror: ArtifactMirror = None) -> Path:
+        archive = Path(self.temp_dir.name) / f".download-{version}.zip"
+        archive.write_bytes(version.encode())
+        return (mirror or self.mirror).put("ChromeDriver", version, platform, archive, "chromedriver_win32.zip")
+
+    def test_put_and_get(self):
+        self.assertIsNone(self.mirror.get("ChromeDriver", "92.0.4515.107", "win32"))
+        path = self.add("92.0.4515.107")
+        self.assertEqual(path, self.root / "ChromeDriver" / "92.0.4515.107" / "win32" / "chromedriver_win32.zip")
+        self.assertEqual(self.mirror.get("ChromeDriver", "92.0.4515.107", "win32"), path)
+        self.assertEqual(path.read_bytes(), b"92.0.4515.107")
+        self.assertIsNone(self.mirror.get("ChromeDriver", "92.0.4515.107", "win64"))
+        self.assertEqual(self.mirror.stats, {"hits": 1, "misses": 2, "added": 1})
+        entry = self.mirror.manifest()["ChromeDriver|92.0.4515.107|win32"]
+        self.assertEqual(entry["size"], 13)
+        self.assertEqual(len(entry["sha256"]), 64)
+
+    def test_tampered(self):
+        path = self.add("92.0.4515.107")
+        path.write_bytes(b"92.0.4515.10X")   # same size
+        with self.assertLogs("selex.updater", "WARNING"):
+            self.assertIsNone(self.mirror.get("ChromeDriver", "92.0.4515.107", "win32"))
+        path.write_bytes(b"92.0")   # truncated
+        self.assertIsNone(self.mirror.get("ChromeDriver", "92.0.4515.107", "win32"))
+        self.assertEqual(self.mirror.stats["misses"], 2)
+
+    def test_shared(self):
+        other = ArtifactMirror(self.root)
+        self.add("92.0.4515.107")
+        self.add("93.0.4577.15", mirror=other)
+        self.assertIsNotNone(other.get("ChromeDriver", "92.0.4515.107", "win32"))  # the manifest is reread once changed
+        self.assertEqual(self.mirror.versions("ChromeDriver"), ["92.0.4515.107", "93.0.4577.15"])
+
+    def test_latest(self):
+        for version in ["92.0.4515.43", "92.0.4515.107", "93.0.4577.15", "100.0.4896.20"]:
+            self.add(version)
+        self.add("101.0.4951.15", platform="mac64")
+        self.assertEqual(self.mirror.latest("ChromeDriver", "win32"), "100.0.4896.20")
+        self.assertEqual(self.mirror.latest("ChromeDriver"), "101.0.4951.15")
+        self.assertEqual(self.mirror.latest("ChromeDriver", "win32", 92), "92.0.4515.107")
+        with self.assertRaises(ArtifactNotMirroredError):
+            self.mirror.latest("ChromeDriver", "win32", 94)
+        with self.assertRaises(ArtifactNotMirroredError):
+            self.mirror.require("GeckoDriver", "0.29.1", "win64")
+
+    @patch.dict("os.environ", {"SELEX_DRIVER_MIRROR": "/mnt/drivers", "SELEX_DRIVER_MIRROR_OFFLINE": "1"})
+    def test_environment(self):
+        with patch("selex.updater.mirror._mirror_configured", False), patch("selex.updater.mirror._mirror", None):
+            mirror = get_mirror()
+            self.assertEqual(mirror.root, Path("/mnt/drivers"))
+            self.assertTrue(mirror.offline)
+
+
+@patch("requests.get")
+class MirroredDownloadTest(UpdaterTestCase):
+    """
+    Tests that 'zip_download_and_extract' and the version lookups use the configured mirror.
+    """
+    ARTIFACT = ("ChromeDriver", "92.0.4515.107", "win32")
+
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.temp_dir.name) / "drivers"
+        self.output_dir.mkdir()
+        self.mirror = ArtifactMirror(Path(self.temp_dir.name) / "mirror")
+        set_mirror(self.mirror)     # restored by UpdaterTestCase
+        self.archive = make_zip({"chromedriver.exe": b"driver"})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_populated_then_used(self, mock_requests_get):
+        mock_requests_get.return_value.__enter__.return_value.status_code = 200
+        mock_requests_get.return_value.__enter__.return_value.headers = {}
+        mock_requests_get.return_value.__enter__.return_value.iter_content.return_value = [self.archive]
+        zip_download_and_extract(DOWNLOAD_LINK, self.output_dir, ["chromedriver.exe"], artifact=self.ARTIFACT)
+        self.assertEqual(self.mirror.get(*self.ARTIFACT).read_bytes(), self.archive)
+        (self.output_dir / "chromedriver.exe").unlink()
+        zip_download_and_extract(DOWNLOAD_LINK, self.output_dir, ["chromedriver.exe"], artifact=self.ARTIFACT)
+        mock_requests_get.assert_called_once()
+        self.assertEqual((self.output_dir / "chromedriver.exe").read_bytes(), b"driver")
+        self.assertEqual(self.mirror.stats, {"hits": 2, "misses": 1, "added": 1})
+
+    def test_read_only_mirror(self, mock_requests_get):
+        mock_requests_get.return_value.__enter__.return_value.status_code = 200
+        mock_requests_get.return_value.__enter__.return_value.headers = {}
+        mock_requests_get.return_value.__enter__.return_value.iter_content.return_value = [self.archive]
+        with patch.object(self.mirror, "put", side_effect=PermissionError("read-only")), self.assertLogs("selex.updater", "WARNING"):
+            zip_download_and_extract(DOWNLOAD_LINK, self.output_dir, ["chromedriver.exe"], artifact=self.ARTIFACT)
+        self.assertEqual((self.output_dir / "chromedriver.exe").read_bytes(), b"driver")
+        self.assertEqual([path.name for path in self.output_dir.iterdir()], ["chromedriver.exe"])
+
+    def test_offline(self, mock_requests_get):
+        self.mirror.offline = True
+        with self.assertRaises(ArtifactNotMirroredError):
+            zip_download_and_extract(DOWNLOAD_LINK, self.output_dir, ["chromedriver.exe"], artifact=self.ARTIFACT)
+        archive = Path(self.temp_dir.name) / "chromedriver_win32.zip"
+        archive.write_bytes(self.archive)
+        self.mirror.put(*self.ARTIFACT, archive)
+        self.assertEqual(get_latest_chromedriver_version(major_version=92), "92.0.4515.107")
+        zip_download_and_extract(DOWNLOAD_LINK, self.output_dir, ["chromedriver.exe"], artifact=self.ARTIFACT)
+        self.assertEqual((self.output_dir / "chromedriver.exe").read_bytes(), b"driver")
+        mock_requests_get.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()